@@ -1,32 +1,118 @@
 import inspect
+import operator
 
 from typing import (
     cast,
+    Any,
     Awaitable,
     AsyncIterable,
     AsyncIterator,
     Callable,
     Generic,
-    List,
+    Iterator as Iterator_,
     Optional,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
 )
 
-from .queue import ClosableQueue, MultiConsumerQueue
+from .queue import ClosableQueue, MultiConsumerQueue, ThreadBridgeQueue
+from .aggregate import (
+    collect,
+    reduce,
+    scan,
+    count,
+    sum,
+    min,
+    max,
+    ReduceCallback,
+    _MISSING,
+)
+from .adaptive import (
+    AIMDLimit,
+    BufferSizer,
+    Concurrency,
+    ConcurrencyLimit,
+    make_limit,
+    run_concurrently,
+)
+from .bridge import from_sync_iterable
+from .budget import YieldBudget, make_budget
+from .cache import cached_map, MapCache, KeyCallback
+from .checkpoint import Checkpointer
+from .coalesce import coalesce, debounce, sample
+from .framing import frame, split_lines, read_file
+from .distinct import distinct
+from .hedge import Hedger, HedgeDelay
+from .flat_map import flat_map, FlatMapCallback
 from .mix import mix
+from .stats import LatencyWindow
+from .shedding import ShedPolicy, DeadlinePolicy, CoDelPolicy
+from .shm import SharedMemoryBroadcast
+from .prefetch import prefetch, _prefetch_chain
 from .split import split, _StreamSplitter
+from .trace import Tracer
+from .worker import (
+    WorkerLoop,
+    WorkerProcess,
+    offload,
+    pipeline,
+    Placement,
+    Stage,
+    Worker,
+)
+from .zip import zip, zip_longest, combine_latest
 
 
 __all__ = [
     'ClosableQueue',
     'MultiConsumerQueue',
+    'ThreadBridgeQueue',
+    'SharedMemoryBroadcast',
+    'MapCache',
+    'Hedger',
+    'LatencyWindow',
+    'ConcurrencyLimit',
+    'AIMDLimit',
+    'BufferSizer',
+    'YieldBudget',
+    'Tracer',
+    'WorkerLoop',
+    'WorkerProcess',
+    'ShedPolicy',
+    'DeadlinePolicy',
+    'CoDelPolicy',
+    'Checkpointer',
     'Iterator',
     'mix',
+    'prefetch',
     'split',
     'chain',
     'filter',
     'map',
+    'flat_map',
+    'cached_map',
+    'distinct',
+    'coalesce',
+    'debounce',
+    'sample',
+    'zip',
+    'zip_longest',
+    'combine_latest',
+    'from_sync_iterable',
+    'frame',
+    'split_lines',
+    'read_file',
+    'offload',
+    'pipeline',
+    'collect',
+    'reduce',
+    'scan',
+    'count',
+    'sum',
+    'min',
+    'max',
 ]
 
 T = TypeVar('T')
@@ -37,63 +123,234 @@ FilterCallback = Optional[Callable[[T], Union[bool, Awaitable[bool]]]]
 MapCallback = Callable[[T], Union[U, Awaitable[U]]]
 
 
-async def chain(streamA: AsyncIterable[T],
-                streamB: AsyncIterable[U],
-                *streams: AsyncIterable[T]) -> AsyncIterable[Union[T, U, V]]:
-    """Chain two or more async-iterators."""
-    obj: Union[T, U, V]
-    async for obj in streamA:
-        yield obj
-    async for obj in streamB:
-        yield obj
+class chain(Generic[T, U, V]):
+    """Chain two or more async-iterators.
+
+    If prefetch is greater than 0, up to ``prefetch`` streams following
+    the current one are started in background and their first items
+    are buffered, so per-stream setup latency is not paid serially.
+    Items are still yielded strictly in chain order.
+    """
+
+    __slots__ = ('_streams', '_current')
+
+    def __init__(self,
+                 streamA: AsyncIterable[T],
+                 streamB: AsyncIterable[U],
+                 *streams: AsyncIterable[V],
+                 prefetch: int = 0) -> None:
+        allstreams: Sequence[AsyncIterable[Union[T, U, V]]]
+        allstreams = (streamA, streamB) + streams
+        self._streams: Iterator_[AsyncIterable[Union[T, U, V]]]
+        self._current: Optional[AsyncIterator[Union[T, U, V]]] = None
+        if prefetch > 0:
+            self._streams = iter(())
+            self._current = _prefetch_chain(
+                _iter_streams(allstreams), prefetch)
+        else:
+            self._streams = iter(allstreams)
+
+    def __aiter__(self) -> AsyncIterator[Union[T, U, V]]:
+        return self
+
+    async def __anext__(self) -> Union[T, U, V]:
+        while True:
+            if self._current is None:
+                stream = next(self._streams, None)
+                if stream is None:
+                    raise StopAsyncIteration
+                self._current = stream.__aiter__()
+            try:
+                return await self._current.__anext__()
+            except StopAsyncIteration:
+                self._current = None
+
+    async def aclose(self) -> None:
+        """Close current stream and drop the rest."""
+        self._streams = iter(())
+        current, self._current = self._current, None
+        if current is not None and hasattr(current, 'aclose'):
+            await current.aclose()  # type: ignore
+
+
+async def _iter_streams(streams: Sequence[AsyncIterable[T]]
+                        ) -> AsyncIterator[AsyncIterable[T]]:
     for stream in streams:
-        async for obj in stream:
-            yield obj
+        yield stream
 
 
-async def filter(func: FilterCallback,
-                 stream: AsyncIterable[T]) -> AsyncIterable[T]:
+class filter(Generic[T]):
     """Return an async iterator yielding those items of stream for which
     func(item) is true.
 
     If func is None, return items that are true.
     If func may be either simple callable or coroutine.
+
+    Coroutine func is called for up to ``concurrency`` items at once
+    (``'auto'`` adjusts the limit to observed latency, see ``AIMDLimit``);
+    items are still yielded in stream order.
+
+    If ``yield_every`` and/or ``time_slice`` is set, the loop yields to
+    event loop after that many items or seconds when stream has items
+    ready (see ``YieldBudget``).
     """
-    if func is None:
-        async for obj in stream:
-            if obj:
-                yield obj
-    else:
-        assert callable(func), "Expected callable object"
-        if inspect.iscoroutinefunction(func):
-            func = cast(Callable[[T], Awaitable[bool]], func)
-            async for obj in stream:
-                if await func(obj):
-                    yield obj
+
+    __slots__ = ('_func', '_coro', '_stream', '_iter', '_closed', 'limit',
+                 'budget')
+
+    def __init__(self, func: FilterCallback, stream: AsyncIterable[T], *,
+                 concurrency: Concurrency = 1,
+                 yield_every: int = 0,
+                 time_slice: Optional[float] = None) -> None:
+        if func is not None:
+            assert callable(func), "Expected callable object"
+        self._coro = inspect.iscoroutinefunction(func)
+        self.limit: Optional[ConcurrencyLimit] = None
+        self.budget = make_budget(yield_every, time_slice)
+        if concurrency != 1:
+            if not self._coro:
+                raise ValueError("Concurrency requires coroutine function",
+                                 func)
+            self.limit = make_limit(concurrency)
+            stream = _selected(run_concurrently(
+                cast(Callable[[T], Awaitable[bool]], func),
+                stream, self.limit))
+            func, self._coro = _true, False
+        self._func = func
+        self._stream = stream
+        self._iter: Optional[AsyncIterator[T]] = None
+        self._closed = False
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        if self._closed:
+            raise StopAsyncIteration
+        it = self._iter
+        if it is None:
+            it = self._iter = self._stream.__aiter__()
+        func = self._func
+        budget = self.budget
+        if func is None:
+            while True:
+                obj = await it.__anext__()
+                if budget is not None and budget.tick():
+                    await budget.pause()
+                if obj:
+                    return obj
+        elif self._coro:
+            afunc = cast(Callable[[T], Awaitable[bool]], func)
+            while True:
+                obj = await it.__anext__()
+                if budget is not None and budget.tick():
+                    await budget.pause()
+                if await afunc(obj):
+                    return obj
         else:
-            func = cast(Callable[[T], bool], func)
-            async for obj in stream:
-                if func(obj):
-                    yield obj
+            sfunc = cast(Callable[[T], bool], func)
+            while True:
+                obj = await it.__anext__()
+                if budget is not None and budget.tick():
+                    await budget.pause()
+                if sfunc(obj):
+                    return obj
 
+    async def aclose(self) -> None:
+        """Stop iteration and close stream iterator (if it has been
+        started and supports closing).
+        """
+        self._closed = True
+        it = self._iter
+        if it is not None and hasattr(it, 'aclose'):
+            await it.aclose()  # type: ignore
 
-async def map(func: MapCallback, stream: AsyncIterable[T]) -> AsyncIterable[U]:
-    """Return async iterator applying func to each value of stream."""
-    if not callable(func):
-        raise ValueError("Excpected callable object", func)
-    if inspect.iscoroutinefunction(func):
-        func = cast(Callable[[T], Awaitable[U]], func)
-        async for obj in stream:
-            yield await func(obj)
-    else:
-        func = cast(Callable[[T], U], func)
-        async for obj in stream:
-            yield cast(U, func(obj))
 
+class map(Generic[T, U]):
+    """Return async iterator applying func to each value of stream.
 
-async def collect(stream: AsyncIterable[T]) -> List[T]:
-    """Collect async iterator into a list."""
-    return [obj async for obj in stream]
+    If ``hedge_after`` is set (delay in seconds or latency quantile like
+    ``'p95'``) coroutine func calls slower than that are duplicated and
+    the first result is used; extra calls are limited to ``hedge_ratio``
+    of all calls (see ``Hedger``).
+
+    Coroutine func is called for up to ``concurrency`` items at once
+    (``'auto'`` adjusts the limit to observed latency, see ``AIMDLimit``);
+    results are still yielded in stream order.
+
+    If ``yield_every`` and/or ``time_slice`` is set, the iterator yields
+    to event loop after that many items or seconds when stream has items
+    ready (see ``YieldBudget``).
+    """
+
+    __slots__ = ('_func', '_coro', '_stream', '_iter', '_closed', 'hedger',
+                 'limit', 'budget')
+
+    def __init__(self, func: MapCallback, stream: AsyncIterable[T], *,
+                 hedge_after: Optional[HedgeDelay] = None,
+                 hedge_ratio: float = 0.1,
+                 concurrency: Concurrency = 1,
+                 yield_every: int = 0,
+                 time_slice: Optional[float] = None) -> None:
+        if not callable(func):
+            raise ValueError("Excpected callable object", func)
+        self._coro = inspect.iscoroutinefunction(func)
+        self.hedger: Optional[Hedger[T, U]] = None
+        self.limit: Optional[ConcurrencyLimit] = None
+        self.budget = make_budget(yield_every, time_slice)
+        if hedge_after is not None:
+            if not self._coro:
+                raise ValueError("Hedging requires coroutine function", func)
+            func = self.hedger = Hedger(func, hedge_after,
+                                        max_ratio=hedge_ratio)
+        if concurrency != 1:
+            if not self._coro:
+                raise ValueError("Concurrency requires coroutine function",
+                                 func)
+            self.limit = make_limit(concurrency)
+            stream = cast(AsyncIterable[T], run_concurrently(
+                cast(Callable[[T], Awaitable[U]], func), stream, self.limit))
+            func, self._coro = operator.itemgetter(1), False
+        self._func = func
+        self._stream = stream
+        self._iter: Optional[AsyncIterator[T]] = None
+        self._closed = False
+
+    def __aiter__(self) -> AsyncIterator[U]:
+        return self
+
+    async def __anext__(self) -> U:
+        if self._closed:
+            raise StopAsyncIteration
+        it = self._iter
+        if it is None:
+            it = self._iter = self._stream.__aiter__()
+        obj = await it.__anext__()
+        budget = self.budget
+        if budget is not None and budget.tick():
+            await budget.pause()
+        if self._coro:
+            return await cast(Callable[[T], Awaitable[U]], self._func)(obj)
+        return cast(Callable[[T], U], self._func)(obj)
+
+    async def aclose(self) -> None:
+        """Stop iteration and close stream iterator (if it has been
+        started and supports closing).
+        """
+        self._closed = True
+        it = self._iter
+        if it is not None and hasattr(it, 'aclose'):
+            await it.aclose()  # type: ignore
+
+
+def _true(obj: Any) -> bool:
+    return True
+
+
+async def _selected(pairs: AsyncIterable[Tuple[T, bool]]) -> AsyncIterator[T]:
+    async for obj, ok in pairs:
+        if ok:
+            yield obj
 
 
 class Iterator(Generic[T]):
@@ -114,31 +371,112 @@ class Iterator(Generic[T]):
     >>> assert res == ['A', 'B', 'C', 1, 2, 3]
     """
 
+    __slots__ = ('_stream',)
+
     def __init__(self, stream: AsyncIterable[T]) -> None:
         self._stream = stream
 
-    async def __aiter__(self) -> AsyncIterator[T]:
-        async for obj in self._stream:
-            yield obj
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._stream.__aiter__()
 
     def chain(self,
               streamB: AsyncIterable[U],
-              *streamN: AsyncIterable[V]) -> 'Iterator[Union[T, U, V]]':
-        return type(self)(chain(self, streamB, *streamN))
+              *streamN: AsyncIterable[V],
+              prefetch: int = 0) -> 'Iterator[Union[T, U, V]]':
+        return type(self)(chain(self, streamB, *streamN, prefetch=prefetch))
+
+    def distinct(self, *,
+                 key: KeyCallback = None,
+                 window: int = 1024,
+                 mode: str = 'lru',
+                 error_rate: float = 0.01) -> 'Iterator[T]':
+        return type(self)(distinct(self, key=key, window=window,
+                                   mode=mode, error_rate=error_rate))
+
+    def filter(self, func: FilterCallback, *,
+               concurrency: Concurrency = 1,
+               yield_every: int = 0,
+               time_slice: Optional[float] = None) -> 'Iterator[T]':
+        return type(self)(filter(func, self, concurrency=concurrency,
+                                 yield_every=yield_every,
+                                 time_slice=time_slice))
 
-    def filter(self, func: FilterCallback) -> 'Iterator[T]':
-        return type(self)(filter(func, self))
+    def map(self, func: MapCallback, *,
+            hedge_after: Optional[HedgeDelay] = None,
+            hedge_ratio: float = 0.1,
+            concurrency: Concurrency = 1,
+            yield_every: int = 0,
+            time_slice: Optional[float] = None) -> 'Iterator[U]':
+        return type(self)(map(func, self, hedge_after=hedge_after,
+                              hedge_ratio=hedge_ratio,
+                              concurrency=concurrency,
+                              yield_every=yield_every,
+                              time_slice=time_slice))
 
-    def map(self, func: MapCallback) -> 'Iterator[U]':
-        return type(self)(map(func, self))
+    def cached_map(self, func: MapCallback, *,
+                   key: KeyCallback = None,
+                   maxsize: Optional[int] = 128,
+                   ttl: Optional[float] = None,
+                   cache: Optional[MapCache[Any]] = None,
+                   concurrency: Concurrency = 1) -> 'Iterator[U]':
+        return type(self)(cached_map(func, self, key=key, maxsize=maxsize,
+                                     ttl=ttl, cache=cache,
+                                     concurrency=concurrency))
+
+    def flat_map(self, func: FlatMapCallback, *,
+                 concurrency: int = 1,
+                 ordered: bool = True,
+                 buffer_size: int = 1) -> 'Iterator[U]':
+        return type(self)(flat_map(func, self,
+                                   concurrency=concurrency, ordered=ordered,
+                                   buffer_size=buffer_size))
 
     def mix(self,
             streamB: AsyncIterable[U],
-            *streamN: AsyncIterable[V]) -> 'Iterator[Union[T, U, V]]':
-        return type(self)(mix(self, streamB, *streamN))
+            *streamN: AsyncIterable[V],
+            shed: Optional[ShedPolicy] = None,
+            on_drop: Optional[Callable[[Any], Any]] = None,
+            on_wait: Optional[Callable[[float], Any]] = None
+            ) -> 'Iterator[Union[T, U, V]]':
+        return type(self)(mix(self, streamB, *streamN,
+                              shed=shed, on_drop=on_drop, on_wait=on_wait))
+
+    def prefetch(self, buffer_size: int = 1) -> 'Iterator[T]':
+        return type(self)(prefetch(self, buffer_size))
+
+    def coalesce(self, *, key: KeyCallback = None,
+                 max_pending: int = 1024) -> 'Iterator[T]':
+        return type(self)(coalesce(self, key=key, max_pending=max_pending))
+
+    def debounce(self, wait: float) -> 'Iterator[T]':
+        return type(self)(debounce(self, wait))
+
+    def sample(self, interval: float) -> 'Iterator[T]':
+        return type(self)(sample(self, interval))
+
+    def scan(self, func: ReduceCallback,
+             initial: Any = _MISSING) -> 'Iterator[Any]':
+        return type(self)(scan(func, self, initial))
+
+    def offload(self, stage: Stage, *,
+                worker: Worker,
+                batch: int = 64,
+                buffer: int = 2) -> 'Iterator[Any]':
+        return type(self)(offload(self, stage, worker=worker,
+                                  batch=batch, buffer=buffer))
+
+    def pipeline(self, *stages: Placement,
+                 batch: int = 64,
+                 buffer: int = 2) -> 'Iterator[Any]':
+        return type(self)(pipeline(self, *stages,
+                                   batch=batch, buffer=buffer))
 
-    def split(self, *, buffer_size: int = 1) -> 'Iterator[T]':
+    def split(self, *, buffer_size: int = 1,
+              on_wait: Optional[Callable[[float], Any]] = None,
+              sizer: Optional[BufferSizer] = None
+              ) -> 'Iterator[T]':
         if isinstance(self._stream, _StreamSplitter):
             return type(self)(self._stream)
-        self._stream, copy = split(self._stream, buffer_size=buffer_size)
+        self._stream, copy = split(self._stream, buffer_size=buffer_size,
+                                   on_wait=on_wait, sizer=sizer)
         return type(self)(copy)
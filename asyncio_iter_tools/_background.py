@@ -0,0 +1,70 @@
+import abc
+import asyncio
+import weakref
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Coroutine,
+    Generic,
+    Optional,
+    TypeVar,
+)
+
+from ._compat import get_running_loop
+
+
+__all__ = [
+    'BackgroundIter',
+]
+
+T = TypeVar('T')
+
+
+class BackgroundIter(abc.ABC, Generic[T]):
+    """Async iterator reading its stream in a background task.
+
+    Subclasses provide the reader coroutine and close the state it shares
+    with the iterator.  Reader must not reference the iterator, so
+    the task is cancelled when iterator is garbage collected.
+    """
+
+    def __init__(self, stream: AsyncIterable[Any]) -> None:
+        self._stream: Optional[AsyncIterable[Any]] = stream
+        self._task: Optional[asyncio.Task] = None
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    @abc.abstractmethod
+    async def __anext__(self) -> T:
+        """Return next item."""
+
+    def start(self) -> None:
+        """Start reading stream in background (if not yet started)."""
+        if self._task is not None or self._stream is None:
+            return
+        stream, self._stream = self._stream, None
+        loop = get_running_loop()
+        self._task = task = loop.create_task(self._reader(stream, loop))
+        weakref.finalize(self, task.cancel)
+
+    async def aclose(self) -> None:
+        """Stop reading stream and cancel reader task."""
+        self._stream = None
+        self._close()
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait([task])
+
+    @abc.abstractmethod
+    def _reader(self, stream: AsyncIterable[Any],
+                loop: asyncio.AbstractEventLoop
+                ) -> Coroutine[Any, Any, None]:
+        """Return reader coroutine (not referencing the iterator)."""
+
+    @abc.abstractmethod
+    def _close(self) -> None:
+        """Close state shared with reader, waking up consumer."""
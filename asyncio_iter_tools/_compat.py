@@ -2,9 +2,24 @@ import asyncio
 
 __all__ = [
     'get_running_loop',
+    'all_tasks',
+    'shared_memory',
+    'resource_tracker',
 ]
 
 if hasattr(asyncio, 'get_running_loop'):
     get_running_loop = asyncio.get_running_loop
 else:
     get_running_loop = asyncio.get_event_loop
+
+if hasattr(asyncio, 'all_tasks'):
+    all_tasks = asyncio.all_tasks
+else:   # Python < 3.7
+    all_tasks = asyncio.Task.all_tasks   # type: ignore
+
+try:
+    from multiprocessing import shared_memory  # type: ignore
+    from multiprocessing import resource_tracker  # type: ignore
+except ImportError:     # Python < 3.8
+    shared_memory = None    # type: ignore
+    resource_tracker = None    # type: ignore
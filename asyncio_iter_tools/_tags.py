@@ -0,0 +1,59 @@
+import collections
+
+from typing import (
+    Any,
+    Generic,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+
+__all__ = [
+    'TagTable',
+]
+
+T = TypeVar('T')
+
+
+class TagTable(Generic[T]):
+    """Tags attached to items by identity, so items pass through
+    pipeline stages (and user code) as is.
+
+    Table keeps references to tagged items, so their ids are not reused
+    while tagged, and holds up to ``maxsize`` of them forgetting the
+    oldest ones (tags of items dropped by stages are never removed).
+    An item already tagged keeps its first tag until it is removed.
+    """
+
+    __slots__ = ('_items', '_maxsize')
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("Expected positive maxsize", maxsize)
+        self._items: 'collections.OrderedDict[int, Tuple[Any, T]]'
+        self._items = collections.OrderedDict()
+        self._maxsize = maxsize
+
+    def add(self, obj: Any, tag: T) -> None:
+        """Tag item unless it is already tagged."""
+        items = self._items
+        key = id(obj)
+        if key in items:
+            return
+        items[key] = (obj, tag)
+        if len(items) > self._maxsize:
+            items.popitem(last=False)
+
+    def get(self, obj: Any) -> Optional[T]:
+        """Return tag of item or None."""
+        entry = self._items.get(id(obj))
+        return None if entry is None else entry[1]
+
+    def pop(self, obj: Any) -> Optional[T]:
+        """Remove and return tag of item or None."""
+        entry = self._items.pop(id(obj), None)
+        return None if entry is None else entry[1]
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,224 @@
+import asyncio
+import collections
+import time
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .stats import LatencyWindow
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+Concurrency = Union[int, str, 'ConcurrencyLimit']
+
+
+class ConcurrencyLimit:
+    """Fixed limit of concurrent calls."""
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError("Expected positive limit", limit)
+        self._limit: float = limit
+        self.in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        """Current limit of concurrent calls."""
+        return int(self._limit)
+
+    def on_sample(self, latency: float, ok: bool = True) -> None:
+        """Account completed call."""
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} limit:{self.limit}'
+                f' in_flight:{self.in_flight}>')
+
+
+class AIMDLimit(ConcurrencyLimit):
+    """Adaptive limit of concurrent calls (additive increase,
+    multiplicative decrease).
+
+    Limit grows by one per ``limit`` successful calls and is multiplied
+    by ``backoff`` when a call fails or its latency exceeds ``tolerance``
+    times the baseline (10th percentile of recent latencies), which means
+    the backend is queueing requests.  At most one decrease is applied
+    per ``limit`` samples, as calls started before a decrease report
+    the same congestion.
+    """
+
+    def __init__(self, initial: int = 4, *,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 backoff: float = 0.9,
+                 tolerance: float = 2.0,
+                 window: int = 100) -> None:
+        if not 0 < min_limit <= initial <= max_limit:
+            raise ValueError("Expected 0 < min_limit <= initial <= max_limit",
+                             min_limit, initial, max_limit)
+        if not 0 < backoff < 1:
+            raise ValueError("Expected backoff in (0, 1)", backoff)
+        super().__init__(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._backoff = backoff
+        self._tolerance = tolerance
+        self.latency = LatencyWindow(window)
+        self._cooldown = 0
+
+    def on_sample(self, latency: float, ok: bool = True) -> None:
+        baseline = self.latency.quantile(0.1)
+        if ok:
+            self.latency.add(latency)
+        if self._cooldown > 0:
+            self._cooldown -= 1
+        if not ok or (baseline and latency > self._tolerance * baseline):
+            if self._cooldown <= 0:
+                self._cooldown = self.limit
+                self._limit = max(self.min_limit, self._limit * self._backoff)
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+
+class BufferSizer:
+    """Adaptive size of a queue buffer (additive increase, multiplicative
+    decrease) driven by time producer and consumers spend waiting.
+
+    Queue reports each wait of producer on full buffer (``on_full()``)
+    and of consumer on empty buffer (``on_empty()``).  Over windows of
+    ``interval`` seconds, if both sides waited more than ``threshold``
+    of the window, rates are bursty and the buffer grows by one to absorb
+    bursts; if only one side waited, the slower side sets the pace and
+    a larger buffer only holds items longer, so it shrinks by ``backoff``.
+    Size is kept within ``[min_size, max_size]``; current size is
+    ``size``.
+
+    >>> sizer = BufferSizer(initial=4, max_size=256)
+    >>> queue = ClosableQueue(sizer=sizer)
+    """
+
+    def __init__(self, initial: int = 1, *,
+                 min_size: int = 1,
+                 max_size: int = 1024,
+                 backoff: float = 0.9,
+                 threshold: float = 0.05,
+                 interval: float = 1.0) -> None:
+        if not 0 < min_size <= initial <= max_size:
+            raise ValueError("Expected 0 < min_size <= initial <= max_size",
+                             min_size, initial, max_size)
+        if not 0 < backoff < 1:
+            raise ValueError("Expected backoff in (0, 1)", backoff)
+        if interval <= 0:
+            raise ValueError("Expected positive interval", interval)
+        self._size: float = initial
+        self.min_size = min_size
+        self.max_size = max_size
+        self._backoff = backoff
+        self._threshold = threshold
+        self._interval = interval
+        self._start = time.monotonic()
+        self._full = 0.0
+        self._empty = 0.0
+
+    @property
+    def size(self) -> int:
+        """Current buffer size."""
+        return int(self._size)
+
+    def on_full(self, wait: float) -> None:
+        """Account time producer waited on full buffer."""
+        self._full += wait
+        self._update()
+
+    def on_empty(self, wait: float) -> None:
+        """Account time consumer waited on empty buffer."""
+        self._empty += wait
+        self._update()
+
+    def _update(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._start
+        if elapsed < self._interval:
+            return
+        full = self._full > self._threshold * elapsed
+        empty = self._empty > self._threshold * elapsed
+        if full and empty:
+            self._size = min(self.max_size, self._size + 1)
+        elif full or empty:
+            self._size = max(self.min_size, self._size * self._backoff)
+        self._start = now
+        self._full = self._empty = 0.0
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} size:{self.size}>'
+
+
+def make_limit(concurrency: Concurrency) -> ConcurrencyLimit:
+    """Return concurrency limit object for
+    ``int | 'auto' | ConcurrencyLimit`` argument.
+    """
+    if isinstance(concurrency, ConcurrencyLimit):
+        return concurrency
+    if concurrency == 'auto':
+        return AIMDLimit()
+    if isinstance(concurrency, int):
+        return ConcurrencyLimit(concurrency)
+    raise ValueError("Bad concurrency", concurrency)
+
+
+async def run_concurrently(func: Callable[[T], Awaitable[U]],
+                           stream: AsyncIterable[T],
+                           limit: ConcurrencyLimit
+                           ) -> AsyncIterator[Tuple[T, U]]:
+    """Call coroutine func for items of stream with up to ``limit.limit``
+    calls in flight and yield ``(item, result)`` pairs in stream order.
+    """
+    loop = get_running_loop()
+    it = stream.__aiter__()
+    pending: Deque[Tuple[T, 'asyncio.Future[U]']] = collections.deque()
+    exhausted = False
+
+    async def call(obj: T) -> U:
+        start = loop.time()
+        limit.in_flight += 1
+        try:
+            res = await func(obj)
+        except Exception:
+            limit.on_sample(loop.time() - start, False)
+            raise
+        finally:
+            limit.in_flight -= 1
+        limit.on_sample(loop.time() - start)
+        return res
+
+    try:
+        while True:
+            # do not read ahead if head result is ready
+            while (not exhausted and len(pending) < limit.limit
+                   and not (pending and pending[0][1].done())):
+                try:
+                    obj = await it.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.append((obj, loop.create_task(call(obj))))
+            if not pending:
+                break
+            obj, task = pending[0]
+            res: Any = await task
+            pending.popleft()
+            yield obj, res
+    finally:
+        for _, task in pending:
+            task.cancel()
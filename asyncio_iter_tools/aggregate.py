@@ -0,0 +1,170 @@
+import inspect
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+
+__all__ = [
+    'collect',
+    'reduce',
+    'scan',
+    'count',
+    'sum',
+    'min',
+    'max',
+]
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+ReduceCallback = Callable[[U, T], Union[U, Awaitable[U]]]
+KeyCallback = Optional[Callable[[T], Any]]
+
+_MISSING: Any = object()
+
+# initial capacity of numpy buffer, doubled when full
+_NUMPY_CHUNK = 1024
+
+
+async def collect(stream: AsyncIterable[T], into: Any = None) -> Any:
+    """Collect async iterator into a list (or given container).
+
+    ``into`` may be a container with ``append()`` method (for instance
+    ``array.array('d')`` or ``collections.deque(maxlen=N)``) which is
+    filled and returned, or a numpy dtype (requires numpy) to collect
+    items into a numpy array grown geometrically.
+
+    >>> await collect(stream, into=array.array('q'))
+    array('q', [1, 2, 3])
+    """
+    if into is None:
+        return [obj async for obj in stream]
+    append = getattr(into, 'append', None)
+    if append is not None:
+        async for obj in stream:
+            append(obj)
+        return into
+    try:
+        # imported lazily, it is slow to import
+        import numpy
+    except ImportError:     # optional dependency
+        raise ValueError("Expected container with append() method", into)
+    return await _collect_numpy(stream, numpy, numpy.dtype(into))
+
+
+async def _collect_numpy(stream: AsyncIterable[T], numpy: Any,
+                         dtype: Any) -> Any:
+    buf = numpy.empty(_NUMPY_CHUNK, dtype=dtype)
+    size = 0
+    async for obj in stream:
+        if size >= len(buf):
+            grown = numpy.empty(len(buf) * 2, dtype=dtype)
+            grown[:size] = buf
+            buf = grown
+        buf[size] = obj
+        size += 1
+    # shrink in place (buffer is owned by the array)
+    buf.resize(size, refcheck=False)
+    return buf
+
+
+async def reduce(func: ReduceCallback, stream: AsyncIterable[T],
+                 initial: Any = _MISSING) -> Any:
+    """Apply func of two arguments cumulatively to items of stream
+    and return the final value (see ``functools.reduce``).
+
+    func may be either simple callable or coroutine.
+    """
+    acc = initial
+    async for acc in scan(func, stream, initial):
+        pass
+    if acc is _MISSING:
+        raise TypeError("reduce() of empty stream with no initial value")
+    return acc
+
+
+async def scan(func: ReduceCallback, stream: AsyncIterable[T],
+               initial: Any = _MISSING) -> AsyncIterator[Any]:
+    """Yield accumulated results of func of two arguments applied to
+    items of stream (see ``itertools.accumulate``); ``initial``
+    (if given) is not yielded.
+
+    func may be either simple callable or coroutine.
+    """
+    if not callable(func):
+        raise ValueError("Expected callable object", func)
+    coro = inspect.iscoroutinefunction(func)
+    it = stream.__aiter__()
+    acc = initial
+    if acc is _MISSING:
+        try:
+            acc = await it.__anext__()
+        except StopAsyncIteration:
+            return
+        yield acc
+    if coro:
+        afunc = cast(Callable[[Any, T], Awaitable[Any]], func)
+        async for obj in it:
+            acc = await afunc(acc, obj)
+            yield acc
+    else:
+        sfunc = cast(Callable[[Any, T], Any], func)
+        async for obj in it:
+            acc = sfunc(acc, obj)
+            yield acc
+
+
+async def count(stream: AsyncIterable[Any]) -> int:
+    """Return number of items in stream."""
+    res = 0
+    async for _ in stream:
+        res += 1
+    return res
+
+
+async def sum(stream: AsyncIterable[Any], start: Any = 0) -> Any:
+    """Return sum of items of stream plus ``start``."""
+    res = start
+    async for obj in stream:
+        res += obj
+    return res
+
+
+async def min(stream: AsyncIterable[T], *,
+              key: KeyCallback = None,
+              default: Any = _MISSING) -> Any:
+    """Return the smallest item of stream (see builtin ``min``)."""
+    return await _extreme(stream, key, default, False)
+
+
+async def max(stream: AsyncIterable[T], *,
+              key: KeyCallback = None,
+              default: Any = _MISSING) -> Any:
+    """Return the largest item of stream (see builtin ``max``)."""
+    return await _extreme(stream, key, default, True)
+
+
+async def _extreme(stream: AsyncIterable[T], key: KeyCallback,
+                   default: Any, largest: bool) -> Any:
+    best: Any = _MISSING
+    best_key: Any = None
+    async for obj in stream:
+        obj_key = obj if key is None else key(obj)
+        if (best is _MISSING
+                or (obj_key > best_key if largest else obj_key < best_key)):
+            best, best_key = obj, obj_key
+    if best is _MISSING:
+        if default is _MISSING:
+            name = 'max' if largest else 'min'
+            raise ValueError(f"{name}() arg is an empty stream")
+        return default
+    return best
@@ -0,0 +1,73 @@
+import concurrent.futures
+
+from typing import (
+    cast,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from .queue import ThreadBridgeQueue
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+
+
+async def from_sync_iterable(iterable: Iterable[T],
+                             executor: Optional[
+                                 concurrent.futures.Executor] = None,
+                             *,
+                             batch: int = 64) -> AsyncIterator[T]:
+    """Turn blocking iterable into async iterator.
+
+    Iterable is consumed in an executor thread (default executor if
+    ``executor`` is None) and its items are passed to the event loop
+    through ``ThreadBridgeQueue`` in batches of up to ``batch`` items,
+    one loop wakeup per batch.
+    Up to two batches are buffered ahead of consumer.
+
+    >>> def read_rows(cursor):
+    ...     cursor.execute('SELECT * FROM tbl')
+    ...     yield from cursor
+    >>> async for row in from_sync_iterable(read_rows(cursor)):
+    ...     print(row)
+    """
+    if batch <= 0:
+        raise ValueError("Expected positive batch", batch)
+    loop = get_running_loop()
+    queue: ThreadBridgeQueue[T] = ThreadBridgeQueue(batch * 2, loop=loop)
+    future = loop.run_in_executor(executor, _produce, iterable, queue, batch)
+    try:
+        while True:
+            items = queue.drain_nowait()
+            if not items:
+                obj = await queue.get()
+                if obj is queue.EndOfStream:
+                    break
+                items = [cast(T, obj)]
+            for obj in items:
+                yield obj
+        # re-raise iterable errors
+        await future
+    finally:
+        # stops producer thread on its next put
+        queue.close()
+
+
+def _produce(iterable: Iterable[T],
+             queue: ThreadBridgeQueue[T], batch: int) -> None:
+    try:
+        items: List[T] = []
+        for obj in iterable:
+            items.append(obj)
+            if len(items) >= batch:
+                if not queue.put_many(items):
+                    return
+                items = []
+        if items:
+            queue.put_many(items)
+    finally:
+        queue.close()
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from typing import (
+    Optional,
+)
+
+from .stats import LatencyWindow
+
+
+__all__ = [
+    'YieldBudget',
+]
+
+
+class YieldBudget:
+    """Cooperative yielding budget of a hot loop.
+
+    ``tick()`` is called once per item and returns True once either
+    ``every`` items were processed or ``time_slice`` seconds have passed
+    since the last yield; ``pause()`` then yields to event loop.
+
+    Durations of slices the loop was held between yields are collected
+    in ``lag`` window (see ``LatencyWindow``), ``yields`` counts pauses.
+
+    >>> budget = YieldBudget(every=100, time_slice=0.005)
+    >>> for obj in items:
+    ...     process(obj)
+    ...     if budget.tick():
+    ...         await budget.pause()
+    """
+
+    __slots__ = ('every', 'time_slice', 'yields', 'lag', '_count', '_start')
+
+    def __init__(self, every: int = 0,
+                 time_slice: Optional[float] = None, *,
+                 window: int = 1000) -> None:
+        if every < 0:
+            raise ValueError("Expected non-negative every", every)
+        if time_slice is not None and time_slice <= 0:
+            raise ValueError("Expected positive time_slice", time_slice)
+        if not every and time_slice is None:
+            raise ValueError("Expected either every or time_slice")
+        self.every = every
+        self.time_slice = time_slice
+        self.yields = 0
+        self.lag = LatencyWindow(window)
+        self._count = 0
+        self._start = 0.0
+
+    def tick(self) -> bool:
+        """Account one item; return True if loop should yield."""
+        self._count += 1
+        if self.every and self._count >= self.every:
+            return True
+        if self.time_slice is not None:
+            now = time.monotonic()
+            if not self._start:
+                self._start = now
+            elif now - self._start >= self.time_slice:
+                return True
+        return False
+
+    async def pause(self) -> None:
+        """Yield to event loop and start a new slice."""
+        if self._start:
+            self.lag.add(time.monotonic() - self._start)
+        self.yields += 1
+        await asyncio.sleep(0)
+        self._count = 0
+        self._start = time.monotonic()
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} every:{self.every}'
+                f' time_slice:{self.time_slice} yields:{self.yields}>')
+
+
+def make_budget(yield_every: int,
+                time_slice: Optional[float]) -> Optional[YieldBudget]:
+    """Return budget for ``yield_every``/``time_slice`` arguments
+    or None if neither is set.
+    """
+    if not yield_every and time_slice is None:
+        return None
+    return YieldBudget(yield_every, time_slice)
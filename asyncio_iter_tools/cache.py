@@ -0,0 +1,201 @@
+import asyncio
+import collections
+import functools
+import inspect
+import time
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .adaptive import (
+    Concurrency,
+    ConcurrencyLimit,
+    make_limit,
+    run_concurrently,
+)
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+MapCallback = Callable[[T], Union[U, Awaitable[U]]]
+KeyCallback = Optional[Callable[[T], Hashable]]
+
+
+class MapCache(Generic[U]):
+    """LRU cache with optional time-to-live of entries.
+
+    ``get()`` coalesces concurrent requests of the same missing key
+    into a single call of the value factory.
+    ``hits``, ``misses`` and ``coalesced`` counters are kept for stats.
+
+    The cache may be shared between several ``cached_map`` stages.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128,
+                 ttl: Optional[float] = None) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: 'collections.OrderedDict[Hashable, Tuple[U, float]]'
+        self._data = collections.OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Max number of entries (None if unbounded)."""
+        return self._maxsize
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Entry time-to-live in seconds (None if entries never expire)."""
+        return self._ttl
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Optional[U]]:
+        """Return ``(True, value)`` if key is cached, ``(False, None)``
+        otherwise; counts a hit on success.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        value, expires = entry
+        if expires and expires <= time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def store(self, key: Hashable, value: U) -> None:
+        """Put value into cache evicting least recently used entries."""
+        expires = time.monotonic() + self._ttl if self._ttl else 0.0
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        if self._maxsize is not None:
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    async def get(self, key: Hashable,
+                  factory: Callable[[], Awaitable[U]]) -> U:
+        """Get cached value or compute it with ``factory()``.
+
+        If value for the key is already being computed, wait for
+        that computation instead of starting a new one.
+        """
+        found, value = self.lookup(key)
+        if found:
+            return cast(U, value)
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(factory(), loop=get_running_loop())
+            task.add_done_callback(functools.partial(self._on_done, key))
+            self._pending[key] = task
+        else:
+            self.coalesced += 1
+        # cancelling one waiter must not cancel others
+        return cast(U, await asyncio.shield(task))
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._data.clear()
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled() and task.exception() is None:
+            self.store(key, task.result())
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} size:{len(self._data)}'
+                f' hits:{self.hits} misses:{self.misses}'
+                f' coalesced:{self.coalesced}>')
+
+
+class cached_map(Generic[T, U]):
+    """Return async iterator applying func to each value of stream,
+    caching results by ``key(value)`` (value itself by default).
+
+    Least recently used results are evicted once there are more than
+    ``maxsize`` of them, results older than ``ttl`` seconds are recomputed.
+    Concurrent lookups of the same key (e.g. when ``cache`` is shared by
+    several streams) share a single call of coroutine func.
+
+    func may be either simple callable or coroutine.
+    Coroutine func is called for up to ``concurrency`` items at once
+    (see ``map``); duplicate keys in flight still share a single call.
+    Cache stats are available through ``cache`` attribute.
+    """
+
+    __slots__ = ('_func', '_coro', '_key', '_stream', '_iter', 'cache',
+                 'limit')
+
+    def __init__(self, func: MapCallback, stream: AsyncIterable[T], *,
+                 key: KeyCallback = None,
+                 maxsize: Optional[int] = 128,
+                 ttl: Optional[float] = None,
+                 cache: Optional[MapCache[U]] = None,
+                 concurrency: Concurrency = 1) -> None:
+        if not callable(func):
+            raise ValueError("Expected callable object", func)
+        self._func = func
+        self._coro = inspect.iscoroutinefunction(func)
+        self._key = key
+        if cache is None:
+            cache = MapCache(maxsize, ttl)
+        self.cache = cache
+        self.limit: Optional[ConcurrencyLimit] = None
+        if concurrency != 1:
+            if not self._coro:
+                raise ValueError("Concurrency requires coroutine function",
+                                 func)
+            self.limit = make_limit(concurrency)
+            stream = cast(AsyncIterable[T], run_concurrently(
+                self._get, stream, self.limit))
+        self._stream = stream
+        self._iter: Optional[AsyncIterator[T]] = None
+
+    def __aiter__(self) -> AsyncIterator[U]:
+        return self
+
+    async def __anext__(self) -> U:
+        it = self._iter
+        if it is None:
+            it = self._iter = self._stream.__aiter__()
+        obj = await it.__anext__()
+        if self.limit is not None:
+            # (item, value) pairs of run_concurrently()
+            return cast(Tuple[T, U], obj)[1]
+        if self._coro:
+            return await self._get(obj)
+        key: Any = obj if self._key is None else self._key(obj)
+        found, value = self.cache.lookup(key)
+        if not found:
+            self.cache.misses += 1
+            value = cast(Callable[[T], U], self._func)(obj)
+            self.cache.store(key, cast(U, value))
+        return cast(U, value)
+
+    def _get(self, obj: T) -> Awaitable[U]:
+        key: Any = obj if self._key is None else self._key(obj)
+        func = cast(Callable[[T], Awaitable[U]], self._func)
+        return self.cache.get(key, functools.partial(func, obj))
@@ -0,0 +1,163 @@
+import inspect
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from ._tags import TagTable
+
+
+__all__ = [
+    'Checkpointer',
+]
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+MapCallback = Callable[[T], Union[U, Awaitable[U]]]
+PositionCallback = Optional[Callable[[T], Any]]
+
+_MISSING: Any = object()
+
+
+class _Position:
+    """Source position of an item and number of sinks completed it."""
+
+    __slots__ = ('source', 'position', 'commits')
+
+    def __init__(self, source: Hashable, position: Any) -> None:
+        self.source = source
+        self.position = position
+        self.commits = 0
+
+
+class Checkpointer:
+    """Tracks positions of source items fully processed by pipeline
+    sinks and reports low-watermarks to checkpoint and resume from.
+
+    Items of sources registered with ``source()`` are tagged with their
+    position; ``commit()`` marks an item complete at a sink once consumer
+    asks for the next one.  Tags are kept aside by identity of items
+    (see ``Tracer``), so items pass through stages unchanged; results
+    of ``map()`` callbacks wrapped with ``cp.map()`` carry positions
+    of their inputs, items produced by other stages are not tracked.
+    Items of different sources must be distinct objects (records rather
+    than small ints or interned strings); untracked items just do not
+    advance watermarks.  Up to ``max_tracked`` items are tracked at once.
+
+    Watermark of a source is the last position completed by all sinks
+    (for example, by both consumers of ``split``); every earlier item of
+    that source is either completed or has been dropped.
+    This relies on stages preserving order of items of each source
+    (``mix``, ``split``, ``chain``, ``map``, ``filter`` do; ``coalesce``
+    and unordered ``flat_map`` do not).
+
+    >>> cp = Checkpointer()
+    >>> start = saved.get('log', -1) + 1
+    >>> it = Iterator(cp.source(read_log(start), 'log', start=start))
+    >>> async for obj in cp.commit(it.map(cp.map(parse)).filter(valid)):
+    ...     await store(obj)
+    ...     save(cp.watermarks())
+    """
+
+    def __init__(self, *, max_tracked: int = 10000) -> None:
+        self._sources: Dict[Hashable, None] = {}
+        self._sinks: Dict[Hashable, Dict[Hashable, Any]] = {}
+        self._positions: TagTable[_Position] = TagTable(max_tracked)
+
+    async def source(self, stream: AsyncIterable[T], name: Hashable, *,
+                     position: PositionCallback = None,
+                     start: int = 0) -> AsyncIterator[T]:
+        """Yield items of stream tagging them with their position.
+
+        Position is ``position(item)`` (for instance a log offset)
+        or item index counted from ``start``.
+        """
+        self._sources[name] = None
+        positions = self._positions
+        pos = start
+        async for obj in stream:
+            if position is not None:
+                positions.add(obj, _Position(name, position(obj)))
+            else:
+                positions.add(obj, _Position(name, pos))
+                pos += 1
+            yield obj
+
+    def commit(self, stream: AsyncIterable[T],
+               sink: Hashable = 'default') -> AsyncIterator[T]:
+        """Yield items of stream at a sink.
+
+        Item is marked complete when the next one is requested.
+        All sinks must be created before watermarks are used.
+        """
+        if sink in self._sinks:
+            raise ValueError("Sink already registered", sink)
+        done = self._sinks[sink] = {}
+        return self._commit(stream, done)
+
+    async def _commit(self, stream: AsyncIterable[T],
+                      done: Dict[Hashable, Any]) -> AsyncIterator[T]:
+        positions = self._positions
+        async for obj in stream:
+            tag = positions.get(obj)
+            yield obj
+            if tag is None:
+                continue
+            done[tag.source] = tag.position
+            tag.commits += 1
+            if tag.commits >= len(self._sinks):
+                positions.pop(obj)
+
+    def watermarks(self) -> Dict[Hashable, Any]:
+        """Return last positions completed by all sinks per source
+        (sources not yet completed by some sink are omitted).
+        """
+        res = {}
+        for source in self._sources:
+            positions = [done.get(source, _MISSING)
+                         for done in self._sinks.values()]
+            if not positions or any(p is _MISSING for p in positions):
+                continue
+            res[source] = min(positions)
+        return res
+
+    def map(self, func: MapCallback) -> MapCallback:
+        """Wrap ``map`` stage callback so results keep positions
+        of their inputs.
+        """
+        if not callable(func):
+            raise ValueError("Expected callable object", func)
+        positions = self._positions
+        if inspect.iscoroutinefunction(func):
+            afunc = cast(Callable[[Any], Awaitable[Any]], func)
+
+            async def map_coro(obj: Any) -> Any:
+                res = await afunc(obj)
+                tag = positions.get(obj)
+                if tag is not None:
+                    positions.add(res, tag)
+                return res
+            return map_coro
+
+        def map_func(obj: Any) -> Any:
+            res = func(obj)
+            tag = positions.get(obj)
+            if tag is not None:
+                positions.add(res, tag)
+            return res
+        return map_func
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} sources:{len(self._sources)}'
+                f' sinks:{len(self._sinks)} tracked:{len(self._positions)}>')
@@ -0,0 +1,278 @@
+import abc
+import asyncio
+import collections
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Coroutine,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+
+from ._background import BackgroundIter
+
+
+__all__ = [
+    'coalesce',
+    'debounce',
+    'sample',
+]
+
+T = TypeVar('T')
+
+KeyCallback = Optional[Callable[[T], Hashable]]
+
+_MISSING: Any = object()
+
+
+def coalesce(stream: AsyncIterable[T], *,
+             key: KeyCallback = None,
+             max_pending: int = 1024) -> AsyncIterator[T]:
+    """Read stream in background keeping only the latest unconsumed item
+    per ``key(item)`` (item itself by default) while consumer is busy.
+
+    Items are yielded in order their keys first became pending;
+    superseded items are dropped.  Up to ``max_pending`` keys are kept
+    pending: reading an item with a new key then waits for consumer
+    (items of pending keys still replace older ones), so streams of
+    mostly unique keys do not grow the buffer without bound.
+
+    >>> async for status in coalesce(updates, key=lambda u: u.host):
+    ...     await render(status)
+    """
+    if max_pending <= 0:
+        raise ValueError("Expected positive max_pending", max_pending)
+    return _LatestIter(stream, _KeyedBuffer(key, max_pending))
+
+
+def debounce(stream: AsyncIterable[T], wait: float) -> AsyncIterator[T]:
+    """Yield an item only once ``wait`` seconds have passed without
+    a newer one; the last item is yielded at the end of stream.
+    """
+    if wait < 0:
+        raise ValueError("Expected non-negative wait", wait)
+    return _LatestIter(stream, _DebounceBuffer(wait))
+
+
+def sample(stream: AsyncIterable[T], interval: float) -> AsyncIterator[T]:
+    """Yield the latest item every ``interval`` seconds if there is
+    a new one; the last item is yielded at the end of stream.
+    """
+    if interval <= 0:
+        raise ValueError("Expected positive interval", interval)
+    return _LatestIter(stream, _SampleBuffer(interval))
+
+
+class _Buffer(abc.ABC, Generic[T]):
+    """State shared by iterator and its reader task.
+
+    New items replace pending ones; reader task waits only when
+    ``accepts()`` refuses an item until consumer pops one.
+    Timed buffers use a single timer re-armed lazily.
+    """
+
+    def __init__(self) -> None:
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+        self.exc: Optional[BaseException] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._space_waiter: Optional[asyncio.Future] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @abc.abstractmethod
+    def ready(self) -> bool:
+        """Return True if an item may be popped."""
+
+    @abc.abstractmethod
+    def pop(self) -> T:
+        """Remove and return ready item."""
+
+    @abc.abstractmethod
+    def push(self, obj: T) -> None:
+        """Add item read from stream."""
+
+    def accepts(self, obj: T) -> bool:
+        """Return False if reader must wait before pushing item."""
+        return True
+
+    def flush(self) -> None:
+        """Make pending item ready at the end of stream."""
+
+    def close(self, flush: bool = True) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if flush and not self.closed:
+            self.flush()
+        self.closed = True
+        self.wake()
+
+    def wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait(self) -> None:
+        assert self.loop is not None
+        self._waiter = self.loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def wake_reader(self) -> None:
+        waiter = self._space_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def wait_space(self) -> None:
+        assert self.loop is not None
+        self._space_waiter = self.loop.create_future()
+        try:
+            await self._space_waiter
+        finally:
+            self._space_waiter = None
+
+
+class _KeyedBuffer(_Buffer[T]):
+
+    def __init__(self, key: KeyCallback, max_pending: int) -> None:
+        super().__init__()
+        self._key = key
+        self._max_pending = max_pending
+        self._pending: 'collections.OrderedDict[Hashable, T]'
+        self._pending = collections.OrderedDict()
+
+    def ready(self) -> bool:
+        return bool(self._pending)
+
+    def pop(self) -> T:
+        obj = self._pending.popitem(last=False)[1]
+        self.wake_reader()
+        return obj
+
+    def push(self, obj: T) -> None:
+        key: Hashable = obj if self._key is None else self._key(obj)
+        self._pending[key] = obj
+        self.wake()
+
+    def accepts(self, obj: T) -> bool:
+        if len(self._pending) < self._max_pending:
+            return True
+        key: Hashable = obj if self._key is None else self._key(obj)
+        return key in self._pending
+
+
+class _LatestBuffer(_Buffer[T]):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._latest: T = _MISSING
+        self._ready: T = _MISSING
+
+    def ready(self) -> bool:
+        return self._ready is not _MISSING
+
+    def pop(self) -> T:
+        obj, self._ready = self._ready, _MISSING
+        return obj
+
+    def flush(self) -> None:
+        if self._latest is not _MISSING:
+            self._ready, self._latest = self._latest, _MISSING
+
+
+class _DebounceBuffer(_LatestBuffer[T]):
+
+    def __init__(self, wait: float) -> None:
+        super().__init__()
+        self._wait = wait
+        self._deadline = 0.0
+
+    def push(self, obj: T) -> None:
+        assert self.loop is not None
+        self._latest = obj
+        self._deadline = self.loop.time() + self._wait
+        if self._timer is None:
+            self._timer = self.loop.call_at(self._deadline, self._fire)
+
+    def _fire(self) -> None:
+        assert self.loop is not None
+        # deadline may have moved since timer was armed
+        if self.loop.time() < self._deadline:
+            self._timer = self.loop.call_at(self._deadline, self._fire)
+            return
+        self._timer = None
+        self.flush()
+        self.wake()
+
+
+class _SampleBuffer(_LatestBuffer[T]):
+
+    def __init__(self, interval: float) -> None:
+        super().__init__()
+        self._interval = interval
+
+    def push(self, obj: T) -> None:
+        assert self.loop is not None
+        self._latest = obj
+        if self._timer is None:
+            self._timer = self.loop.call_later(self._interval, self._fire)
+
+    def _fire(self) -> None:
+        assert self.loop is not None
+        if self._latest is _MISSING:
+            # idle stream: stop ticking until next item
+            self._timer = None
+            return
+        self._timer = self.loop.call_later(self._interval, self._fire)
+        self.flush()
+        self.wake()
+
+
+class _LatestIter(BackgroundIter[T]):
+
+    def __init__(self, stream: AsyncIterable[T], buffer: _Buffer[T]) -> None:
+        super().__init__(stream)
+        self._buffer = buffer
+
+    async def __anext__(self) -> T:
+        if self._task is None:
+            self.start()
+        buf = self._buffer
+        while not buf.ready():
+            if buf.closed:
+                exc, buf.exc = buf.exc, None
+                if exc is not None:
+                    raise exc
+                raise StopAsyncIteration
+            await buf.wait()
+        return buf.pop()
+
+    def _reader(self, stream: AsyncIterable[T],
+                loop: asyncio.AbstractEventLoop
+                ) -> Coroutine[Any, Any, None]:
+        self._buffer.loop = loop
+        return _reader(stream, self._buffer)
+
+    def _close(self) -> None:
+        self._buffer.close(flush=False)
+
+
+async def _reader(stream: AsyncIterable[T], buffer: _Buffer[T]) -> None:
+    try:
+        async for obj in stream:
+            while not buffer.accepts(obj):
+                await buffer.wait_space()
+            buffer.push(obj)
+    except asyncio.CancelledError:
+        buffer.close(flush=False)
+        raise
+    except Exception as exc:
+        buffer.exc = exc
+    buffer.close()
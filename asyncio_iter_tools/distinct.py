@@ -0,0 +1,164 @@
+import collections
+import math
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+
+
+T = TypeVar('T')
+
+KeyCallback = Optional[Callable[[T], Hashable]]
+
+
+class distinct(Generic[T]):
+    """Return async iterator yielding items of stream not seen before.
+
+    Memory is bounded by ``window``:
+
+    * ``mode='lru'`` (default) remembers exactly ``window`` most recently
+      seen keys; older duplicates may pass through again;
+    * ``mode='bloom'`` remembers at least ``window`` (at most twice as much)
+      last keys in a rotating Bloom filter; uses a few bits per key but
+      drops unique items with probability of about ``error_rate``.
+
+    Items are compared by ``key(item)`` (item itself by default).
+
+    >>> async def generate(seq):
+    ...     for obj in seq:
+    ...         yield obj
+    >>> res = [obj async for obj in distinct(generate('abacbd'))]
+    >>> assert res == ['a', 'b', 'c', 'd']
+    """
+
+    __slots__ = ('_key', '_seen', '_stream', '_iter')
+
+    def __init__(self, stream: AsyncIterable[T], *,
+                 key: KeyCallback = None,
+                 window: int = 1024,
+                 mode: str = 'lru',
+                 error_rate: float = 0.01) -> None:
+        if window <= 0:
+            raise ValueError("Expected positive window", window)
+        self._seen: _SeenSet
+        if mode == 'lru':
+            self._seen = _LRUSet(window)
+        elif mode == 'bloom':
+            self._seen = _RotatingBloomFilter(window, error_rate)
+        else:
+            raise ValueError("Unknown mode", mode)
+        self._key = key
+        self._stream = stream
+        self._iter: Optional[AsyncIterator[T]] = None
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        it = self._iter
+        if it is None:
+            it = self._iter = self._stream.__aiter__()
+        key = self._key
+        add = self._seen.add
+        while True:
+            obj = await it.__anext__()
+            if add(obj if key is None else key(obj)):
+                return obj
+
+
+class _SeenSet:
+
+    def add(self, key: Hashable) -> bool:
+        """Remember key; return True if it has not been seen."""
+        raise NotImplementedError
+
+
+class _LRUSet(_SeenSet):
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._keys: 'collections.OrderedDict[Hashable, None]'
+        self._keys = collections.OrderedDict()
+
+    def add(self, key: Hashable) -> bool:
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return False
+        keys[key] = None
+        if len(keys) > self._maxsize:
+            keys.popitem(last=False)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(x: int) -> int:
+    x &= _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class _RotatingBloomFilter(_SeenSet):
+    """Two generations of Bloom filters sized for ``capacity`` keys each.
+
+    New keys go to current generation; once it holds ``capacity`` keys
+    it replaces previous generation and a new empty one is started.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError("Expected error_rate in (0, 1)", error_rate)
+        self._capacity = capacity
+        nbits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self._nbits = max(8, int(math.ceil(nbits)))
+        self._nhashes = max(1, int(round(self._nbits / capacity
+                                         * math.log(2))))
+        self._current = bytearray((self._nbits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+
+    def _positions(self, key: Any) -> range:
+        # double hashing: i-th position is h1 + i * h2, where h1 and h2
+        # are two independent outputs of splitmix64 seeded with hash(key)
+        # (hashes of tuples are correlated before Python 3.8)
+        h = hash(key) & _MASK64
+        h1 = _splitmix64(h + _GAMMA) % self._nbits
+        h2 = _splitmix64(h + 2 * _GAMMA) % self._nbits or 1
+        return range(h1, h1 + h2 * self._nhashes, h2)
+
+    def add(self, key: Hashable) -> bool:
+        nbits = self._nbits
+        current = self._current
+        previous = self._previous
+        in_current = in_previous = True
+        positions = [pos % nbits for pos in self._positions(key)]
+        for pos in positions:
+            mask = 1 << (pos & 7)
+            if not current[pos >> 3] & mask:
+                in_current = False
+            if not previous[pos >> 3] & mask:
+                in_previous = False
+        if in_current:
+            return False
+        for pos in positions:
+            current[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+        if self._count >= self._capacity:
+            self._previous = current
+            self._current = bytearray(len(current))
+            self._count = 0
+        return not in_previous
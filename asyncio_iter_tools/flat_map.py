@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+
+from typing import (
+    cast,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from .queue import ClosableQueue
+from .prefetch import _prefetch_chain
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+FlatMapCallback = Callable[
+    [T], Union[AsyncIterable[U], Awaitable[AsyncIterable[U]]]]
+
+
+def flat_map(func: FlatMapCallback,
+             stream: AsyncIterable[T], *,
+             concurrency: int = 1,
+             ordered: bool = True,
+             buffer_size: int = 1) -> AsyncIterator[U]:
+    """Map each item of stream to an async iterable and flatten results.
+
+    Up to ``concurrency`` inner streams are read at once.
+    If ``ordered`` is true, inner streams are concatenated in order of
+    stream items (up to ``buffer_size`` items of each next one are read
+    ahead in background, then its reading pauses until it becomes
+    current), otherwise their items are yielded as soon as they arrive.
+
+    func may be either simple callable or coroutine.
+
+    >>> async def generate(seq, timeout):
+    ...     for obj in seq:
+    ...         yield await asyncio.sleep(timeout, obj)
+    >>> stream = flat_map(lambda s: generate(s, 0.1),
+    ...                   generate(['ab', 'cd'], 0), concurrency=2)
+    >>> res = [obj async for obj in stream]
+    >>> assert res == ['a', 'b', 'c', 'd']
+    """
+    if not callable(func):
+        raise ValueError("Expected callable object", func)
+    if concurrency <= 0:
+        raise ValueError("Expected positive concurrency", concurrency)
+    if buffer_size <= 0:
+        raise ValueError("Expected positive buffer_size", buffer_size)
+    streams: AsyncIterator[AsyncIterable[U]] = _map_streams(func, stream)
+    if ordered:
+        if concurrency == 1:
+            return _concat(streams)
+        return _prefetch_chain(streams, concurrency - 1, buffer_size)
+    return _merge(streams, concurrency)
+
+
+async def _map_streams(func: FlatMapCallback,
+                       stream: AsyncIterable[T]
+                       ) -> AsyncIterator[AsyncIterable[U]]:
+    if inspect.iscoroutinefunction(func):
+        afunc = cast(Callable[[T], Awaitable[AsyncIterable[U]]], func)
+        async for obj in stream:
+            yield await afunc(obj)
+    else:
+        sfunc = cast(Callable[[T], AsyncIterable[U]], func)
+        async for obj in stream:
+            yield sfunc(obj)
+
+
+async def _concat(streams: AsyncIterable[AsyncIterable[U]]
+                  ) -> AsyncIterator[U]:
+    async for stream in streams:
+        async for obj in stream:
+            yield obj
+
+
+async def _merge(streams: AsyncIterable[AsyncIterable[U]],
+                 concurrency: int) -> AsyncIterator[U]:
+    loop = get_running_loop()
+    queue: ClosableQueue[U] = ClosableQueue(maxsize=concurrency)
+    slots = asyncio.Semaphore(concurrency)
+    readers: Set[asyncio.Task] = set()
+    errors: List[BaseException] = []
+    feeder: Optional[asyncio.Task] = None
+
+    async def read(stream: AsyncIterable[U]) -> None:
+        try:
+            async for obj in stream:
+                if not await queue.put(obj):
+                    break
+        finally:
+            slots.release()
+
+    async def feed() -> None:
+        async for stream in streams:
+            await slots.acquire()
+            if queue.closed:
+                break
+            task = loop.create_task(read(stream))
+            task.add_done_callback(on_done)
+            readers.add(task)
+
+    def on_done(task: asyncio.Task) -> None:
+        readers.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            errors.append(cast(BaseException, task.exception()))
+            queue.close()
+        elif not readers and feeder is not None and feeder.done():
+            queue.close()
+
+    feeder = loop.create_task(feed())
+    feeder.add_done_callback(on_done)
+    try:
+        while True:
+            obj = await queue.get()
+            if obj is queue.EndOfStream:
+                break
+            yield cast(U, obj)
+        if errors:
+            raise errors[0]
+    finally:
+        queue.close()
+        feeder.cancel()
+        for task in list(readers):
+            task.cancel()
@@ -0,0 +1,186 @@
+import mmap as _mmap
+import os
+import re
+import struct
+
+from typing import (
+    cast,
+    AsyncIterable,
+    AsyncIterator,
+    Optional,
+    Union,
+)
+
+from ._compat import get_running_loop
+
+
+__all__ = [
+    'frame',
+    'split_lines',
+    'read_file',
+]
+
+BytesLike = Union[bytes, bytearray, memoryview]
+Record = Union[bytes, memoryview]
+
+
+def frame(stream: AsyncIterable[BytesLike], *,
+          delimiter: Optional[bytes] = None,
+          length_prefix: Union[str, struct.Struct, None] = None,
+          copy: bool = False) -> AsyncIterator[Record]:
+    """Split stream of bytes chunks into records.
+
+    Records are either separated by ``delimiter`` (which is not included
+    into records; trailing data without delimiter is yielded as the last
+    record) or prefixed with their length packed in ``length_prefix``
+    struct format (for instance ``'>I'``).
+
+    Records are yielded as ``memoryview`` objects: records lying within
+    a single chunk are slices of that chunk (no copying), records spanning
+    several chunks are assembled in a reusable buffer and copied out of it.
+    If ``copy`` is true records are yielded as ``bytes``.
+
+    >>> async def generate(seq):
+    ...     for obj in seq:
+    ...         yield obj
+    >>> stream = frame(generate([b'ab\\ncd', b'e\\n']), delimiter=b'\\n')
+    >>> res = [bytes(obj) async for obj in stream]
+    >>> assert res == [b'ab', b'cde']
+    """
+    if (delimiter is None) == (length_prefix is None):
+        raise ValueError("Expected either delimiter or length_prefix")
+    if delimiter is not None:
+        if not delimiter:
+            raise ValueError("Expected non-empty delimiter")
+        return _split(stream, delimiter, copy)
+    if not isinstance(length_prefix, struct.Struct):
+        length_prefix = struct.Struct(cast(str, length_prefix))
+    return _unpack(stream, length_prefix, copy)
+
+
+def split_lines(stream: AsyncIterable[BytesLike], *,
+                copy: bool = False) -> AsyncIterator[Record]:
+    """Split stream of bytes chunks into lines (without ``b'\\n'``).
+
+    See ``frame()`` for details.
+    """
+    return frame(stream, delimiter=b'\n', copy=copy)
+
+
+async def read_file(path: Union[str, 'os.PathLike[str]'],
+                    chunk_size: int = 64 * 1024, *,
+                    mmap: bool = True) -> AsyncIterator[memoryview]:
+    """Read file in chunks of ``chunk_size`` bytes.
+
+    If ``mmap`` is true file is memory-mapped and chunks are ``memoryview``
+    slices of the mapping (no copying; pages are read by the OS on access);
+    otherwise file is read in default executor.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Expected positive chunk_size", chunk_size)
+    with open(path, 'rb') as f:
+        if not mmap:
+            loop = get_running_loop()
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, chunk_size)
+                if not chunk:
+                    break
+                yield memoryview(chunk)
+            return
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # empty file can not be mapped
+            return
+        mm = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+        try:
+            with memoryview(mm) as view:
+                for offset in range(0, size, chunk_size):
+                    yield view[offset:offset + chunk_size]
+        finally:
+            try:
+                mm.close()
+            except BufferError:
+                # chunks are still referenced by consumer;
+                # mapping is closed once they are released.
+                pass
+
+
+async def _split(stream: AsyncIterable[BytesLike],
+                 delimiter: bytes, copy: bool) -> AsyncIterator[Record]:
+    pattern = re.compile(re.escape(delimiter))
+    tail = len(delimiter) - 1
+    buf = bytearray()
+    async for chunk in stream:
+        view = memoryview(chunk)
+        pos = 0
+        if buf and tail:
+            # delimiter may span chunks boundary
+            keep = min(tail, len(buf))
+            head = bytes(buf[-keep:]) + bytes(view[:tail])
+            idx = head.find(delimiter)
+            if -1 < idx < keep:
+                yield _copy(buf[:len(buf) - keep + idx], copy)
+                buf.clear()
+                pos = idx + len(delimiter) - keep
+        while True:
+            match = pattern.search(view, pos)
+            if match is None:
+                break
+            start = match.start()
+            if buf:
+                buf += view[pos:start]
+                yield _copy(buf, copy)
+                buf.clear()
+            elif copy:
+                yield bytes(view[pos:start])
+            else:
+                yield view[pos:start]
+            pos = match.end()
+        if pos < len(view):
+            buf += view[pos:]
+    if buf:
+        yield _copy(buf, copy)
+
+
+async def _unpack(stream: AsyncIterable[BytesLike],
+                  prefix: struct.Struct, copy: bool) -> AsyncIterator[Record]:
+    hsize = prefix.size
+    buf = bytearray()
+    async for chunk in stream:
+        view = memoryview(chunk)
+        pos = 0
+        size = len(view)
+        if buf:
+            # complete a record started in previous chunks
+            if len(buf) < hsize:
+                pos = min(hsize - len(buf), size)
+                buf += view[:pos]
+                if len(buf) < hsize:
+                    continue
+            total = hsize + prefix.unpack_from(buf)[0]
+            end = min(pos + total - len(buf), size)
+            buf += view[pos:end]
+            pos = end
+            if len(buf) < total:
+                continue
+            yield _copy(buf[hsize:], copy)
+            buf.clear()
+        while size - pos >= hsize:
+            end = pos + hsize + prefix.unpack_from(view, pos)[0]
+            if end > size:
+                break
+            if copy:
+                yield bytes(view[pos + hsize:end])
+            else:
+                yield view[pos + hsize:end]
+            pos = end
+        if pos < size:
+            buf += view[pos:]
+    if buf:
+        raise ValueError("Incomplete record at the end of stream", len(buf))
+
+
+def _copy(buf: bytearray, copy: bool) -> Record:
+    if copy:
+        return bytes(buf)
+    return memoryview(bytes(buf))
@@ -0,0 +1,114 @@
+import asyncio
+import re
+
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from .stats import LatencyWindow
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+HedgeDelay = Union[float, str]
+
+_QUANTILE = re.compile(r'^p(\d{1,2}(?:\.\d+)?)$')
+
+
+class Hedger(Generic[T, U]):
+    """Coroutine function wrapper issuing a duplicate (hedged) call
+    when the first one is slow.
+
+    ``hedge_after`` is either delay in seconds or a latency quantile
+    of recent calls like ``'p95'``; quantile-based hedging starts after
+    ``min_samples`` calls have completed.  Latency is that of the first
+    attempt of each call, failed ones included (the first attempt
+    cancelled after a hedged call won counts until cancellation),
+    so hedging does not hide slowness it reacts to.
+    The first successful result wins and the other call is cancelled.
+    Extra calls are limited to ``max_ratio`` of all calls.
+
+    >>> fetch = Hedger(fetch_from_replica, 'p95', max_ratio=0.05)
+    >>> value = await fetch(key)
+    """
+
+    def __init__(self, func: Callable[[T], Awaitable[U]],
+                 hedge_after: HedgeDelay, *,
+                 max_ratio: float = 0.1,
+                 min_samples: int = 20,
+                 window: int = 1000) -> None:
+        if not callable(func):
+            raise ValueError("Expected callable object", func)
+        self._delay: Optional[float] = None
+        self._quantile: Optional[float] = None
+        if isinstance(hedge_after, str):
+            match = _QUANTILE.match(hedge_after)
+            if match is None:
+                raise ValueError("Bad hedge_after quantile", hedge_after)
+            self._quantile = float(match.group(1)) / 100
+        else:
+            if hedge_after < 0:
+                raise ValueError("Expected non-negative hedge_after",
+                                 hedge_after)
+            self._delay = hedge_after
+        self._func = func
+        self._max_ratio = max_ratio
+        self._min_samples = min_samples
+        self.latency = LatencyWindow(window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Current hedge delay (None if calls are not hedged yet)."""
+        if self._quantile is None:
+            return self._delay
+        if len(self.latency) < self._min_samples:
+            return None
+        return self.latency.quantile(self._quantile)
+
+    async def __call__(self, obj: T) -> U:
+        loop = get_running_loop()
+        self.calls += 1
+        start = loop.time()
+        first = asyncio.ensure_future(self._func(obj), loop=loop)
+        first.add_done_callback(
+            lambda _: self.latency.add(loop.time() - start))
+        pending: Set[asyncio.Future] = {first}
+        done: Set[asyncio.Future] = set()
+        try:
+            delay = self.hedge_delay()
+            budget = self._max_ratio * self.calls
+            if delay is not None and self.hedged < budget:
+                done, pending = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    self.hedged += 1
+                    second = asyncio.ensure_future(self._func(obj), loop=loop)
+                    pending.add(second)
+            while True:
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+            # all attempts failed, raise the first error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} calls:{self.calls}'
+                f' hedged:{self.hedged} wins:{self.hedge_wins}>')
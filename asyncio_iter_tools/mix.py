@@ -2,17 +2,20 @@ import asyncio
 import weakref
 from typing import (
     cast,
+    Any,
+    Callable,
     AsyncIterable,
     AsyncIterator,
-    Awaitable,
     TypeVar,
     Union,
     Generic,
+    Optional,
     Sequence,
     Set,
 )
 
 from .queue import ClosableQueue
+from .shedding import ShedPolicy
 from ._compat import get_running_loop
 
 T = TypeVar('T')
@@ -22,9 +25,7 @@ V = TypeVar('V')
 TT = Union[T, U, V]
 
 
-async def mix(streamA: AsyncIterable[T],
-              streamB: AsyncIterable[U],
-              *streamN: AsyncIterable[V]) -> AsyncIterable[Union[T, U, V]]:
+class mix(Generic[T, U, V]):
     """Mix two or more async-iterators into one.
 
     >>> async def generate(seq, timeout):
@@ -36,10 +37,51 @@ async def mix(streamA: AsyncIterable[T],
     ... )
     >>> res = [obj async for obj in stream]
     >>> assert res == [0, 'a', 1, 'b', 2, 'c', 'd']
+
+    With ``shed`` policy (see ``ClosableQueue``) stale items are dropped
+    instead of blocking readers of slow consumer, so streams keep
+    being read; dropped items are passed to ``on_drop`` callback.
+    ``on_wait`` is called with time each item has waited to be read
+    (see ``Tracer.queue()``).
     """
-    obj: Union[T, U, V]
-    async for obj in _MixIter(streamA, streamB, *streamN):
-        yield obj
+
+    __slots__ = ('_mix', '_cleaner')
+
+    def __init__(self,
+                 streamA: AsyncIterable[T],
+                 streamB: AsyncIterable[U],
+                 *streamN: AsyncIterable[V],
+                 shed: Optional[ShedPolicy] = None,
+                 on_drop: Optional[Callable[[TT], Any]] = None,
+                 on_wait: Optional[Callable[[float], Any]] = None) -> None:
+        self._mix = _MixIter(streamA, streamB, *streamN,
+                             shed=shed, on_drop=on_drop, on_wait=on_wait)
+        self._cleaner: Optional[AsyncIterator[TT]] = None
+
+    @property
+    def dropped(self) -> int:
+        """Number of items dropped by ``shed`` policy."""
+        return self._mix._queue.dropped
+
+    def __aiter__(self) -> AsyncIterator[TT]:
+        return self
+
+    async def __anext__(self) -> TT:
+        if self._cleaner is None:
+            # Reader tasks get cancelled once cleaner is garbage collected
+            self._cleaner = self._mix.__aiter__()
+        return await self._mix._next()
+
+    async def aclose(self) -> None:
+        """Cancel stream readers and drop items read so far."""
+        cleaner, self._cleaner = self._cleaner, None
+        if cleaner is not None:
+            cast(_TaskCleaner, cleaner)._finalizer()
+        else:
+            # not started yet
+            self._mix._streams = ()
+        self._mix._queue.close()
+        self._mix._queue.drain_nowait()
 
 
 class _MixIter(Generic[T, U, V]):
@@ -47,13 +89,17 @@ class _MixIter(Generic[T, U, V]):
     def __init__(self,
                  streamA: AsyncIterable[T],
                  streamB: AsyncIterable[U],
-                 *streamN: AsyncIterable[V]) -> None:
+                 *streamN: AsyncIterable[V],
+                 shed: Optional[ShedPolicy] = None,
+                 on_drop: Optional[Callable[[TT], Any]] = None,
+                 on_wait: Optional[Callable[[float], Any]] = None) -> None:
         self._streams = (streamA, streamB) + streamN
         self._tasks: Set[asyncio.Task] = set()
         self._running = 0
         self._done = len(self._streams)
         self._queue: ClosableQueue[TT] = ClosableQueue(
-            maxsize=len(self._streams))
+            maxsize=len(self._streams), shed=shed, on_drop=on_drop,
+            on_wait=on_wait)
 
     def __aiter__(self) -> AsyncIterator[TT]:
         loop = get_running_loop()
@@ -68,7 +114,12 @@ class _MixIter(Generic[T, U, V]):
         return _TaskCleaner(self)
 
     async def _next(self) -> TT:
-        obj = await self._queue.get()
+        # fast path: do not create get() coroutine if item is at hand
+        try:
+            obj = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            # empty (or only stale items were there)
+            obj = await self._queue.get()
         if obj is self._queue.EndOfStream:
             raise StopAsyncIteration
         return obj
@@ -101,10 +152,10 @@ class _MixIter(Generic[T, U, V]):
 class _TaskCleaner(AsyncIterable[Union[T, U, V]]):
     def __init__(self, parent: _MixIter[T, U, V]) -> None:
         self._parent = parent
-        weakref.finalize(self, parent._cleanup)
+        self._finalizer = weakref.finalize(self, parent._cleanup)
 
     def __aiter__(self) -> AsyncIterator[TT]:
         return self
 
-    async def __anext__(self) -> Awaitable[TT]:
+    async def __anext__(self) -> TT:
         return await self._parent._next()
@@ -0,0 +1,112 @@
+import asyncio
+import collections
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Coroutine,
+    Deque,
+    TypeVar,
+)
+
+from .queue import ClosableQueue
+from ._background import BackgroundIter
+
+
+T = TypeVar('T')
+
+
+def prefetch(stream: AsyncIterable[T],
+             buffer_size: int = 1) -> AsyncIterator[T]:
+    """Read stream ahead in a background task.
+
+    Up to ``buffer_size`` items are read from stream while consumer is
+    busy processing previous ones, so upstream and downstream latencies
+    overlap instead of adding up.
+
+    Reader task is cancelled when the returned iterator is closed
+    or garbage collected.
+
+    >>> async def generate(seq, timeout):
+    ...     for obj in seq:
+    ...         yield await asyncio.sleep(timeout, obj)
+    >>> res = [obj async for obj in prefetch(generate('abc', 0.1), 2)]
+    >>> assert res == ['a', 'b', 'c']
+    """
+    if buffer_size <= 0:
+        raise ValueError("Expected positive buffer_size", buffer_size)
+    return _PrefetchIter(stream, buffer_size)
+
+
+class _PrefetchIter(BackgroundIter[T]):
+
+    def __init__(self, stream: AsyncIterable[T], buffer_size: int) -> None:
+        super().__init__(stream)
+        self._queue: ClosableQueue[T] = ClosableQueue(maxsize=buffer_size)
+
+    async def __anext__(self) -> T:
+        if self._task is None:
+            self.start()
+        if self._queue.empty() and not self._queue.closed:
+            obj = await self._queue.get()
+        else:
+            obj = self._queue.get_nowait()
+        if obj is self._queue.EndOfStream:
+            task = self._task
+            if task is not None and task.done() and not task.cancelled():
+                exc = task.exception()
+                if exc is not None:
+                    self._task = None
+                    raise exc
+            raise StopAsyncIteration
+        return cast(T, obj)
+
+    def _reader(self, stream: AsyncIterable[T],
+                loop: asyncio.AbstractEventLoop
+                ) -> Coroutine[Any, Any, None]:
+        return _reader(stream, self._queue)
+
+    def _close(self) -> None:
+        self._queue.close()
+
+
+async def _reader(stream: AsyncIterable[T], queue: ClosableQueue[T]) -> None:
+    try:
+        async for obj in stream:
+            if not await queue.put(obj):
+                break
+    finally:
+        queue.close()
+
+
+async def _prefetch_chain(streams: AsyncIterable[AsyncIterable[T]],
+                          lookahead: int,
+                          buffer_size: int = 1) -> AsyncIterator[T]:
+    """Chain streams keeping up to `lookahead` next streams started
+    with up to `buffer_size` items read ahead from each.
+    """
+    sources = streams.__aiter__()
+    pending: Deque[_PrefetchIter[T]] = collections.deque()
+    exhausted = False
+    try:
+        while True:
+            # current stream plus up to `lookahead` next ones
+            while not exhausted and len(pending) <= lookahead:
+                try:
+                    stream = await sources.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                it = _PrefetchIter(stream, buffer_size)
+                it.start()
+                pending.append(it)
+            if not pending:
+                break
+            async for obj in pending[0]:
+                yield obj
+            pending.popleft()
+    finally:
+        while pending:
+            await pending.popleft().aclose()
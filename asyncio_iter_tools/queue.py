@@ -1,6 +1,8 @@
 import collections
 import asyncio
 import enum
+import threading
+import time
 
 from typing import (
     Generic,
@@ -10,12 +12,17 @@ from typing import (
     List,
     Deque,
     Dict,
+    Iterable,
+    Callable,
     ContextManager,
     Type,
     TypeVar,
 )
 from types import TracebackType
 
+from .adaptive import BufferSizer
+from .shedding import ShedPolicy
+
 
 T = TypeVar('T')
 Key = Any
@@ -49,17 +56,43 @@ class ClosableQueue(Generic[T]):
     >>>
     >>> async for obj in iterate(queue):
     ...     print(obj)
+
+    If ``shed`` policy is given (see ``DeadlinePolicy``, ``CoDelPolicy``)
+    items are stamped on put and stale ones are dropped on get; put into
+    full queue waits no longer than until head item expires and drops it
+    to make room.  Dropped items are passed to ``on_drop`` callback
+    (if any) and counted in ``dropped``.
+
+    If ``on_wait`` callback is given it is called with time (in seconds)
+    each item has spent in queue when it is got (see ``Tracer.queue()``).
+
+    If ``sizer`` is given (see ``BufferSizer``) it sets ``maxsize`` from
+    time put and get wait on full and empty queue.
     """
 
     EndOfStream = EndOfStreamMarker.token
 
     def __init__(self, maxsize: int = 0, *,
-                 loop: OptionalEventLoop = None) -> None:
+                 loop: OptionalEventLoop = None,
+                 shed: Optional[ShedPolicy] = None,
+                 on_drop: Optional[Callable[[T], Any]] = None,
+                 on_wait: Optional[Callable[[float], Any]] = None,
+                 sizer: Optional[BufferSizer] = None) -> None:
         self._queue: Deque[T] = collections.deque()  # XXX:
+        self._sizer = sizer
+        if sizer is not None:
+            maxsize = sizer.size
         self._maxsize = maxsize
         self._closed = False
         self._event_full = asyncio.Event(loop=loop)
         self._event_empty = asyncio.Event(loop=loop)
+        self._shed = shed
+        self._on_drop = on_drop
+        self._on_wait = on_wait
+        # items are stamped on put for shed policy and on_wait callback
+        self._stamped = shed is not None or on_wait is not None
+        self._stamps: Deque[float] = collections.deque()
+        self.dropped = 0
 
     async def put(self, item: T) -> bool:
         """Put an item into queue.
@@ -73,13 +106,36 @@ class ClosableQueue(Generic[T]):
         """
         if self._closed:
             return False
+        # time waits on full queue for sizer
+        started: Optional[float] = None
+        if self._sizer is not None and self.full():
+            started = time.monotonic()
         while self.full() and not self._closed:
-            await self._event_empty.wait()
-            # TODO: check when this event may not get cleared
+            timeout = None
+            if self._shed is not None:
+                timeout = self._head_expires_in()
+                if timeout is not None and timeout <= 0:
+                    # make room for a new item
+                    self._drop()
+                    continue
+            if timeout is None:
+                await self._event_empty.wait()
+                # TODO: check when this event may not get cleared
+                continue
+            try:
+                # wake up when head item expires
+                await asyncio.wait_for(self._event_empty.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if self._sizer is not None and started is not None:
+            self._sizer.on_full(time.monotonic() - started)
+            self.maxsize = self._sizer.size
         if self._closed:
             return False
         self._event_empty.clear()
         self._queue.append(item)
+        if self._stamped:
+            self._stamps.append(time.monotonic())
         self._event_full.set()
         return True
 
@@ -89,18 +145,98 @@ class ClosableQueue(Generic[T]):
         If queue is closed and there is no more items in queue
         the ``ClosableQueue.EndOfStream`` marker is returned.
         """
-        while self.empty() and not self._closed:
-            await self._event_full.wait()
+        started: Optional[float] = None
+        if self._sizer is not None and self.empty() and not self._closed:
+            started = time.monotonic()
+        while True:
+            while self.empty() and not self._closed:
+                await self._event_full.wait()
+            if self._shed is None:
+                break
+            self._shed_head()
+            if self._queue or self._closed:
+                break
+        if self._sizer is not None and started is not None:
+            self._sizer.on_empty(time.monotonic() - started)
+            self.maxsize = self._sizer.size
         assert self._queue or self._closed, (
             "Unexpected queue state", self._queue, self._closed)
-        if not self._queue and self._closed:
-            return self.EndOfStream
+        return self.get_nowait()
+
+    def get_nowait(self) -> Union[T, EndOfStreamMarker]:
+        """Get an item from queue without blocking.
+
+        If queue is closed and there is no more items in queue
+        the ``ClosableQueue.EndOfStream`` marker is returned.
+        Raise ``asyncio.QueueEmpty`` if queue is empty but not closed.
+        """
+        if self._shed is not None:
+            self._shed_head()
+        if not self._queue:
+            if self._closed:
+                return self.EndOfStream
+            raise asyncio.QueueEmpty
         item = self._queue.popleft()
+        if self._stamped:
+            stamp = self._stamps.popleft()
+            if self._on_wait is not None:
+                self._on_wait(time.monotonic() - stamp)
         self._event_empty.set()
         if not self._queue:
             self._event_full.clear()
         return item
 
+    def drain_nowait(self, max_items: int = 0) -> List[T]:
+        """Get all (or up to ``max_items`` if greater than 0) items
+        currently available in queue without blocking.
+
+        Empty list is returned if queue is empty.
+        """
+        if self._shed is not None:
+            self._shed_head()
+        if max_items <= 0 or max_items >= len(self._queue):
+            items = list(self._queue)
+            self._queue.clear()
+            stamps = list(self._stamps)
+            self._stamps.clear()
+        else:
+            items = [self._queue.popleft() for _ in range(max_items)]
+            stamps = []
+            if self._stamped:
+                stamps = [self._stamps.popleft() for _ in range(max_items)]
+        if self._on_wait is not None:
+            now = time.monotonic()
+            for stamp in stamps:
+                self._on_wait(now - stamp)
+        if items:
+            self._event_empty.set()
+        if not self._queue:
+            self._event_full.clear()
+        return items
+
+    def _shed_head(self) -> None:
+        # drop stale items at the head of queue
+        assert self._shed is not None
+        now = time.monotonic()
+        while self._queue and self._shed.drop(now - self._stamps[0], now):
+            self._drop()
+
+    def _head_expires_in(self) -> Optional[float]:
+        assert self._shed is not None
+        if not self._queue:
+            return None
+        return self._shed.expires_in(time.monotonic() - self._stamps[0])
+
+    def _drop(self) -> None:
+        item = self._queue.popleft()
+        self._stamps.popleft()
+        self.dropped += 1
+        self._event_empty.set()
+        if not self._queue:
+            self._event_full.clear()
+        if self._on_drop is not None:
+            self._on_drop(item)
+
     def close(self) -> None:
         """Mark queue as closed."""
         self._closed = True
@@ -126,6 +262,183 @@ class ClosableQueue(Generic[T]):
         """Max size of queue."""
         return self._maxsize
 
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        """Resize queue (e.g. from rate-based controller)."""
+        self._maxsize = value
+        if not self.full():
+            self._event_empty.set()
+
+    def empty(self) -> bool:
+        """True if queue is empty."""
+        return not self._queue
+
+    def full(self) -> bool:
+        """
+        True if ``maxsize`` is greater then 0 and queue size has reached
+        this limit.
+        """
+        if self._maxsize <= 0:
+            return False
+        return self.qsize() >= self._maxsize
+
+    def __repr__(self) -> str:
+        closed = 'closed' if self._closed else 'open'
+        return f'<{type(self).__name__} {closed} size:{len(self._queue)}>'
+
+
+class ThreadBridgeQueue(Generic[T]):
+    """Closable queue fed from worker threads and read on event loop.
+
+    ``put()`` and ``put_many()`` are blocking methods to be called from
+    threads; ``get()`` is a coroutine to be awaited on the event loop.
+    Wakeups of the loop are coalesced: at most one
+    ``loop.call_soon_threadsafe`` call is made until the loop handles it,
+    so a batch put with ``put_many()`` costs a single wakeup.
+
+    Example:
+
+    >>> queue = ThreadBridgeQueue(maxsize=100)
+    >>>
+    >>> def produce(queue):
+    ...     try:
+    ...         for row in cursor:
+    ...             queue.put(row)
+    ...     finally:
+    ...         queue.close()
+    >>> loop.run_in_executor(None, produce, queue)
+    >>>
+    >>> obj = await queue.get()
+    >>> while obj is not queue.EndOfStream:
+    ...     print(obj)
+    ...     obj = await queue.get()
+    """
+
+    EndOfStream = EndOfStreamMarker.token
+
+    def __init__(self, maxsize: int = 0, *,
+                 loop: OptionalEventLoop = None) -> None:
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+        self._queue: Deque[T] = collections.deque()
+        self._maxsize = maxsize
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._wakeup_pending = False
+        self._event_full = asyncio.Event(loop=loop)
+
+    def put(self, item: T, timeout: Optional[float] = None) -> bool:
+        """Put an item into queue (thread-safe, blocking).
+
+        The method will block until some items are popped from queue if it
+        is full.
+
+        Return value indicates whether an item has been put into queue
+        (``True``) or dropped because queue is (or has just been) closed
+        (``False``).
+        """
+        return self.put_many((item,), timeout)
+
+    def put_many(self, items: Iterable[T],
+                 timeout: Optional[float] = None) -> bool:
+        """Put several items into queue (thread-safe, blocking).
+
+        Return ``False`` if queue has been closed before all items
+        were put; raise ``TimeoutError`` if queue stayed full
+        for ``timeout`` seconds.
+        """
+        with self._not_full:
+            for item in items:
+                while self.full() and not self._closed:
+                    if not self._not_full.wait(timeout):
+                        raise TimeoutError
+                if self._closed:
+                    return False
+                self._queue.append(item)
+                if not self._wakeup_pending:
+                    self._wakeup_pending = True
+                    self._loop.call_soon_threadsafe(self._wakeup)
+        return True
+
+    async def get(self) -> Union[T, EndOfStreamMarker]:
+        """Wait and get an item from queue.
+
+        If queue is closed and there is no more items in queue
+        the ``ThreadBridgeQueue.EndOfStream`` marker is returned.
+        """
+        while True:
+            with self._lock:
+                if self._queue or self._closed:
+                    return self._get()
+                self._event_full.clear()
+            await self._event_full.wait()
+
+    def get_nowait(self) -> Union[T, EndOfStreamMarker]:
+        """Get an item from queue without blocking.
+
+        Raise ``asyncio.QueueEmpty`` if queue is empty but not closed.
+        """
+        with self._lock:
+            if not self._queue and not self._closed:
+                raise asyncio.QueueEmpty
+            return self._get()
+
+    def drain_nowait(self, max_items: int = 0) -> List[T]:
+        """Get all (or up to ``max_items`` if greater than 0) items
+        currently available in queue without blocking.
+        """
+        with self._lock:
+            if max_items <= 0 or max_items >= len(self._queue):
+                items = list(self._queue)
+                self._queue.clear()
+            else:
+                items = [self._queue.popleft() for _ in range(max_items)]
+            if items:
+                self._not_full.notify_all()
+            return items
+
+    def _get(self) -> Union[T, EndOfStreamMarker]:
+        if not self._queue:
+            return self.EndOfStream
+        item = self._queue.popleft()
+        self._not_full.notify()
+        return item
+
+    def _wakeup(self) -> None:
+        with self._lock:
+            self._wakeup_pending = False
+        self._event_full.set()
+
+    def close(self) -> None:
+        """Mark queue as closed (thread-safe)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_full.notify_all()
+            if not self._wakeup_pending:
+                self._wakeup_pending = True
+                self._loop.call_soon_threadsafe(self._wakeup)
+
+    @property
+    def closed(self) -> bool:
+        """True if queue is closed."""
+        return self._closed
+
+    @property
+    def exhausted(self) -> bool:
+        """True if queue is empty and closed."""
+        return self.closed and self.empty()
+
+    def qsize(self) -> int:
+        """Queue size."""
+        return len(self._queue)
+
+    @property
+    def maxsize(self) -> int:
+        """Max size of queue."""
+        return self._maxsize
+
     def empty(self) -> bool:
         """True if queue is empty."""
         return not self._queue
@@ -147,14 +460,26 @@ class ClosableQueue(Generic[T]):
 class MultiConsumerQueue(Generic[T]):
     """Multi-consumer closable queue.
 
+    If ``on_wait`` callback is given it is called with time (in seconds)
+    an item has spent in queue every time a consumer gets it.
+
+    If ``sizer`` is given (see ``BufferSizer``) it sets ``buffer_maxsize``
+    from time put and consumers wait on full and empty buffer.
     """
 
     EndOfStream = EndOfStreamMarker.token
 
     def __init__(self, buffer_size: int = 1, *,
-                 loop: OptionalEventLoop = None) -> None:
+                 loop: OptionalEventLoop = None,
+                 on_wait: Optional[Callable[[float], Any]] = None,
+                 sizer: Optional[BufferSizer] = None) -> None:
+        self._sizer = sizer
+        if sizer is not None:
+            buffer_size = sizer.size
         self._maxsize = buffer_size
         self._queue: List[T] = []
+        self._on_wait = on_wait
+        self._stamps: List[float] = []
         self._offsets: Dict[Key, int] = {}
         self._keys = 0
         self._closed = False
@@ -190,32 +515,78 @@ class MultiConsumerQueue(Generic[T]):
         """Put an item into queue."""
         if self._closed:
             return False
+        started: Optional[float] = None
+        if self._sizer is not None and self.full():
+            started = time.monotonic()
         while self.full() and not self._closed:
             await self._event_empty.wait()
             self._event_empty.clear()
+        if self._sizer is not None and started is not None:
+            self._sizer.on_full(time.monotonic() - started)
+            self.buffer_maxsize = self._sizer.size
         if self._closed:
             return False
         self._queue.append(item)
+        if self._on_wait is not None:
+            self._stamps.append(time.monotonic())
         self._event_full.set()
         return True
 
     async def get(self, key: Key) -> Union[T, EndOfStreamMarker]:
         """Wait and get an item from queue."""
+        started: Optional[float] = None
+        if self._sizer is not None and self.empty(key) and not self._closed:
+            started = time.monotonic()
         while self.empty(key) and not self._closed:
             await self._event_full.wait()
             self._event_full.clear()
+        if self._sizer is not None and started is not None:
+            self._sizer.on_empty(time.monotonic() - started)
+            self.buffer_maxsize = self._sizer.size
         # TODO: assert
-        if not self.qsize(key) and self._closed:
-            return self.EndOfStream
+        return self.get_nowait(key)
+
+    def get_nowait(self, key: Key) -> Union[T, EndOfStreamMarker]:
+        """Get an item from queue without blocking.
+
+        Raise ``asyncio.QueueEmpty`` if queue is empty but not closed.
+        """
         idx = self._offsets[key]
+        if idx >= len(self._queue):
+            if self._closed:
+                return self.EndOfStream
+            raise asyncio.QueueEmpty
         item = self._queue[idx]
-        self._offsets[key] += 1
+        if self._on_wait is not None:
+            self._on_wait(time.monotonic() - self._stamps[idx])
+        self._offsets[key] = idx + 1
         self._shift_offsets()
         return item
 
+    def drain_nowait(self, key: Key, max_items: int = 0) -> List[T]:
+        """Get all (or up to ``max_items`` if greater than 0) items
+        currently available to consumer without blocking.
+
+        Empty list is returned if queue is empty.
+        """
+        idx = self._offsets[key]
+        end = len(self._queue)
+        if max_items > 0:
+            end = min(end, idx + max_items)
+        items = self._queue[idx:end]
+        if self._on_wait is not None:
+            now = time.monotonic()
+            for stamp in self._stamps[idx:end]:
+                self._on_wait(now - stamp)
+        if items:
+            self._offsets[key] = end
+            self._shift_offsets()
+        return items
+
     def _shift_offsets(self) -> None:
         consumed = min(self._offsets.values(), default=0)
         del self._queue[:consumed]
+        del self._stamps[:consumed]
         for key in self._offsets:
             self._offsets[key] -= consumed
         self._event_empty.set()
@@ -237,14 +608,19 @@ class MultiConsumerQueue(Generic[T]):
 
     def empty(self, key: Key) -> bool:
         """True if queue is empty."""
-        idx = self._offsets[key]
-        return idx >= self.qsize(key)
+        return self.qsize(key) <= 0
 
     @property
     def buffer_maxsize(self) -> int:
         """Max size of shared buffer."""
         return self._maxsize
 
+    @buffer_maxsize.setter
+    def buffer_maxsize(self, value: int) -> None:
+        """Resize shared buffer (e.g. from rate-based controller)."""
+        self._maxsize = value
+        self._event_empty.set()
+
     def consumer(self) -> '_Consumer':
         return _Consumer(self)
 
@@ -268,6 +644,12 @@ class _Consumer(Generic[T], ContextManager['_Consumer']):
     async def get(self) -> Union[T, EndOfStreamMarker]:
         return await self._queue.get(self._key)
 
+    def get_nowait(self) -> Union[T, EndOfStreamMarker]:
+        return self._queue.get_nowait(self._key)
+
+    def drain_nowait(self, max_items: int = 0) -> List[T]:
+        return self._queue.drain_nowait(self._key, max_items)
+
     def qsize(self) -> int:
         return self._queue.qsize(self._key)
 
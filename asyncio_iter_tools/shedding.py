@@ -0,0 +1,107 @@
+import math
+
+from typing import Optional
+
+
+__all__ = [
+    'ShedPolicy',
+    'DeadlinePolicy',
+    'CoDelPolicy',
+]
+
+
+class ShedPolicy:
+    """Load shedding policy of ``ClosableQueue``.
+
+    Queue stamps items on ``put()`` and asks the policy whether the
+    item at the head of queue must be dropped instead of being returned.
+    """
+
+    def drop(self, sojourn: float, now: float) -> bool:
+        """Return True if head item waiting for ``sojourn`` seconds
+        must be dropped on get.
+        """
+        raise NotImplementedError
+
+    def expires_in(self, sojourn: float) -> Optional[float]:
+        """Return seconds left until head item waiting for ``sojourn``
+        seconds may be dropped to make room for a new one when queue
+        is full (zero or less if it may be dropped now), or None if
+        put into full queue must wait for consumer.
+        """
+        return None
+
+
+class DeadlinePolicy(ShedPolicy):
+    """Drop items which have been waiting in queue for longer than
+    ``deadline`` seconds.
+    """
+
+    def __init__(self, deadline: float) -> None:
+        if deadline <= 0:
+            raise ValueError("Expected positive deadline", deadline)
+        self.deadline = deadline
+
+    def drop(self, sojourn: float, now: float) -> bool:
+        return sojourn > self.deadline
+
+    def expires_in(self, sojourn: float) -> Optional[float]:
+        return self.deadline - sojourn
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} deadline:{self.deadline}>'
+
+
+class CoDelPolicy(ShedPolicy):
+    """Controlled delay (CoDel) dropping.
+
+    Once waiting time of items stays above ``target`` seconds for
+    ``interval`` seconds, items are dropped at increasing rate
+    (``interval / sqrt(drops)`` apart) until waiting time goes below
+    ``target``; short bursts are not affected.
+
+    Dropping state advances on get, so when consumer stalls completely
+    put into full queue drops head item once it has waited for longer
+    than ``target + interval`` (that is delay has been above target
+    for a whole interval).
+    """
+
+    def __init__(self, target: float = 0.005,
+                 interval: float = 0.1) -> None:
+        if target <= 0 or interval <= 0:
+            raise ValueError("Expected positive target and interval",
+                             target, interval)
+        self.target = target
+        self.interval = interval
+        self.dropping = False
+        self._first_above = 0.0
+        self._drop_next = 0.0
+        self._count = 0
+
+    def drop(self, sojourn: float, now: float) -> bool:
+        if sojourn < self.target:
+            self._first_above = 0.0
+            self.dropping = False
+            return False
+        if not self._first_above:
+            self._first_above = now + self.interval
+            return False
+        if not self.dropping:
+            if now < self._first_above:
+                return False
+            self.dropping = True
+            self._count = 1
+        elif now < self._drop_next:
+            return False
+        else:
+            self._count += 1
+        self._drop_next = now + self.interval / math.sqrt(self._count)
+        return True
+
+    def expires_in(self, sojourn: float) -> Optional[float]:
+        return self.target + self.interval - sojourn
+
+    def __repr__(self) -> str:
+        state = 'dropping' if self.dropping else 'idle'
+        return (f'<{type(self).__name__} target:{self.target}'
+                f' interval:{self.interval} {state}>')
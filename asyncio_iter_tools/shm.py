@@ -0,0 +1,274 @@
+import asyncio
+import struct
+
+from typing import (
+    cast,
+    AsyncIterator,
+    Optional,
+    Union,
+)
+
+from ._compat import resource_tracker, shared_memory
+
+
+__all__ = [
+    'SharedMemoryBroadcast',
+]
+
+_U64 = struct.Struct('<Q')
+_DETACHED = 2 ** 64 - 1
+
+# Header layout (all fields are little-endian uint64):
+#   capacity, slot_size, consumers, write cursor, closed flag,
+#   followed by read cursor of each consumer.
+_CAPACITY = 0
+_SLOT_SIZE = 8
+_CONSUMERS = 16
+_WRITE = 24
+_CLOSED = 32
+_READ = 40
+
+
+class SharedMemoryBroadcast:
+    """Single-producer, multi-consumer broadcast ring buffer living in
+    shared memory.
+
+    Producer puts ``bytes``-like items once and every one of ``consumers``
+    readers (possibly in other processes) iterates all of them.
+    Each consumer has its own read cursor; producer waits while the slowest
+    attached consumer is ``capacity`` items behind.
+
+    Items are read zero-copy: consumer yields ``memoryview`` of a ring slot
+    which stays valid until the next item is requested from the consumer
+    (pass ``copy=True`` to get ``bytes`` instead).
+
+    Waiting on either side is done by polling shared cursors
+    every ``poll_interval`` seconds.
+
+    Example:
+
+    >>> # producer process
+    >>> queue = SharedMemoryBroadcast(consumers=2, capacity=64)
+    >>> start_workers(queue.name)
+    >>> async for chunk in stream:
+    ...     await queue.put(chunk)
+    >>> queue.close()
+    >>>
+    >>> # worker process
+    >>> queue = SharedMemoryBroadcast.attach(name)
+    >>> async for chunk in queue.consumer(worker_index):
+    ...     process(chunk)
+    """
+
+    def __init__(self, *, consumers: int,
+                 capacity: int = 64,
+                 slot_size: int = 4096,
+                 name: Optional[str] = None,
+                 poll_interval: float = 0.001) -> None:
+        if shared_memory is None:
+            raise RuntimeError(
+                "multiprocessing.shared_memory requires Python 3.8+")
+        if consumers <= 0 or capacity <= 0 or slot_size <= 0:
+            raise ValueError("Expected positive consumers, capacity"
+                             " and slot_size", consumers, capacity, slot_size)
+        header = _READ + _U64.size * consumers
+        size = header + capacity * (_U64.size + slot_size)
+        self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self._owner = True
+        self._poll_interval = poll_interval
+        buf = cast(memoryview, self._shm.buf)
+        _U64.pack_into(buf, _CAPACITY, capacity)
+        _U64.pack_into(buf, _SLOT_SIZE, slot_size)
+        _U64.pack_into(buf, _CONSUMERS, consumers)
+        self._setup()
+
+    @classmethod
+    def attach(cls, name: str, *,
+               poll_interval: float = 0.001) -> 'SharedMemoryBroadcast':
+        """Attach to broadcast queue created by another process."""
+        if shared_memory is None:
+            raise RuntimeError(
+                "multiprocessing.shared_memory requires Python 3.8+")
+        self = cls.__new__(cls)
+        try:
+            # do not let resource tracker of this process unlink it
+            self._shm = shared_memory.SharedMemory(
+                name, track=False)  # type: ignore
+        except TypeError:   # Python < 3.13
+            self._shm = shared_memory.SharedMemory(name)
+            # attaching registers segment with resource tracker, which
+            # would unlink it when this process exits (bpo-39959)
+            resource_tracker.unregister(
+                self._shm._name, 'shared_memory')  # type: ignore
+        self._owner = False
+        self._poll_interval = poll_interval
+        self._setup()
+        return self
+
+    def _setup(self) -> None:
+        self._buf = buf = cast(memoryview, self._shm.buf)
+        self._capacity = _U64.unpack_from(buf, _CAPACITY)[0]
+        self._slot_size = _U64.unpack_from(buf, _SLOT_SIZE)[0]
+        self._consumers = _U64.unpack_from(buf, _CONSUMERS)[0]
+        self._data = _READ + _U64.size * self._consumers
+
+    @property
+    def name(self) -> str:
+        """Name of shared memory block to attach to."""
+        return self._shm.name
+
+    @property
+    def consumers(self) -> int:
+        """Number of consumers."""
+        return self._consumers
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots in ring buffer."""
+        return self._capacity
+
+    @property
+    def slot_size(self) -> int:
+        """Max size of an item."""
+        return self._slot_size
+
+    @property
+    def closed(self) -> bool:
+        """True if queue is closed."""
+        return bool(_U64.unpack_from(self._buf, _CLOSED)[0])
+
+    def close(self) -> None:
+        """Mark queue as closed (end of stream)."""
+        _U64.pack_into(self._buf, _CLOSED, 1)
+
+    def release(self) -> None:
+        """Release shared memory mapping in this process.
+
+        Owner also destroys the shared memory block.
+        All yielded memoryviews must be released before this call.
+        """
+        del self._buf
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def qsize(self) -> int:
+        """Number of items not yet read by the slowest consumer."""
+        low = self._low_watermark()
+        if low is None:
+            return 0
+        return self._write_cursor() - low
+
+    def full(self) -> bool:
+        """True if producer has to wait for the slowest consumer."""
+        return self.qsize() >= self._capacity
+
+    async def put(self, data: Union[bytes, bytearray, memoryview]) -> bool:
+        """Put an item into queue.
+
+        The method will wait until the slowest consumer reads enough items
+        if queue is full.
+
+        Return value indicates whether an item has been put into queue
+        (``True``) or dropped because queue is closed (``False``).
+        """
+        size = len(data)
+        if size > self._slot_size:
+            raise ValueError("Item is larger than slot_size",
+                             size, self._slot_size)
+        while self.full() and not self.closed:
+            await asyncio.sleep(self._poll_interval)
+        if self.closed:
+            return False
+        buf = self._buf
+        write = self._write_cursor()
+        offset = self._slot(write)
+        _U64.pack_into(buf, offset, size)
+        offset += _U64.size
+        buf[offset:offset + size] = data
+        # publish item only after it has been written
+        _U64.pack_into(buf, _WRITE, write + 1)
+        return True
+
+    def consumer(self, index: int, *,
+                 copy: bool = False
+                 ) -> AsyncIterator[Union[bytes, memoryview]]:
+        """Return async iterator reading items for consumer ``index``."""
+        if not 0 <= index < self._consumers:
+            raise ValueError("Bad consumer index", index, self._consumers)
+        return _BroadcastConsumer(self, index, copy)
+
+    def _write_cursor(self) -> int:
+        return _U64.unpack_from(self._buf, _WRITE)[0]
+
+    def _read_cursor(self, index: int) -> int:
+        return _U64.unpack_from(self._buf, _READ + _U64.size * index)[0]
+
+    def _set_read_cursor(self, index: int, value: int) -> None:
+        _U64.pack_into(self._buf, _READ + _U64.size * index, value)
+
+    def _low_watermark(self) -> Optional[int]:
+        cursors = [self._read_cursor(idx) for idx in range(self._consumers)]
+        return min((c for c in cursors if c != _DETACHED), default=None)
+
+    def _slot(self, cursor: int) -> int:
+        return self._data + (cursor % self._capacity) * (
+            _U64.size + self._slot_size)
+
+    def __repr__(self) -> str:
+        closed = 'closed' if self.closed else 'open'
+        return (f'<{type(self).__name__} {self.name} {closed}'
+                f' size:{self.qsize()}>')
+
+
+class _BroadcastConsumer:
+
+    def __init__(self, queue: SharedMemoryBroadcast,
+                 index: int, copy: bool) -> None:
+        self._queue = queue
+        self._index = index
+        self._copy = copy
+        self._cursor = queue._read_cursor(index)
+        self._pending = False
+
+    def __aiter__(self) -> '_BroadcastConsumer':
+        return self
+
+    async def __anext__(self) -> Union[bytes, memoryview]:
+        queue = self._queue
+        if self._cursor == _DETACHED:
+            raise StopAsyncIteration
+        if self._pending:
+            # previous item is not referenced by us anymore,
+            # let producer reuse its slot.
+            self._pending = False
+            self._cursor += 1
+            queue._set_read_cursor(self._index, self._cursor)
+        while self._cursor >= queue._write_cursor():
+            if queue.closed:
+                # re-check: item might have been put right before closing
+                if self._cursor >= queue._write_cursor():
+                    self.detach()
+                    raise StopAsyncIteration
+                break
+            await asyncio.sleep(queue._poll_interval)
+        offset = queue._slot(self._cursor)
+        buf = queue._buf
+        size = _U64.unpack_from(buf, offset)[0]
+        offset += _U64.size
+        if self._copy:
+            data = bytes(buf[offset:offset + size])
+            self._cursor += 1
+            queue._set_read_cursor(self._index, self._cursor)
+            return data
+        self._pending = True
+        return buf[offset:offset + size]
+
+    def detach(self) -> None:
+        """Stop consuming; producer will not wait for this consumer."""
+        self._cursor = _DETACHED
+        self._pending = False
+        self._queue._set_read_cursor(self._index, _DETACHED)
+
+    async def aclose(self) -> None:
+        self.detach()
@@ -4,6 +4,8 @@ import logging
 
 from typing import (
     cast,
+    Any,
+    Callable,
     AsyncIterable,
     AsyncIterator,
     Generic,
@@ -12,6 +14,7 @@ from typing import (
     TypeVar,
 )
 
+from .adaptive import BufferSizer
 from .queue import MultiConsumerQueue, Key
 from ._compat import get_running_loop
 
@@ -24,10 +27,17 @@ log = logging.getLogger(__name__)
 
 
 def split(stream: AsyncIterable[T], *,
-          buffer_size: int = 1
+          buffer_size: int = 1,
+          on_wait: Optional[Callable[[float], Any]] = None,
+          sizer: Optional[BufferSizer] = None
           ) -> Tuple[AsyncIterable[T], AsyncIterable[T]]:
     """Split a stream into two streams both reading same values.
 
+    ``on_wait`` is called with time each item has waited in shared buffer
+    for every consumer reading it (see ``Tracer.queue()``).
+    ``sizer`` adapts shared buffer size instead of fixed ``buffer_size``
+    (see ``BufferSizer``).
+
     >>> async def generate(seq, timeout):
     ...     for obj in seq:
     ...         yield await asyncio.sleep(timeout, obj)
@@ -43,15 +53,19 @@ def split(stream: AsyncIterable[T], *,
     >>> assert res == (['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd'])
     """
 
-    split = _StreamSplitter(stream, buffer_size=buffer_size)
+    split = _StreamSplitter(stream, buffer_size=buffer_size, on_wait=on_wait,
+                            sizer=sizer)
     return split, split
 
 
 class _StreamSplitter(Generic[T]):
 
-    def __init__(self, stream: AsyncIterable[T], buffer_size: int = 1) -> None:
+    def __init__(self, stream: AsyncIterable[T], buffer_size: int = 1,
+                 on_wait: Optional[Callable[[float], Any]] = None,
+                 sizer: Optional[BufferSizer] = None) -> None:
         self._stream = stream
-        self._queue: MultiConsumerQueue[T] = MultiConsumerQueue(buffer_size)
+        self._queue: MultiConsumerQueue[T] = MultiConsumerQueue(
+            buffer_size, on_wait=on_wait, sizer=sizer)
         self._done = False
         self._running = 0
         self._task: Optional[asyncio.Task] = None
@@ -66,7 +80,11 @@ class _StreamSplitter(Generic[T]):
         return _TaskCleaner(self, key)
 
     async def _next(self, key: Key) -> T:
-        obj = await self._queue.get(key)
+        # fast path: do not create get() coroutine if item is at hand
+        if self._queue.empty(key) and not self._queue.closed:
+            obj = await self._queue.get(key)
+        else:
+            obj = self._queue.get_nowait(key)
         if obj is self._queue.EndOfStream:
             raise StopAsyncIteration
         return cast(T, obj)
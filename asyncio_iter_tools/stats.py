@@ -0,0 +1,55 @@
+import bisect
+import collections
+
+from typing import (
+    Deque,
+    List,
+    Optional,
+)
+
+
+__all__ = [
+    'LatencyWindow',
+]
+
+
+class LatencyWindow:
+    """Sliding window of last ``size`` latency samples
+    answering quantile queries.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        if size <= 0:
+            raise ValueError("Expected positive size", size)
+        self._size = size
+        self._samples: Deque[float] = collections.deque()
+        self._sorted: List[float] = []
+
+    def add(self, value: float) -> None:
+        """Add a sample evicting the oldest one if window is full."""
+        if len(self._samples) >= self._size:
+            old = self._samples.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+        self._samples.append(value)
+        bisect.insort(self._sorted, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return q-quantile (0 <= q <= 1) of samples in window
+        or None if window is empty.
+        """
+        if not self._sorted:
+            return None
+        idx = min(int(q * len(self._sorted)), len(self._sorted) - 1)
+        return self._sorted[idx]
+
+    def mean(self) -> Optional[float]:
+        """Return mean of samples in window or None if window is empty."""
+        if not self._samples:
+            return None
+        return sum(self._samples) / len(self._samples)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} size:{len(self._samples)}>'
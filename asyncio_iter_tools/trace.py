@@ -0,0 +1,190 @@
+import inspect
+import time
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .stats import LatencyWindow
+from ._tags import TagTable
+
+
+__all__ = [
+    'Tracer',
+]
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+MapCallback = Callable[[T], Union[U, Awaitable[U]]]
+FilterCallback = Callable[[T], Union[bool, Awaitable[bool]]]
+
+
+# (entered, last stage left) times of a sampled item
+_Stamp = Tuple[float, float]
+
+
+class Tracer:
+    """Opt-in per-item latency tracing.
+
+    Every ``1 / sample_rate``-th item entering pipeline through ``enter()``
+    is stamped; callbacks wrapped with ``map()`` and ``filter()`` record
+    into histograms:
+
+    * ``'<stage>'`` -- time spent in stage callback;
+    * ``'<stage>.wait'`` -- time since previous ``map()`` stage (or entry),
+      which includes waiting in queues of ``mix``/``split``/``prefetch``
+      and time spent in stages in between;
+    * ``'total'`` -- end-to-end time measured by ``exit()``;
+    * queue histograms created with ``queue()``.
+
+    Stamps are kept aside by identity of items, so items (and results of
+    any stage) are never changed by tracing; stages not wrapped by the
+    tracer are just not measured.  Results of wrapped ``map()``
+    callbacks carry stamps of their inputs; items which are the same
+    object (small ints, interned strings) share stamps, so use tracing
+    on pipelines of distinct objects.  Each sampled item is recorded
+    by the first ``exit()`` it reaches (for instance one ``split``
+    consumer).
+
+    >>> tracer = Tracer(sample_rate=0.01)
+    >>> it = Iterator(tracer.enter(source)).mix(
+    ...     other, on_wait=tracer.queue('mix.queue'))
+    >>> it.map(tracer.map('parse', parse)).filter(tracer.filter('ok', ok))
+    >>> async for obj in tracer.exit(it):
+    ...     ...
+    >>> tracer.summary()['parse.wait']['p99']
+    """
+
+    def __init__(self, sample_rate: float = 0.01, *,
+                 window: int = 1000,
+                 max_tracked: int = 10000) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("Expected sample_rate in (0, 1]", sample_rate)
+        self._every = max(1, round(1 / sample_rate))
+        self._count = 0
+        self._window = window
+        self._stamps: TagTable[_Stamp] = TagTable(max_tracked)
+        self.histograms: Dict[str, LatencyWindow] = {}
+
+    def histogram(self, name: str) -> LatencyWindow:
+        """Return (creating if needed) histogram by name."""
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyWindow(self._window)
+        return hist
+
+    async def enter(self, stream: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Yield items of stream stamping sampled ones."""
+        every = self._every
+        stamps = self._stamps
+        async for obj in stream:
+            self._count += 1
+            if self._count >= every:
+                self._count = 0
+                now = time.perf_counter()
+                stamps.add(obj, (now, now))
+            yield obj
+
+    async def exit(self, stream: AsyncIterable[T],
+                   name: str = 'total') -> AsyncIterator[T]:
+        """Yield items of stream recording end-to-end latency
+        of sampled ones.
+        """
+        hist = self.histogram(name)
+        stamps = self._stamps
+        async for obj in stream:
+            stamp = stamps.pop(obj)
+            if stamp is not None:
+                hist.add(time.perf_counter() - stamp[0])
+            yield obj
+
+    def map(self, name: str, func: MapCallback) -> MapCallback:
+        """Wrap ``map`` stage callback."""
+        return self._wrap(name, func, True)
+
+    def filter(self, name: str, func: FilterCallback) -> FilterCallback:
+        """Wrap ``filter`` stage callback."""
+        return self._wrap(name, func, False)
+
+    def queue(self, name: str) -> Callable[[float], None]:
+        """Return ``on_wait`` callback of ``ClosableQueue``,
+        ``MultiConsumerQueue``, ``mix`` or ``split`` recording every
+        ``1 / sample_rate``-th item wait time into histogram ``name``.
+        """
+        hist = self.histogram(name)
+        every = self._every
+        count = 0
+
+        def on_wait(wait: float) -> None:
+            nonlocal count
+            count += 1
+            if count >= every:
+                count = 0
+                hist.add(wait)
+        return on_wait
+
+    def _wrap(self, name: str, func: Callable, replace: bool) -> Callable:
+        if not callable(func):
+            raise ValueError("Expected callable object", func)
+        hist = self.histogram(name)
+        wait = self.histogram(name + '.wait')
+        clock = time.perf_counter
+        stamps = self._stamps
+
+        def leave(stamp: _Stamp, start: float, res: Any) -> Any:
+            now = clock()
+            hist.add(now - start)
+            if replace:
+                # result carries stamp of its input; input stamp is left
+                # intact as the item may be shared by split consumers
+                stamps.add(res, (stamp[0], now))
+            return res
+
+        if inspect.iscoroutinefunction(func):
+            async def traced_coro(obj: Any) -> Any:
+                stamp = stamps.get(obj)
+                if stamp is None:
+                    return await func(obj)
+                start = clock()
+                wait.add(start - stamp[1])
+                return leave(stamp, start, await func(obj))
+            return traced_coro
+
+        def traced(obj: Any) -> Any:
+            stamp = stamps.get(obj)
+            if stamp is None:
+                return func(obj)
+            start = clock()
+            wait.add(start - stamp[1])
+            return leave(stamp, start, func(obj))
+        return traced
+
+    def summary(self, quantiles: Sequence[float] = (0.5, 0.9, 0.99)
+                ) -> Dict[str, Dict[str, float]]:
+        """Return mean and quantiles (as ``'p50'`` etc.) of non-empty
+        histograms.
+        """
+        res = {}
+        for name, hist in self.histograms.items():
+            if not len(hist):
+                continue
+            stats = {'mean': cast(float, hist.mean())}
+            for q in quantiles:
+                stats[f'p{q * 100:g}'] = cast(float, hist.quantile(q))
+            res[name] = stats
+        return res
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} every:{self._every}'
+                f' stages:{len(self.histograms)}>')
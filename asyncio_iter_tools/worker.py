@@ -0,0 +1,735 @@
+import abc
+import asyncio
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+
+from multiprocessing.connection import Client, Connection, Listener
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .queue import ClosableQueue
+from ._compat import all_tasks, get_running_loop
+
+
+__all__ = [
+    'WorkerLoop',
+    'WorkerProcess',
+    'offload',
+    'pipeline',
+]
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+Stage = Callable[[AsyncIterator[T]], AsyncIterable[U]]
+
+
+class WorkerLoop:
+    """Event loop running in a dedicated thread.
+
+    Stages placed on worker loop with ``offload()`` run concurrently
+    with the main loop; several stages may share one worker.
+
+    Worker is a thread, so Python code of stages still holds the GIL:
+    offloading helps to keep the main loop responsive and overlaps
+    I/O or code releasing the GIL (C extensions, compression, hashing);
+    use ``WorkerProcess`` to run CPU-bound Python stages on other cores.
+
+    >>> with WorkerLoop() as worker:
+    ...     stream = offload(stream, lambda s: map(parse, s), worker=worker)
+    ...     async for obj in stream:
+    ...         ...
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Worker event loop."""
+        if self._loop is None:
+            raise RuntimeError("Worker loop is not running")
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        """True if worker thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start worker thread (if not yet started)."""
+        if self._thread is not None:
+            return
+        loop = self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=_run_loop, args=(loop,), name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel tasks left on worker loop and stop worker thread."""
+        loop, thread = self._loop, self._thread
+        if loop is None or thread is None:
+            return
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._loop = self._thread = None
+
+    def submit(self, coro: Awaitable[T]) -> 'concurrent.futures.Future[T]':
+        """Run coroutine on worker loop (thread-safe)."""
+        return asyncio.run_coroutine_threadsafe(
+            cast(Any, coro), self.loop)
+
+    def __enter__(self) -> 'WorkerLoop':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    async def _offload(self, stream: AsyncIterable[T], stage: Stage[T, U],
+                       batch: int, buffer: int) -> AsyncIterator[U]:
+        _check_args(batch, buffer)
+        loop = get_running_loop()
+        wloop = self.loop
+        inbox: ClosableQueue[List[T]] = ClosableQueue(buffer, loop=wloop)
+        outbox: ClosableQueue[List[U]] = ClosableQueue(buffer, loop=loop)
+        feeder = loop.create_task(
+            _pump(stream, _QueueSender(inbox, wloop, batch)))
+        future = self.submit(_run_stage(stage, inbox, outbox, loop, batch))
+        try:
+            async for obj in _receive(outbox):
+                yield obj
+            # re-raise stage and stream errors
+            await asyncio.wrap_future(future, loop=loop)
+            await feeder
+        finally:
+            _close_threadsafe(inbox, wloop)
+            outbox.close()
+            future.cancel()
+            feeder.cancel()
+
+    def __repr__(self) -> str:
+        state = 'running' if self.running else 'stopped'
+        return f'<{type(self).__name__} {self._name or ""} {state}>'
+
+
+class WorkerProcess:
+    """Event loop running in a child process.
+
+    Stages placed on worker process with ``offload()`` run in parallel
+    with the main loop and other workers, so CPU-bound Python stages
+    scale across cores.  Stage must be picklable (for instance
+    a module-level function or ``functools.partial`` of one) and is
+    built in worker process; items and results are pickled in batches
+    sent over a local socket.
+
+    Child process is started with ``context`` (``spawn`` by default,
+    see ``multiprocessing.get_context()``); socket channels are watched
+    by the event loop, so process workers require POSIX.
+
+    >>> with WorkerProcess() as worker:
+    ...     stream = offload(stream, parse_stage, worker=worker)
+    ...     async for obj in stream:
+    ...         ...
+    """
+
+    def __init__(self, name: Optional[str] = None, *,
+                 context: Any = None) -> None:
+        self._name = name
+        self._context = context or multiprocessing.get_context('spawn')
+        self._process: Any = None
+        self._control: Optional[Connection] = None
+        self._address: Any = None
+        self._authkey = b''
+
+    @property
+    def running(self) -> bool:
+        """True if worker process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        """Start worker process (if not yet started) and wait until
+        it accepts stages.
+        """
+        if self._process is not None:
+            return
+        self._authkey = os.urandom(32)
+        control, child = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_process_main, args=(child, control, self._authkey),
+            name=self._name, daemon=True)
+        self._process.start()
+        child.close()
+        self._control = control
+        self._address = control.recv()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel stages left on worker process and wait for it to exit
+        (terminating it after ``timeout``).
+        """
+        process, control = self._process, self._control
+        if process is None:
+            return
+        if control is not None:
+            # worker stops once control connection is closed
+            _shutdown(control)
+            control.close()
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._process = self._control = self._address = None
+
+    def __enter__(self) -> 'WorkerProcess':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    async def _offload(self, stream: AsyncIterable[T], stage: Stage[T, U],
+                       batch: int, buffer: int) -> AsyncIterator[U]:
+        _check_args(batch, buffer)
+        if self._address is None:
+            raise RuntimeError("Worker process is not running")
+        loop = get_running_loop()
+        conn = await loop.run_in_executor(
+            None, _connect, self._address, self._authkey)
+        channel: _Channel = _Channel(conn, buffer)
+        feeder: Optional[asyncio.Task] = None
+        try:
+            # fails early if stage can not be pickled
+            await channel.post((stage, batch, buffer))
+            feeder = loop.create_task(
+                _pump(stream, _ChannelSender(channel, batch, False)))
+            async for obj in _receive_channel(channel):
+                yield obj
+            # stage may stop before reading all items; unblock feeder
+            channel.refuse()
+            # re-raise stream errors
+            await feeder
+        finally:
+            if feeder is not None:
+                feeder.cancel()
+            channel.abort()
+
+    def __repr__(self) -> str:
+        state = 'running' if self.running else 'stopped'
+        return f'<{type(self).__name__} {self._name or ""} {state}>'
+
+
+Worker = Union[WorkerLoop, WorkerProcess]
+Placement = Union[Stage[Any, Any], Tuple[Stage[Any, Any], Optional[Worker]]]
+
+
+def offload(stream: AsyncIterable[T], stage: Stage[T, U], *,
+            worker: Worker,
+            batch: int = 64,
+            buffer: int = 2) -> AsyncIterator[U]:
+    """Run ``stage(items)`` on worker loop (``WorkerLoop``) or worker
+    process (``WorkerProcess``) feeding it with items of stream and yield
+    items it produces.
+
+    ``stage`` is called on worker loop with an async iterator of input
+    items and returns async iterable (for instance ``Iterator`` pipeline).
+    Items are passed between loops in batches of up to ``batch`` items
+    through channels holding up to ``buffer`` batches; a partial batch is
+    sent as soon as previous one has been accepted, so idle pipelines
+    do not wait for batches to fill up.
+
+    End of stream and errors are propagated downstream; closing
+    returned iterator cancels the stage and stops reading stream.
+    """
+    return worker._offload(stream, stage, batch, buffer)
+
+
+def pipeline(stream: AsyncIterable[Any], *stages: Placement,
+             batch: int = 64,
+             buffer: int = 2) -> AsyncIterator[Any]:
+    """Run a chain of stages over stream placing them on workers.
+
+    Each stage is either a ``Stage`` run on the current loop or
+    a ``(stage, worker)`` pair; consecutive stages placed on the same
+    worker run there together, so items cross loops (or processes) only
+    where placement changes.  Stages may use ``split()``/``mix()``
+    inside to branch and merge.
+
+    >>> with WorkerProcess() as cpu1, WorkerProcess() as cpu2:
+    ...     it = pipeline(read_records(),
+    ...                   (parse_stage, cpu1), (enrich_stage, cpu2),
+    ...                   store_stage)
+    ...     async for obj in it:
+    ...         ...
+    """
+    groups: List[Tuple[List[Stage[Any, Any]], Optional[Worker]]] = []
+    for placement in stages:
+        if isinstance(placement, tuple):
+            stage, worker = placement
+        else:
+            stage, worker = placement, None
+        if not callable(stage):
+            raise ValueError("Expected callable stage", stage)
+        if groups and groups[-1][1] is worker:
+            groups[-1][0].append(stage)
+        else:
+            groups.append(([stage], worker))
+    res: AsyncIterable[Any] = stream
+    for group, worker in groups:
+        chain = group[0] if len(group) == 1 else _Compose(group)
+        if worker is None:
+            res = _Lazy(chain, res)
+        else:
+            res = offload(res, chain, worker=worker,
+                          batch=batch, buffer=buffer)
+    return res.__aiter__()
+
+
+def _check_args(batch: int, buffer: int) -> None:
+    if batch <= 0:
+        raise ValueError("Expected positive batch", batch)
+    if buffer <= 0:
+        raise ValueError("Expected positive buffer", buffer)
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+        tasks = all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(
+            asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+
+async def _run_stage(stage: Stage[T, U], inbox: ClosableQueue[List[T]],
+                     outbox: ClosableQueue[List[U]],
+                     loop: asyncio.AbstractEventLoop, batch: int) -> None:
+    try:
+        await _pump(_Lazy(stage, _receive(inbox)),
+                    _QueueSender(outbox, loop, batch))
+    finally:
+        # stage may stop before reading all items; unblock feeder
+        inbox.close()
+
+
+class _Lazy(AsyncIterable[U]):
+    """Build stage on first iteration (that is on worker loop)."""
+
+    def __init__(self, stage: Stage[T, U], items: AsyncIterable[T]) -> None:
+        self._stage = stage
+        self._items = items
+
+    def __aiter__(self) -> AsyncIterator[U]:
+        return self._stage(self._items.__aiter__()).__aiter__()
+
+
+class _Compose:
+    """Stages run one after another as a single (picklable) stage."""
+
+    def __init__(self, stages: Sequence[Stage[Any, Any]]) -> None:
+        self._stages = list(stages)
+
+    def __call__(self, items: AsyncIterator[Any]) -> AsyncIterable[Any]:
+        res: AsyncIterable[Any] = items
+        for stage in self._stages:
+            res = _Lazy(stage, res)
+        return res
+
+
+class _Sender(abc.ABC, Generic[T]):
+    """Batching sender of items to another loop.
+
+    At most one batch is in flight; items sent meanwhile are collected
+    into the next batch.
+    """
+
+    def __init__(self, batch: int) -> None:
+        self._batch = batch
+        self._items: List[T] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._error: Optional[BaseException] = None
+        self.closed = False
+
+    async def send(self, obj: T) -> bool:
+        """Send an item; return False if receiving side is closed."""
+        self._items.append(obj)
+        if self._inflight is None:
+            self._flush()
+        while len(self._items) >= self._batch and not self.closed:
+            await asyncio.wait([cast(asyncio.Future, self._inflight)])
+        return self._check()
+
+    async def drain(self) -> bool:
+        """Wait until all items are sent."""
+        while self._inflight is not None:
+            await asyncio.wait([self._inflight])
+        return self._check()
+
+    def cancel(self) -> None:
+        self._items.clear()
+        if self._inflight is not None:
+            self._inflight.cancel()
+
+    @abc.abstractmethod
+    def close(self, exc: Optional[BaseException] = None) -> None:
+        """Signal end of stream (or error) to receiving side."""
+
+    @abc.abstractmethod
+    def _put(self, items: List[T]) -> Awaitable[bool]:
+        """Deliver a batch; result is False if receiving side is closed."""
+
+    def _check(self) -> bool:
+        if self._error is not None:
+            raise self._error
+        return not self.closed
+
+    def _flush(self) -> None:
+        items, self._items = self._items, []
+        self._inflight = asyncio.ensure_future(self._put(items))
+        self._inflight.add_done_callback(self._on_done)
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        self._inflight = None
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                self._error = future.exception()
+            self.closed = True
+            self._items.clear()
+        elif not future.result():
+            self.closed = True
+            self._items.clear()
+        elif self._items:
+            self._flush()
+
+
+class _QueueSender(_Sender[T]):
+    """Sender to a queue owned by loop of another thread."""
+
+    def __init__(self, queue: ClosableQueue[List[T]],
+                 loop: asyncio.AbstractEventLoop, batch: int) -> None:
+        super().__init__(batch)
+        self._queue = queue
+        self._loop = loop
+
+    def close(self, exc: Optional[BaseException] = None) -> None:
+        # errors are re-raised from task and future of offload()
+        _close_threadsafe(self._queue, self._loop)
+
+    def _put(self, items: List[T]) -> Awaitable[bool]:
+        future = asyncio.run_coroutine_threadsafe(
+            self._queue.put(items), self._loop)
+        return asyncio.wrap_future(future, loop=get_running_loop())
+
+
+class _ChannelSender(_Sender[T]):
+    """Sender to another process (errors are forwarded if ``errors``)."""
+
+    def __init__(self, channel: '_Channel', batch: int,
+                 errors: bool) -> None:
+        super().__init__(batch)
+        self._channel = channel
+        self._errors = errors
+
+    def close(self, exc: Optional[BaseException] = None) -> None:
+        self._channel.post(exc if self._errors else None)
+
+    def _put(self, items: List[T]) -> Awaitable[bool]:
+        return self._channel.send_batch(items)
+
+
+async def _pump(source: AsyncIterable[T], sender: _Sender[T]) -> None:
+    exc: Optional[BaseException] = None
+    try:
+        try:
+            async for obj in source:
+                if not await sender.send(obj):
+                    break
+        except Exception as e:
+            # deliver items produced before the error
+            exc = e
+            await sender.drain()
+            raise
+        await sender.drain()
+    finally:
+        sender.cancel()
+        sender.close(exc)
+
+
+async def _receive(queue: ClosableQueue[List[T]]) -> AsyncIterator[T]:
+    while True:
+        items = await queue.get()
+        if items is queue.EndOfStream:
+            break
+        for obj in cast(List[T], items):
+            yield obj
+
+
+def _close_threadsafe(queue: ClosableQueue[Any],
+                      loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.call_soon_threadsafe(queue.close)
+    except RuntimeError:
+        # loop is closed, nobody is waiting on queue
+        pass
+
+
+class _Channel:
+    """Connection to another process used from event loop.
+
+    Messages are read as soon as they arrive and sent by a dedicated
+    thread, so large messages in both directions do not block each other
+    or the loop.  Messages are batches (lists), acknowledgements of
+    batches taken by consumer (``True``), end of stream (``None``)
+    and errors (exceptions).  Peer may have up to ``buffer`` batches
+    not yet acknowledged.
+    """
+
+    def __init__(self, conn: Connection, buffer: int) -> None:
+        self._loop = loop = get_running_loop()
+        self._conn = conn
+        self._executor = concurrent.futures.ThreadPoolExecutor(1)
+        self._credits = asyncio.Semaphore(buffer)
+        self._batches: Deque[List[Any]] = collections.deque()
+        self._ready = asyncio.Event()
+        self._ended = False
+        self._error: Optional[BaseException] = None
+        self._refused = False
+        self.closed = False
+        self.lost = False
+        #: called once connection is closed by peer
+        self.on_lost: Optional[Callable[[], Any]] = None
+        loop.add_reader(conn.fileno(), self._on_readable)
+
+    async def recv_batch(self) -> Optional[List[Any]]:
+        """Return next batch or None at end of stream."""
+        while not self._batches and not self._ended:
+            self._ready.clear()
+            await self._ready.wait()
+        if self._batches:
+            self.post(True)
+            return self._batches.popleft()
+        if self._error is not None:
+            raise self._error
+        return None
+
+    async def send_batch(self, items: List[Any]) -> bool:
+        """Send a batch once peer may take it; return False if connection
+        is closed.
+        """
+        await self._credits.acquire()
+        if self.lost or self.closed or self._refused:
+            return False
+        return await self.post(items)
+
+    def post(self, msg: Any) -> 'asyncio.Future[bool]':
+        """Send a message in background."""
+        if self.closed:
+            future = self._loop.create_future()
+            future.set_result(False)
+            return future
+        if isinstance(msg, BaseException):
+            msg = _picklable_error(msg)
+        return self._loop.run_in_executor(
+            self._executor, _send_message, self._conn, msg)
+
+    def refuse(self) -> None:
+        """Fail sending batches from now on (peer takes no more)."""
+        self._refused = True
+        # wake up sender waiting for credits
+        self._credits.release()
+
+    def close(self) -> None:
+        """Close connection once pending messages are sent."""
+        if self.closed:
+            return
+        self.closed = True
+        self._stop_reading()
+        self._executor.submit(_close_conn, self._conn)
+        self._executor.shutdown(wait=False)
+
+    def abort(self) -> None:
+        """Close connection dropping pending messages."""
+        if self.closed:
+            return
+        # wake up sender thread blocked on full socket
+        _shutdown(self._conn)
+        self.close()
+
+    def _on_readable(self) -> None:
+        conn = self._conn
+        try:
+            while conn.poll():
+                msg = conn.recv()
+                if type(msg) is list:
+                    self._batches.append(msg)
+                elif msg is True:
+                    self._credits.release()
+                    continue
+                else:
+                    self._ended = True
+                    self._error = msg
+                self._ready.set()
+        except (EOFError, OSError):
+            self._lost()
+
+    def _lost(self) -> None:
+        self.lost = True
+        self._stop_reading()
+        if not self._ended:
+            self._ended = True
+            self._error = EOFError("Connection closed by peer")
+        self._ready.set()
+        # wake up sender waiting for credits
+        self._credits.release()
+        if self.on_lost is not None:
+            self.on_lost()
+
+    def _stop_reading(self) -> None:
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+        except (OSError, ValueError):
+            pass
+
+
+async def _receive_channel(channel: _Channel) -> AsyncIterator[Any]:
+    while True:
+        items = await channel.recv_batch()
+        if items is None:
+            break
+        for obj in items:
+            yield obj
+
+
+def _send_message(conn: Connection, msg: Any) -> bool:
+    try:
+        conn.send(msg)
+    except (OSError, EOFError):
+        return False
+    return True
+
+
+def _picklable_error(exc: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exc)
+    except Exception:
+        return RuntimeError(repr(exc))
+    return exc
+
+
+def _shutdown(conn: Connection) -> None:
+    # unlike close() shutdown also affects copies of socket inherited
+    # by other processes and wakes up threads blocked on it
+    try:
+        sock = socket.fromfd(conn.fileno(), socket.AF_UNIX,
+                             socket.SOCK_STREAM)
+    except OSError:
+        return
+    with sock:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _close_conn(conn: Connection) -> None:
+    _shutdown(conn)
+    conn.close()
+
+
+def _connect(address: Any, authkey: bytes) -> Connection:
+    return Client(address, authkey=authkey)
+
+
+def _process_main(control: Connection, parent: Connection,
+                  authkey: bytes) -> None:
+    # parent end may be inherited (fork), it must not keep control open
+    parent.close()
+    loop = asyncio.new_event_loop()
+    listener = Listener(authkey=authkey)
+    try:
+        control.send(listener.address)
+        thread = threading.Thread(
+            target=_accept, args=(listener, loop), daemon=True)
+        thread.start()
+        # parent closes control connection to stop worker
+        loop.add_reader(control.fileno(), _stop_loop, loop, control)
+        _run_loop(loop)
+    finally:
+        listener.close()
+        control.close()
+
+
+def _stop_loop(loop: asyncio.AbstractEventLoop, control: Connection) -> None:
+    loop.remove_reader(control.fileno())
+    loop.stop()
+
+
+def _accept(listener: Listener, loop: asyncio.AbstractEventLoop) -> None:
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError:
+            # listener is closed
+            break
+        except Exception:
+            # failed authentication
+            continue
+        try:
+            stage, batch, buffer = conn.recv()
+        except Exception as exc:
+            # stage can not be unpickled here
+            _send_message(conn, _picklable_error(exc))
+            _close_conn(conn)
+            continue
+        try:
+            loop.call_soon_threadsafe(_serve_soon, conn, stage, batch, buffer)
+        except RuntimeError:
+            # loop is closed
+            conn.close()
+            break
+
+
+def _serve_soon(conn: Connection, stage: Stage[Any, Any],
+                batch: int, buffer: int) -> None:
+    channel = _Channel(conn, buffer)
+    task = asyncio.ensure_future(_serve(channel, stage, batch))
+    # parent went away (closed iterator): cancel the stage
+    channel.on_lost = task.cancel
+
+
+async def _serve(channel: _Channel, stage: Stage[Any, Any],
+                 batch: int) -> None:
+    try:
+        await _pump(_Lazy(stage, _receive_channel(channel)),
+                    _ChannelSender(channel, batch, True))
+    except Exception:
+        # error is sent to parent
+        pass
+    finally:
+        channel.close()
@@ -0,0 +1,149 @@
+import asyncio
+import builtins
+import enum
+
+from typing import (
+    cast,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ._compat import get_running_loop
+
+
+T = TypeVar('T')
+
+
+class _Marker(enum.Enum):
+    missing = 0
+
+
+_MISSING = _Marker.missing
+
+
+async def zip(streamA: AsyncIterable[Any],
+              streamB: AsyncIterable[Any],
+              *streamN: AsyncIterable[Any]) -> AsyncIterator[Tuple[Any, ...]]:
+    """Zip two or more async-iterators into a stream of tuples.
+
+    All streams are advanced concurrently, so each tuple costs
+    the latency of the slowest stream, not the sum of all latencies.
+    Iteration stops as soon as the shortest stream is exhausted.
+
+    >>> async def generate(seq, timeout):
+    ...     for obj in seq:
+    ...         yield await asyncio.sleep(timeout, obj)
+    >>> stream = zip(generate('abc', 0.1), generate(range(5), 0.1))
+    >>> res = [obj async for obj in stream]
+    >>> assert res == [('a', 0), ('b', 1), ('c', 2)]
+    """
+    iterators = [s.__aiter__() for s in (streamA, streamB) + streamN]
+    while True:
+        items = await _next_all(iterators)
+        if any(obj is _MISSING for obj in items):
+            return
+        yield tuple(items)
+
+
+async def zip_longest(streamA: AsyncIterable[Any],
+                      streamB: AsyncIterable[Any],
+                      *streamN: AsyncIterable[Any],
+                      fillvalue: Any = None
+                      ) -> AsyncIterator[Tuple[Any, ...]]:
+    """Zip two or more async-iterators until the longest one is exhausted.
+
+    Values of exhausted streams are replaced with ``fillvalue``.
+
+    >>> async def generate(seq, timeout):
+    ...     for obj in seq:
+    ...         yield await asyncio.sleep(timeout, obj)
+    >>> stream = zip_longest(generate('ab', 0.1), generate(range(3), 0.1))
+    >>> res = [obj async for obj in stream]
+    >>> assert res == [('a', 0), ('b', 1), (None, 2)]
+    """
+    iterators = [s.__aiter__() for s in (streamA, streamB) + streamN]
+    active = list(range(len(iterators)))
+    while active:
+        items = await _next_all([iterators[idx] for idx in active])
+        result: List[Any] = [fillvalue] * len(iterators)
+        running = []
+        for idx, obj in builtins.zip(active, items):
+            if obj is not _MISSING:
+                result[idx] = obj
+                running.append(idx)
+        active = running
+        if active:
+            yield tuple(result)
+
+
+async def combine_latest(streamA: AsyncIterable[Any],
+                         streamB: AsyncIterable[Any],
+                         *streamN: AsyncIterable[Any]
+                         ) -> AsyncIterator[Tuple[Any, ...]]:
+    """Emit a tuple of latest values every time any of streams yields.
+
+    The first tuple is emitted once every stream has yielded at least once;
+    if a stream ends without yielding, iteration stops right away.
+
+    >>> async def generate(seq, timeout):
+    ...     for obj in seq:
+    ...         yield await asyncio.sleep(timeout, obj)
+    >>> stream = combine_latest(generate('ab', 0.1), generate([1], 0.15))
+    >>> res = [obj async for obj in stream]
+    >>> assert res == [('a', 1), ('b', 1)]
+    """
+    iterators = [s.__aiter__() for s in (streamA, streamB) + streamN]
+    loop = get_running_loop()
+    # one pending read per running stream
+    pending = {loop.create_task(_next(it)): idx
+               for idx, it in enumerate(iterators)}
+    latest: List[Any] = [_MISSING] * len(iterators)
+    missing = len(iterators)
+    done: Set[asyncio.Task]
+    try:
+        while pending:
+            done, _pending = await asyncio.wait(
+                list(pending), return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=pending.__getitem__):
+                idx = pending.pop(task)
+                # re-raise source error
+                obj = task.result()
+                if obj is _MISSING:
+                    if latest[idx] is _MISSING:
+                        # no tuple can ever be emitted
+                        return
+                    continue
+                pending[loop.create_task(_next(iterators[idx]))] = idx
+                if latest[idx] is _MISSING:
+                    missing -= 1
+                latest[idx] = obj
+                if not missing:
+                    yield tuple(latest)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _next(iterator: AsyncIterator[T]) -> Union[T, _Marker]:
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _MISSING
+
+
+async def _next_all(iterators: Sequence[AsyncIterator[T]]
+                    ) -> List[Union[T, _Marker]]:
+    loop = get_running_loop()
+    tasks = [loop.create_task(_next(it)) for it in iterators]
+    try:
+        return cast(List[Union[T, _Marker]], await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
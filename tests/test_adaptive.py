@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_map__concurrency(simple_gen):
+    in_flight = []
+    active = 0
+
+    async def func(x):
+        nonlocal active
+        active += 1
+        in_flight.append(active)
+        # later items complete first
+        await asyncio.sleep(0.01 * (10 - x))
+        active -= 1
+        return x * 2
+
+    it = aiter.map(func, simple_gen(range(10)), concurrency=3)
+    assert it.limit.limit == 3
+    res = [x async for x in it]
+    assert res == [x * 2 for x in range(10)]
+    assert max(in_flight) == 3
+    assert it.limit.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_filter__concurrency(simple_gen):
+    async def func(x):
+        await asyncio.sleep(0.001 * (5 - x % 5))
+        return x % 2 == 0
+
+    it = aiter.Iterator(simple_gen(range(10))).filter(func, concurrency=4)
+    assert [x async for x in it] == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.asyncio
+async def test_map__concurrency_error(simple_gen):
+    async def func(x):
+        if x == 3:
+            raise ZeroDivisionError(x)
+        return x
+
+    res = []
+    with pytest.raises(ZeroDivisionError):
+        async for x in aiter.map(func, simple_gen(range(10)), concurrency=4):
+            res.append(x)
+    assert res == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_map__concurrency_auto(simple_gen):
+    async def func(x):
+        await asyncio.sleep(0)
+        return x
+
+    it = aiter.Iterator(simple_gen(range(100))).map(func, concurrency='auto')
+    assert [x async for x in it] == list(range(100))
+
+
+def test_map__concurrency_bad_args():
+    async def coro(x):
+        return x
+
+    with pytest.raises(ValueError):
+        aiter.map(lambda x: x, [], concurrency=2)
+    with pytest.raises(ValueError):
+        aiter.map(coro, [], concurrency='fast')
+    with pytest.raises(ValueError):
+        aiter.map(coro, [], concurrency=0)
+    with pytest.raises(ValueError):
+        aiter.AIMDLimit(10, max_limit=5)
+    it = aiter.map(lambda x: x, [])
+    assert it.limit is None
+
+
+def test_aimd_limit():
+    limit = aiter.AIMDLimit(4, max_limit=5, window=10)
+    for _ in range(5):
+        limit.on_sample(0.01)
+    assert limit.limit == 5
+    for _ in range(20):
+        limit.on_sample(0.01)
+    assert limit.limit == 5
+
+    # queueing latency backs off
+    limit.on_sample(0.1)
+    assert limit.limit == 4
+    # errors back off too
+    for _ in range(100):
+        limit.on_sample(0.01, ok=False)
+    assert limit.limit == 1
+    assert repr(limit) == '<AIMDLimit limit:1 in_flight:0>'
+
+
+def test_aimd_limit__one_decrease_per_window():
+    limit = aiter.AIMDLimit(64, window=100)
+    for _ in range(100):
+        limit.on_sample(0.01)
+    assert limit.limit == 64
+    # all calls in flight are slow: one decrease per 64 samples
+    for _ in range(64):
+        limit.on_sample(0.1)
+    assert limit.limit == 57
+    limit.on_sample(0.1)
+    assert limit.limit == 51
+
+
+def test_buffer_sizer(monkeypatch):
+    now = 0.0
+    monkeypatch.setattr(aiter.adaptive.time, 'monotonic', lambda: now)
+    sizer = aiter.BufferSizer(2, max_size=3, interval=1)
+    # both sides waiting within a window: bursts, grow
+    sizer.on_full(0.1)
+    now = 1.0
+    sizer.on_empty(0.1)
+    assert sizer.size == 3
+    now = 2.0
+    sizer.on_full(0.1)
+    sizer.on_empty(0.1)
+    assert sizer.size == 3
+    # only one side waiting: it sets the pace, shrink
+    now = 3.0
+    sizer.on_full(0.5)
+    assert sizer.size == 2
+    now = 4.0
+    sizer.on_empty(0.5)
+    assert sizer.size == 1
+    assert repr(sizer) == '<BufferSizer size:1>'
+    # short waits are ignored
+    now = 5.0
+    sizer.on_full(0.01)
+    sizer.on_empty(0.01)
+    assert sizer.size == 1
+
+    with pytest.raises(ValueError):
+        aiter.BufferSizer(0)
+    with pytest.raises(ValueError):
+        aiter.BufferSizer(backoff=1)
+    with pytest.raises(ValueError):
+        aiter.BufferSizer(interval=0)
+
+
+@pytest.mark.asyncio
+async def test_buffer_sizer__queues(simple_gen):
+    async def bursts():
+        for i in range(200):
+            if i % 10 == 0:
+                await asyncio.sleep(0.005)
+            yield i
+
+    sizer = aiter.BufferSizer(1, interval=0.01)
+    queue = aiter.ClosableQueue(sizer=sizer)
+    assert queue.maxsize == 1
+
+    async def produce():
+        async for i in bursts():
+            await queue.put(i)
+        queue.close()
+
+    async def consume():
+        res = []
+        while True:
+            obj = await queue.get()
+            if obj is queue.EndOfStream:
+                return res
+            res.append(obj)
+            await asyncio.sleep(0.0005)
+
+    _, res = await asyncio.gather(produce(), consume())
+    assert res == list(range(200))
+    # bursty producer grows buffer
+    assert queue.maxsize == sizer.size > 1
+
+    sizer = aiter.BufferSizer(2)
+    it = aiter.Iterator(simple_gen(range(10))).split(sizer=sizer)
+    assert [x async for x in it] == list(range(10))
+    assert it._stream._queue.buffer_maxsize == 2
@@ -0,0 +1,77 @@
+import array
+import collections
+import operator
+import pytest
+import subprocess
+import sys
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_reduce(simple_gen):
+    assert await aiter.reduce(operator.add, simple_gen(range(5))) == 10
+    assert await aiter.reduce(operator.add, simple_gen([]), 7) == 7
+    with pytest.raises(TypeError):
+        await aiter.reduce(operator.add, simple_gen([]))
+
+    async def concat(acc, x):
+        return acc + x
+
+    assert await aiter.reduce(concat, simple_gen('abc'), '>') == '>abc'
+
+
+@pytest.mark.asyncio
+async def test_scan(simple_gen):
+    res = [x async for x in aiter.scan(operator.add, simple_gen(range(5)))]
+    assert res == [0, 1, 3, 6, 10]
+    it = aiter.Iterator(simple_gen(range(1, 5))).scan(operator.mul, 10)
+    assert [x async for x in it] == [10, 20, 60, 240]
+    assert [x async for x in aiter.scan(operator.add, simple_gen([]))] == []
+
+
+@pytest.mark.asyncio
+async def test_count_sum(simple_gen):
+    assert await aiter.count(simple_gen(range(100))) == 100
+    assert await aiter.count(simple_gen([])) == 0
+    assert await aiter.sum(simple_gen(range(100))) == 4950
+    assert await aiter.sum(simple_gen([0.5, 0.25]), 1) == 1.75
+
+
+@pytest.mark.asyncio
+async def test_min_max(simple_gen):
+    assert await aiter.min(simple_gen([3, 1, 2])) == 1
+    assert await aiter.max(simple_gen([3, 1, 2])) == 3
+    words = ['bb', 'a', 'ccc', 'dd']
+    assert await aiter.min(simple_gen(words), key=len) == 'a'
+    # first of equal items wins, as with builtins
+    assert await aiter.max(simple_gen(['bb', 'dd']), key=len) == 'bb'
+    assert await aiter.max(simple_gen([]), default=None) is None
+    with pytest.raises(ValueError):
+        await aiter.min(simple_gen([]))
+
+
+@pytest.mark.asyncio
+async def test_collect_into(simple_gen):
+    assert await aiter.collect(simple_gen(range(3))) == [0, 1, 2]
+    res = await aiter.collect(simple_gen(range(3)), into=array.array('d'))
+    assert res == array.array('d', [0, 1, 2])
+    last = collections.deque(maxlen=2)
+    assert await aiter.collect(simple_gen(range(10)), into=last) is last
+    assert list(last) == [8, 9]
+
+
+@pytest.mark.asyncio
+async def test_collect_into_numpy(simple_gen):
+    numpy = pytest.importorskip('numpy')
+    res = await aiter.collect(simple_gen(range(3000)), into='f8')
+    assert res.dtype == numpy.float64
+    assert res.tolist() == list(range(3000))
+    res = await aiter.collect(simple_gen([]), into=numpy.int32)
+    assert len(res) == 0
+
+
+def test_numpy_imported_lazily():
+    code = 'import sys, asyncio_iter_tools; print("numpy" in sys.modules)'
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.strip() == b'False'
@@ -0,0 +1,51 @@
+import threading
+import time
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.parametrize('batch', [1, 3, 100])
+@pytest.mark.asyncio
+async def test_from_sync_iterable(batch):
+    it = aiter.from_sync_iterable(range(10), batch=batch)
+    assert [obj async for obj in it] == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_from_sync_iterable__error():
+
+    def gen():
+        yield 1
+        raise RuntimeError("err")
+
+    res = []
+    with pytest.raises(RuntimeError):
+        async for obj in aiter.from_sync_iterable(gen(), batch=1):
+            res.append(obj)
+    assert res == [1]
+
+
+@pytest.mark.asyncio
+async def test_from_sync_iterable__stop(event_loop):
+    stopped = threading.Event()
+
+    def gen():
+        try:
+            for i in range(1000):
+                time.sleep(0.001)
+                yield i
+        finally:
+            stopped.set()
+
+    it = aiter.from_sync_iterable(gen(), batch=2)
+    async for obj in it:
+        break
+    await it.aclose()
+    assert await event_loop.run_in_executor(None, stopped.wait, 1)
+
+
+@pytest.mark.asyncio
+async def test_from_sync_iterable__bad_batch():
+    with pytest.raises(ValueError):
+        await aiter.from_sync_iterable(range(3), batch=0).__anext__()
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+async def ready_gen(seq):
+    # never suspends: items are always ready
+    for obj in seq:
+        yield obj
+
+
+async def ticker(stop):
+    ticks = 0
+    while not stop.is_set():
+        ticks += 1
+        await asyncio.sleep(0)
+    return ticks
+
+
+@pytest.mark.asyncio
+async def test_map__yield_every():
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(ticker(stop))
+    await asyncio.sleep(0)
+    it = aiter.map(str, ready_gen(range(100)), yield_every=10)
+    res = [x async for x in it]
+    stop.set()
+    assert res == [str(x) for x in range(100)]
+    assert it.budget.yields == 10
+    assert await task >= 10
+    assert len(it.budget.lag) == 9
+
+
+@pytest.mark.asyncio
+async def test_map__no_budget_starves_loop():
+    stop = asyncio.Event()
+    task = asyncio.ensure_future(ticker(stop))
+    await asyncio.sleep(0)
+    it = aiter.map(str, ready_gen(range(100)))
+    assert it.budget is None
+    [x async for x in it]
+    stop.set()
+    assert await task == 1
+
+
+@pytest.mark.asyncio
+async def test_filter__yield_every():
+    # dropped items are accounted too
+    it = aiter.Iterator(ready_gen(range(100))).filter(
+        lambda x: x == 99, yield_every=25)
+    assert [x async for x in it] == [99]
+    it = aiter.filter(None, ready_gen([0] * 10 + [1]), yield_every=5)
+    assert [x async for x in it] == [1]
+    assert it.budget.yields == 2
+
+
+@pytest.mark.asyncio
+async def test_map__time_slice():
+    def slow(x):
+        # busy loop for ~2ms
+        start = asyncio.get_event_loop().time()
+        while asyncio.get_event_loop().time() - start < 0.002:
+            pass
+        return x
+
+    it = aiter.Iterator(ready_gen(range(10))).map(slow, time_slice=0.005)
+    assert [x async for x in it] == list(range(10))
+    budget = it._stream.budget
+    assert 1 <= budget.yields <= 6
+    assert budget.lag.quantile(1) < 0.05
+
+
+def test_budget__bad_args():
+    with pytest.raises(ValueError):
+        aiter.YieldBudget()
+    with pytest.raises(ValueError):
+        aiter.YieldBudget(-1)
+    with pytest.raises(ValueError):
+        aiter.YieldBudget(time_slice=0)
+    budget = aiter.YieldBudget(2)
+    assert not budget.tick()
+    assert budget.tick()
+    assert repr(budget) == '<YieldBudget every:2 time_slice:None yields:0>'
@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_cached_map(simple_gen):
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return x * 2
+
+    it = aiter.cached_map(func, simple_gen([1, 2, 1, 1, 3, 2]))
+    assert [obj async for obj in it] == [2, 4, 2, 2, 6, 4]
+    assert calls == [1, 2, 3]
+    assert (it.cache.hits, it.cache.misses) == (3, 3)
+    assert repr(it.cache) == '<MapCache size:3 hits:3 misses:3 coalesced:0>'
+
+
+@pytest.mark.asyncio
+async def test_cached_map__coroutine_key(simple_gen):
+    calls = []
+
+    async def lookup(word):
+        calls.append(word)
+        return len(word)
+
+    it = aiter.cached_map(lookup, simple_gen(['a', 'A', 'bb', 'a']),
+                          key=str.lower)
+    assert [obj async for obj in it] == [1, 1, 2, 1]
+    assert calls == ['a', 'bb']
+
+
+@pytest.mark.asyncio
+async def test_cached_map__lru(simple_gen):
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return x
+
+    it = aiter.cached_map(func, simple_gen([1, 2, 1, 3, 2, 1]), maxsize=2)
+    assert [obj async for obj in it] == [1, 2, 1, 3, 2, 1]
+    assert calls == [1, 2, 3, 2, 1]
+    assert len(it.cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_map__ttl(simple_gen):
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return x
+
+    it = aiter.cached_map(func, simple_gen([1, 1, 1], 0.03), ttl=0.05)
+    assert [obj async for obj in it] == [1, 1, 1]
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_cached_map__coalescing(simple_gen):
+    calls = []
+
+    async def fetch(x):
+        calls.append(x)
+        await asyncio.sleep(0.05)
+        return x * 10
+
+    cache = aiter.MapCache()
+    it1 = aiter.cached_map(fetch, simple_gen([1, 2]), cache=cache)
+    it2 = aiter.cached_map(fetch, simple_gen([1, 2]), cache=cache)
+    res = await asyncio.gather(aiter.collect(it1), aiter.collect(it2))
+    assert res == [[10, 20], [10, 20]]
+    assert calls == [1, 2]
+    assert (cache.hits, cache.misses, cache.coalesced) == (0, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_cached_map__error(simple_gen):
+    calls = []
+
+    async def fetch(x):
+        calls.append(x)
+        raise RuntimeError(x)
+
+    it = aiter.cached_map(fetch, simple_gen([1, 1]))
+    with pytest.raises(RuntimeError):
+        await it.__anext__()
+    with pytest.raises(RuntimeError):
+        await it.__anext__()
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_iterator_cached_map(simple_gen):
+    it = aiter.Iterator(simple_gen('abab')).cached_map(str.upper, maxsize=1)
+    assert [obj async for obj in it] == ['A', 'B', 'A', 'B']
+
+
+@pytest.mark.asyncio
+async def test_cached_map__concurrency(simple_gen):
+    calls = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def lookup(x):
+        nonlocal in_flight, max_in_flight
+        calls.append(x)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return x * 2
+
+    it = aiter.cached_map(lookup, simple_gen([1, 1, 2, 1, 1, 2]),
+                          concurrency=4)
+    assert [obj async for obj in it] == [2, 2, 4, 2, 2, 4]
+    # duplicate keys in flight share a single call
+    assert calls == [1, 2]
+    assert max_in_flight == 2
+    assert it.limit.limit == 4
+
+    with pytest.raises(ValueError):
+        aiter.cached_map(str, simple_gen([1]), concurrency=2)
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 
 import asyncio_iter_tools as aiter
@@ -26,3 +27,76 @@ async def test_chain__error(simple_gen):
         async for i in aiter.chain(simple_gen('abc'), error_gen()):
             partial_result.append(i)
     assert partial_result == ['a', 'b', 'c', 0]
+
+
+@pytest.mark.asyncio
+async def test_chain__prefetch(simple_gen, event_loop):
+    started = []
+
+    async def segment(name, delay):
+        started.append(name)
+        # connection setup
+        await asyncio.sleep(delay)
+        for i in range(2):
+            yield name + str(i)
+
+    it = aiter.chain(segment('a', 0.1), segment('b', 0.1),
+                     segment('c', 0.1), segment('d', 0.1), prefetch=3)
+    start = event_loop.time()
+    res = [i async for i in it]
+    elapsed = event_loop.time() - start
+    assert res == ['a0', 'a1', 'b0', 'b1', 'c0', 'c1', 'd0', 'd1']
+    assert started == ['a', 'b', 'c', 'd']
+    # serial setup would take 0.4s
+    assert elapsed < 0.3
+
+
+@pytest.mark.asyncio
+async def test_chain__prefetch_lookahead(simple_gen):
+    started = []
+
+    async def segment(name):
+        started.append(name)
+        yield name
+
+    it = aiter.chain(segment('a'), segment('b'),
+                     segment('c'), segment('d'), prefetch=1)
+    assert await it.__anext__() == 'a'
+    assert started == ['a', 'b']
+    assert [i async for i in it] == ['b', 'c', 'd']
+    assert started == ['a', 'b', 'c', 'd']
+
+
+@pytest.mark.asyncio
+async def test_chain__prefetch_error(simple_gen):
+
+    async def error_gen():
+        yield 0
+        raise RuntimeError("err")
+
+    partial_result = []
+    with pytest.raises(RuntimeError):
+        it = aiter.chain(simple_gen('abc'), error_gen(), simple_gen('def'),
+                         prefetch=2)
+        async for i in it:
+            partial_result.append(i)
+    assert partial_result == ['a', 'b', 'c', 0]
+
+
+@pytest.mark.asyncio
+async def test_chain__aclose():
+    closed = []
+
+    async def gen(name):
+        try:
+            yield name + '0'
+            yield name + '1'
+        finally:
+            closed.append(name)
+
+    it = aiter.chain(gen('a'), gen('b'))
+    assert await it.__anext__() == 'a0'
+    await it.aclose()
+    assert closed == ['a']
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+def _records(seq):
+    # items are tracked by identity, so use distinct objects
+    return [[x] for x in seq]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint(simple_gen):
+    cp = aiter.Checkpointer()
+    it = aiter.Iterator(cp.source(simple_gen(_records('abcd')), 'letters',
+                                  start=10))
+    it = it.map(cp.map(lambda r: [r[0].upper()])).filter(
+        lambda r: r != ['C'])
+    res = []
+    marks = []
+    async for obj in cp.commit(it):
+        res.append(obj)
+        marks.append(cp.watermarks())
+    assert res == [['A'], ['B'], ['D']]
+    # item is complete once the next one is requested
+    assert marks == [{}, {'letters': 10}, {'letters': 11}]
+    assert cp.watermarks() == {'letters': 13}
+
+
+@pytest.mark.asyncio
+async def test_checkpoint__mix_split(simple_gen):
+    cp = aiter.Checkpointer()
+    it = aiter.Iterator(cp.source(simple_gen(_records(range(5)), 0.001),
+                                  'a'))
+    it = it.mix(cp.source(simple_gen(_records([10, 20, 30]), 0.002), 'b',
+                          position=lambda r: r[0] // 10))
+    copy = it.split()
+    fast = cp.commit(it, 'fast')
+    slow = cp.commit(copy.map(cp.map(lambda r: str(r[0]))), 'slow')
+    marks = []
+
+    async def consume_slow():
+        res = []
+        async for obj in slow:
+            res.append(obj)
+            marks.append(cp.watermarks())
+            await asyncio.sleep(0.001)
+        return res
+
+    res_fast, res_slow = await asyncio.gather(
+        aiter.collect(fast), consume_slow())
+    assert sorted(r[0] for r in res_fast) == [0, 1, 2, 3, 4, 10, 20, 30]
+    assert res_slow == [str(r[0]) for r in res_fast]
+    # watermarks only grow and are bounded by the slow sink
+    assert marks[0] == {}
+    for prev, mark in zip(marks, marks[1:]):
+        for source, pos in prev.items():
+            assert mark[source] >= pos
+    assert cp.watermarks() == {'a': 4, 'b': 3}
+
+
+@pytest.mark.asyncio
+async def test_checkpoint__async_callbacks(simple_gen):
+    async def double(r):
+        await asyncio.sleep(0)
+        return [r[0] * 2]
+
+    async def positive(r):
+        return r[0] > 0
+
+    cp = aiter.Checkpointer()
+    it = aiter.map(cp.map(double),
+                   cp.source(simple_gen(_records(range(-2, 3))), 's'))
+    it = aiter.filter(positive, it, concurrency=2)
+    assert [x async for x in cp.commit(it)] == [[2], [4]]
+    assert cp.watermarks() == {'s': 4}
+    # untracked items pass through wrappers and sinks
+    it = aiter.map(cp.map(double), simple_gen([[1]]))
+    assert [x async for x in cp.commit(it, 'plain')] == [[2]]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint__unwrapped_stages(simple_gen):
+    # stages not wrapped by checkpointer see items as is
+    cp = aiter.Checkpointer()
+    seen = []
+    it = aiter.Iterator(cp.source(simple_gen(_records(range(3))), 's'))
+    it = it.map(lambda r: seen.append(r) or r).filter(lambda r: r[0] != 1)
+    assert [x async for x in cp.commit(it)] == [[0], [2]]
+    assert seen == [[0], [1], [2]]
+    assert cp.watermarks() == {'s': 2}
+    # committed items are no longer tracked
+    assert repr(cp) == '<Checkpointer sources:1 sinks:1 tracked:1>'
+
+
+@pytest.mark.asyncio
+async def test_checkpoint__max_tracked(simple_gen):
+    cp = aiter.Checkpointer(max_tracked=2)
+    it = cp.source(simple_gen(_records(range(5))), 's')
+    # dropped items are forgotten once limit is reached
+    it = aiter.filter(lambda r: r[0] == 4, it)
+    assert [x async for x in cp.commit(it)] == [[4]]
+    assert cp.watermarks() == {'s': 4}
+    assert repr(cp) == '<Checkpointer sources:1 sinks:1 tracked:1>'
+
+
+def test_checkpoint__bad_args():
+    cp = aiter.Checkpointer()
+    cp.commit([])
+    with pytest.raises(ValueError):
+        cp.commit([])
+    with pytest.raises(ValueError):
+        cp.map(None)
+    with pytest.raises(ValueError):
+        aiter.Checkpointer(max_tracked=0)
+    assert repr(cp) == '<Checkpointer sources:0 sinks:1 tracked:0>'
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 
 from asyncio_iter_tools import ClosableQueue
@@ -70,3 +71,65 @@ async def test_put_and_close():
     assert await q.get() == 1
     assert await q.get() == 2
     assert await q.get() is q.EndOfStream
+
+
+@pytest.mark.asyncio
+async def test_get_nowait():
+    q = ClosableQueue()
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+
+    await q.put(1)
+    await q.put(2)
+    assert q.get_nowait() == 1
+    q.close()
+    assert q.get_nowait() == 2
+    assert q.get_nowait() is q.EndOfStream
+    assert q.exhausted
+
+
+@pytest.mark.asyncio
+async def test_drain_nowait(event_loop):
+    q = ClosableQueue(maxsize=3)
+    assert q.drain_nowait() == []
+
+    for i in range(3):
+        await q.put(i)
+    assert q.full()
+    task = event_loop.create_task(q.put(3))
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    assert q.drain_nowait(2) == [0, 1]
+    await asyncio.sleep(0)
+    assert await task is True
+    assert q.drain_nowait() == [2, 3]
+    assert q.empty()
+    assert q.drain_nowait() == []
+
+
+@pytest.mark.asyncio
+async def test_resize():
+    q = ClosableQueue(1)
+    await q.put(1)
+    assert q.full()
+    put = asyncio.ensure_future(q.put(2))
+    await asyncio.sleep(0)
+    assert not put.done()
+    q.maxsize = 2
+    await asyncio.wait_for(put, 1)
+    assert q.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_on_wait():
+    waits = []
+    q = ClosableQueue(on_wait=waits.append)
+    await q.put(1)
+    await q.put(2)
+    await q.put(3)
+    await asyncio.sleep(0.01)
+    assert await q.get() == 1
+    assert q.drain_nowait() == [2, 3]
+    assert len(waits) == 3
+    assert min(waits) >= 0.009
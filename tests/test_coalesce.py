@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_coalesce():
+    async def gen():
+        # burst of updates arriving before consumer wakes up
+        for obj in [('a', 1), ('b', 1), ('a', 2), ('c', 1), ('a', 3),
+                    ('b', 2)]:
+            yield obj
+
+    it = aiter.coalesce(gen(), key=lambda u: u[0])
+    res = [obj async for obj in it]
+    assert res == [('a', 3), ('b', 2), ('c', 1)]
+
+
+@pytest.mark.asyncio
+async def test_coalesce__fast_consumer(simple_gen):
+    it = aiter.Iterator(simple_gen('abab', 0.001)).coalesce()
+    assert [x async for x in it] == list('abab')
+
+
+@pytest.mark.asyncio
+async def test_coalesce__max_pending():
+    produced = 0
+
+    async def gen():
+        nonlocal produced
+        for obj in ['a', 'b', 'c', 'b', 'd']:
+            produced += 1
+            yield obj
+
+    it = aiter.coalesce(gen(), max_pending=2)
+    it.start()
+    await asyncio.sleep(0.01)
+    # reader waits for consumer on new key 'c'
+    assert produced == 3
+    assert await it.__anext__() == 'a'
+    await asyncio.sleep(0.01)
+    # pending key 'b' is replaced without waiting, 'd' waits again
+    assert produced == 5
+    assert [x async for x in it] == ['b', 'c', 'd']
+
+
+@pytest.mark.asyncio
+async def test_coalesce__error():
+    async def gen():
+        yield 1
+        yield 2
+        raise ZeroDivisionError()
+
+    res = []
+    with pytest.raises(ZeroDivisionError):
+        async for x in aiter.coalesce(gen()):
+            res.append(x)
+    assert res == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_debounce():
+    async def gen():
+        for x in range(5):
+            yield x
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)
+        yield 5
+        yield 6
+
+    res = [x async for x in aiter.debounce(gen(), 0.02)]
+    assert res == [4, 6]
+
+
+@pytest.mark.asyncio
+async def test_sample():
+    async def gen():
+        for x in range(20):
+            yield x
+            await asyncio.sleep(0.005)
+
+    res = [x async for x in aiter.Iterator(gen()).sample(0.02)]
+    assert res[-1] == 19
+    assert 3 <= len(res) <= 8
+    assert res == sorted(res)
+
+
+@pytest.mark.asyncio
+async def test_coalesce__aclose(simple_gen):
+    it = aiter.debounce(simple_gen(range(100), 0.001), 1)
+    task = asyncio.ensure_future(it.__anext__())
+    await asyncio.sleep(0.01)
+    assert not task.done()
+    await it.aclose()
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(task, 1)
+
+
+def test_bad_args():
+    with pytest.raises(ValueError):
+        aiter.debounce([], -1)
+    with pytest.raises(ValueError):
+        aiter.sample([], 0)
+    with pytest.raises(ValueError):
+        aiter.coalesce([], max_pending=0)
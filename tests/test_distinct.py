@@ -0,0 +1,56 @@
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.parametrize('mode', ['lru', 'bloom'])
+@pytest.mark.asyncio
+async def test_distinct(simple_gen, mode):
+    it = aiter.distinct(simple_gen('abacbdda'), mode=mode)
+    assert [obj async for obj in it] == ['a', 'b', 'c', 'd']
+
+
+@pytest.mark.asyncio
+async def test_distinct__key(simple_gen):
+    it = aiter.distinct(simple_gen('aAbBa'), key=str.lower)
+    assert [obj async for obj in it] == ['a', 'b']
+
+
+@pytest.mark.asyncio
+async def test_distinct__lru_window(simple_gen):
+    it = aiter.distinct(simple_gen('abcabbca'), window=2)
+    # 'a' is forgotten once 'b' and 'c' are seen
+    assert [obj async for obj in it] == ['a', 'b', 'c', 'a', 'b', 'c', 'a']
+
+
+@pytest.mark.asyncio
+async def test_distinct__bloom(simple_gen):
+    it = aiter.distinct(simple_gen(list(range(2000)) * 2),
+                        mode='bloom', window=2000, error_rate=0.01)
+    res = [obj async for obj in it]
+    # no duplicates pass and few unique items are dropped
+    assert len(res) == len(set(res))
+    assert len(res) > 2000 * 0.97
+
+
+@pytest.mark.asyncio
+async def test_distinct__bloom_rotation(simple_gen):
+    it = aiter.distinct(simple_gen(list(range(100)) + [0]),
+                        mode='bloom', window=10)
+    res = [obj async for obj in it]
+    assert res[-1] == 0
+
+
+def test_distinct__bad_args(simple_gen):
+    with pytest.raises(ValueError):
+        aiter.distinct(simple_gen(''), window=0)
+    with pytest.raises(ValueError):
+        aiter.distinct(simple_gen(''), mode='set')
+    with pytest.raises(ValueError):
+        aiter.distinct(simple_gen(''), mode='bloom', error_rate=1)
+
+
+@pytest.mark.asyncio
+async def test_iterator_distinct(simple_gen):
+    it = aiter.Iterator(simple_gen('aAbB')).map(str.upper).distinct()
+    assert [obj async for obj in it] == ['A', 'B']
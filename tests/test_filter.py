@@ -31,3 +31,32 @@ async def test_filter(simple_gen, input, function, output):
 
 
 # TODO: test errors
+
+
+@pytest.mark.asyncio
+async def test_filter__aclose():
+    closed = []
+
+    async def gen():
+        try:
+            for x in range(10):
+                yield x
+        finally:
+            closed.append(True)
+
+    it = aiter.filter(_filter, gen())
+    assert await it.__anext__() == 1
+    await it.aclose()
+    assert closed == [True]
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_filter__aclose_split(simple_gen):
+    it, copy = aiter.split(simple_gen(range(3)))
+    selected = aiter.filter(None, it)
+    await selected.aclose()
+    with pytest.raises(StopAsyncIteration):
+        await selected.__anext__()
+    assert [x async for x in copy] == [0, 1, 2]
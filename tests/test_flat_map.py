@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+@pytest.mark.asyncio
+async def test_flat_map__ordered(simple_gen, concurrency):
+    it = aiter.flat_map(lambda s: simple_gen(s, 0.01),
+                        simple_gen(['abc', 'de', '', 'f']),
+                        concurrency=concurrency)
+    res = [obj async for obj in it]
+    assert res == ['a', 'b', 'c', 'd', 'e', 'f']
+
+
+@pytest.mark.asyncio
+async def test_flat_map__coroutine(simple_gen):
+
+    async def lines(path):
+        await asyncio.sleep(0)
+        return simple_gen([path + '1', path + '2'])
+
+    it = aiter.flat_map(lines, simple_gen('ab'), concurrency=2)
+    res = [obj async for obj in it]
+    assert res == ['a1', 'a2', 'b1', 'b2']
+
+
+@pytest.mark.asyncio
+async def test_flat_map__unordered(simple_gen, event_loop):
+    delays = {'a': 0.07, 'b': 0.05}
+    it = aiter.flat_map(lambda s: simple_gen(s * 2, delays[s]),
+                        simple_gen('ab'), concurrency=2, ordered=False)
+    start = event_loop.time()
+    res = [obj async for obj in it]
+    elapsed = event_loop.time() - start
+    assert res == ['b', 'a', 'b', 'a']
+    # sequential reading would take 0.24s
+    assert elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_flat_map__concurrency_limit(simple_gen):
+    running = 0
+    max_running = 0
+
+    async def inner(obj):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            for i in range(3):
+                yield await asyncio.sleep(0.01, obj)
+        finally:
+            running -= 1
+
+    it = aiter.flat_map(inner, simple_gen(range(6)),
+                        concurrency=2, ordered=False)
+    res = [obj async for obj in it]
+    assert sorted(res) == sorted(list(range(6)) * 3)
+    assert max_running == 2
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+@pytest.mark.asyncio
+async def test_flat_map__error(simple_gen, ordered):
+
+    async def error_gen(obj):
+        yield obj
+        raise RuntimeError("err")
+
+    it = aiter.flat_map(error_gen, simple_gen('ab'),
+                        concurrency=2, ordered=ordered)
+    with pytest.raises(RuntimeError):
+        assert [obj async for obj in it] is None
+
+
+@pytest.mark.parametrize('buffer_size', [1, 10])
+@pytest.mark.asyncio
+async def test_flat_map__buffer_size(buffer_size):
+    read = []
+
+    async def inner(name):
+        for i in range(10):
+            read.append(name)
+            yield i
+
+    async def outer():
+        yield 'a'
+        yield 'b'
+
+    it = aiter.flat_map(inner, outer(), concurrency=2,
+                        buffer_size=buffer_size)
+    assert await it.__anext__() == 0
+    await asyncio.sleep(0.01)
+    # next stream is read ahead up to buffer_size items (plus one
+    # waiting to be put)
+    assert read.count('b') == min(10, buffer_size + 1)
+    assert len([obj async for obj in it]) == 19
+
+
+def test_flat_map__bad_args(simple_gen):
+    with pytest.raises(ValueError):
+        aiter.flat_map(None, simple_gen('abc'))
+    with pytest.raises(ValueError):
+        aiter.flat_map(simple_gen, simple_gen('abc'), concurrency=0)
+    with pytest.raises(ValueError):
+        aiter.flat_map(simple_gen, simple_gen('abc'), buffer_size=0)
+
+
+@pytest.mark.asyncio
+async def test_iterator_flat_map(simple_gen):
+    it = aiter.Iterator(simple_gen(['ab', 'c'])).flat_map(
+        simple_gen, concurrency=2).map(str.upper)
+    assert [obj async for obj in it] == ['A', 'B', 'C']
@@ -0,0 +1,86 @@
+import random
+import struct
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.asyncio
+async def test_split_lines(simple_gen):
+    stream = simple_gen([b'ab\ncd', b'ef', b'\n\ngh\n', b'ij'])
+    res = [obj async for obj in aiter.split_lines(stream)]
+    assert all(isinstance(obj, memoryview) for obj in res)
+    assert [bytes(obj) for obj in res] == [
+        b'ab', b'cdef', b'', b'gh', b'ij']
+
+
+@pytest.mark.asyncio
+async def test_split_lines__copy(simple_gen):
+    stream = simple_gen([b'ab\nc', b'd\n'])
+    res = [obj async for obj in aiter.split_lines(stream, copy=True)]
+    assert res == [b'ab', b'cd']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 100])
+@pytest.mark.asyncio
+async def test_frame__delimiter(simple_gen, chunk_size):
+    data = b'abc\r\n\r\nde\r\r\n\nfgh\r\n'
+    stream = simple_gen(_chunks(data, chunk_size))
+    res = [bytes(obj) async for obj in aiter.frame(stream, delimiter=b'\r\n')]
+    assert res == [b'abc', b'', b'de\r', b'\nfgh']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 4, 7, 100])
+@pytest.mark.asyncio
+async def test_frame__length_prefix(simple_gen, chunk_size):
+    records = [b'hello', b'', b'x' * 10, b'world']
+    data = b''.join(struct.pack('>H', len(r)) + r for r in records)
+    stream = simple_gen(_chunks(data, chunk_size))
+    res = [bytes(obj)
+           async for obj in aiter.frame(stream, length_prefix='>H')]
+    assert res == records
+
+
+@pytest.mark.asyncio
+async def test_frame__incomplete(simple_gen):
+    stream = simple_gen([struct.pack('>I', 10) + b'abc'])
+    it = aiter.frame(stream, length_prefix=struct.Struct('>I'), copy=True)
+    with pytest.raises(ValueError):
+        assert [obj async for obj in it] is None
+
+
+def test_frame__bad_args(simple_gen):
+    with pytest.raises(ValueError):
+        aiter.frame(simple_gen([]))
+    with pytest.raises(ValueError):
+        aiter.frame(simple_gen([]), delimiter=b'\n', length_prefix='>I')
+    with pytest.raises(ValueError):
+        aiter.frame(simple_gen([]), delimiter=b'')
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.asyncio
+async def test_read_file(tmp_path, mmap):
+    data = bytes(random.getrandbits(8) for _ in range(1000))
+    path = tmp_path / 'data.bin'
+    path.write_bytes(data)
+    res = [bytes(chunk)
+           async for chunk in aiter.read_file(path, 300, mmap=mmap)]
+    assert [len(chunk) for chunk in res] == [300, 300, 300, 100]
+    assert b''.join(res) == data
+
+    path.write_bytes(b'')
+    assert [chunk async for chunk in aiter.read_file(path, mmap=mmap)] == []
+
+
+@pytest.mark.asyncio
+async def test_read_file__lines(tmp_path):
+    path = tmp_path / 'log.txt'
+    path.write_bytes(b'line 1\nline 2\nline 3\n')
+    stream = aiter.read_file(path, 4)
+    res = [obj async for obj in aiter.split_lines(stream, copy=True)]
+    assert res == [b'line 1', b'line 2', b'line 3']
@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_hedger__fixed_delay():
+    calls = []
+
+    async def fetch(x):
+        calls.append(x)
+        # first call is slow, hedged one is fast
+        await asyncio.sleep(1 if len(calls) == 1 else 0.01)
+        return x * 2
+
+    hedger = aiter.Hedger(fetch, 0.02, max_ratio=1)
+    assert hedger.hedge_delay() == 0.02
+    assert await asyncio.wait_for(hedger(1), 0.5) == 2
+    assert calls == [1, 1]
+    assert (hedger.calls, hedger.hedged, hedger.hedge_wins) == (1, 1, 1)
+    assert repr(hedger) == '<Hedger calls:1 hedged:1 wins:1>'
+    # slow first attempt counts until it is cancelled, not just
+    # the hedged latency
+    await asyncio.sleep(0)
+    assert len(hedger.latency) == 1
+    assert hedger.latency.quantile(0.5) >= 0.02
+
+
+@pytest.mark.asyncio
+async def test_hedger__fast_call_not_hedged():
+    calls = []
+
+    async def fetch(x):
+        calls.append(x)
+        return x
+
+    hedger = aiter.Hedger(fetch, 0.05)
+    assert await hedger(1) == 1
+    assert calls == [1]
+    assert hedger.hedged == 0
+    assert len(hedger.latency) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedger__quantile():
+
+    async def fetch(x):
+        await asyncio.sleep(0.001)
+        return x
+
+    hedger = aiter.Hedger(fetch, 'p95', min_samples=5)
+    assert hedger.hedge_delay() is None
+    for i in range(5):
+        await hedger(i)
+    assert hedger.hedge_delay() is not None
+    assert hedger.hedge_delay() < 0.1
+
+
+@pytest.mark.asyncio
+async def test_hedger__budget():
+    calls = 0
+
+    async def fetch(x):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return x
+
+    hedger = aiter.Hedger(fetch, 0, max_ratio=0.25)
+    for i in range(8):
+        await hedger(i)
+    assert hedger.hedged == 2
+    assert calls == 10
+
+
+@pytest.mark.asyncio
+async def test_hedger__errors():
+    attempts = []
+
+    async def fetch(x):
+        attempts.append(x)
+        if len(attempts) == 1:
+            await asyncio.sleep(0.02)
+            raise RuntimeError("first")
+        await asyncio.sleep(0.05)
+        return x
+
+    hedger = aiter.Hedger(fetch, 0.01, max_ratio=1)
+    assert await hedger(1) == 1
+    # failed first attempt is recorded with its own duration
+    assert len(hedger.latency) == 1
+    assert 0.015 < hedger.latency.quantile(0.5) < 0.05
+
+    async def fail(x):
+        raise KeyError(x)
+
+    hedger = aiter.Hedger(fail, 0.01, max_ratio=1)
+    with pytest.raises(KeyError):
+        await hedger(1)
+
+
+def test_hedger__bad_args():
+
+    async def fetch(x):
+        return x
+
+    with pytest.raises(ValueError):
+        aiter.Hedger(fetch, 'q95')
+    with pytest.raises(ValueError):
+        aiter.Hedger(fetch, -1)
+    with pytest.raises(ValueError):
+        aiter.Hedger(None, 1)
+
+
+@pytest.mark.asyncio
+async def test_map__hedge_after(simple_gen):
+    slow = {2}
+
+    async def fetch(x):
+        if x in slow:
+            slow.discard(x)
+            await asyncio.sleep(1)
+        return x * 10
+
+    it = aiter.map(fetch, simple_gen(range(4)),
+                   hedge_after=0.01, hedge_ratio=0.5)
+    res = await asyncio.wait_for(aiter.collect(it), 0.5)
+    assert res == [0, 10, 20, 30]
+    assert it.hedger.hedged == 1
+
+    with pytest.raises(ValueError):
+        aiter.map(str, simple_gen(range(4)), hedge_after=0.01)
+
+
+def test_latency_window():
+    window = aiter.LatencyWindow(4)
+    assert window.quantile(0.5) is None
+    assert window.mean() is None
+    for value in [5, 1, 3, 2, 4]:
+        window.add(value)
+    assert len(window) == 4
+    assert window.quantile(0) == 1
+    assert window.quantile(0.5) == 3
+    assert window.quantile(1) == 4
+    assert window.mean() == 2.5
+    with pytest.raises(ValueError):
+        aiter.LatencyWindow(0)
@@ -0,0 +1,60 @@
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+async def _double(x):
+    return x * 2
+
+
+@pytest.mark.parametrize('function,input,output', [
+    pytest.param(
+        str.upper,
+        'abc',
+        ['A', 'B', 'C'],
+        id='simple-function'),
+    pytest.param(
+        _double,
+        range(3),
+        [0, 2, 4],
+        id='coro-function'),
+])
+@pytest.mark.asyncio
+async def test_map(simple_gen, input, function, output):
+    res = [obj async for obj in aiter.map(function, simple_gen(input))]
+    assert res == output
+
+
+def test_map__not_callable(simple_gen):
+    with pytest.raises(ValueError):
+        aiter.map(None, simple_gen('abc'))
+
+
+@pytest.mark.asyncio
+async def test_map__aclose():
+    closed = []
+
+    async def gen():
+        try:
+            for x in range(10):
+                yield x
+        finally:
+            closed.append(True)
+
+    it = aiter.map(str, gen())
+    assert await it.__anext__() == '0'
+    await it.aclose()
+    assert closed == [True]
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_map__aclose_split(simple_gen):
+    it, copy = aiter.split(simple_gen(range(3)))
+    mapped = aiter.map(str, it)
+    # closing before iteration does not start reading split stream
+    await mapped.aclose()
+    with pytest.raises(StopAsyncIteration):
+        await mapped.__anext__()
+    assert [x async for x in copy] == [0, 1, 2]
@@ -156,3 +156,23 @@ async def test_cleanup(simple_gen: SimpleGen) -> None:
     pending = {t for t in tasks if not t.done()}
     assert len(cancelled) >= 0
     assert not pending
+
+
+@pytest.mark.asyncio
+async def test_aclose(simple_gen: SimpleGen) -> None:
+    initial = all_tasks()
+    it = mix(simple_gen('abc', .01), simple_gen('def', .01))
+    assert await it.__anext__() in ('a', 'd')
+    assert all_tasks() - initial
+    await it.aclose()
+    await asyncio.sleep(0)
+    assert not {t for t in all_tasks() - initial if not t.done()}
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+    # closing before iteration does not start readers
+    it = mix(simple_gen('abc', .01), simple_gen('def', .01))
+    await it.aclose()
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+    assert not {t for t in all_tasks() - initial if not t.done()}
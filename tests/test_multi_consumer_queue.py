@@ -133,3 +133,46 @@ async def test_put_after_close(event_loop):
     assert not q.closed
     assert await q.put(2) is False
     assert q.closed
+
+
+@pytest.mark.asyncio
+async def test_get_nowait():
+    q = MultiConsumerQueue(2)
+    key1 = q.register()
+    key2 = q.register()
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait(key1)
+
+    await q.put(1)
+    await q.put(2)
+    assert q.get_nowait(key1) == 1
+    assert q.qsize(key1) == 1
+    assert not q.empty(key1)
+    assert q.get_nowait(key1) == 2
+    assert q.empty(key1)
+    assert q.buffer_size() == 2
+
+    assert q.get_nowait(key2) == 1
+    assert q.buffer_size() == 1
+    q.close()
+    assert q.get_nowait(key1) is q.EndOfStream
+    assert q.get_nowait(key2) == 2
+    assert q.get_nowait(key2) is q.EndOfStream
+
+
+@pytest.mark.asyncio
+async def test_drain_nowait():
+    q = MultiConsumerQueue(3)
+    with q.consumer() as c1, q.consumer() as c2:
+        assert c1.drain_nowait() == []
+        for i in range(3):
+            await q.put(i)
+        assert q.full()
+
+        assert c1.drain_nowait() == [0, 1, 2]
+        assert q.full()
+        assert c2.drain_nowait(2) == [0, 1]
+        assert q.buffer_size() == 1
+        assert c2.get_nowait() == 2
+        assert q.buffer_size() == 0
+        assert c1.drain_nowait() == []
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+if hasattr(asyncio, 'all_tasks'):
+    all_tasks = asyncio.all_tasks
+else:
+    all_tasks = asyncio.Task.all_tasks
+
+
+@pytest.mark.asyncio
+async def test_prefetch(simple_gen):
+    res = [obj async for obj in aiter.prefetch(simple_gen('abc'), 2)]
+    assert res == ['a', 'b', 'c']
+
+
+@pytest.mark.asyncio
+async def test_prefetch__overlap(simple_gen, event_loop):
+    it = aiter.prefetch(simple_gen('abcd', 0.05), 1)
+    start = event_loop.time()
+    res = []
+    async for obj in it:
+        await asyncio.sleep(0.05)
+        res.append(obj)
+    elapsed = event_loop.time() - start
+    assert res == ['a', 'b', 'c', 'd']
+    # sequential reading would take 0.4s
+    assert elapsed < 0.35
+
+
+@pytest.mark.asyncio
+async def test_prefetch__error():
+
+    async def error_gen():
+        yield 0
+        raise RuntimeError("err")
+
+    res = []
+    with pytest.raises(RuntimeError):
+        async for obj in aiter.prefetch(error_gen()):
+            res.append(obj)
+    assert res == [0]
+
+
+@pytest.mark.asyncio
+async def test_prefetch__aclose(simple_gen):
+    initial = all_tasks()
+    it = aiter.prefetch(simple_gen('abcdef', 0.01), 2)
+    assert await it.__anext__() == 'a'
+    assert all_tasks() - initial
+
+    await it.aclose()
+    assert not {t for t in all_tasks() - initial if not t.done()}
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
+def test_prefetch__bad_size(simple_gen):
+    with pytest.raises(ValueError):
+        aiter.prefetch(simple_gen('abc'), 0)
+
+
+@pytest.mark.asyncio
+async def test_iterator_prefetch(simple_gen):
+    it = aiter.Iterator(simple_gen('a1b2')).prefetch(2).filter(str.isalpha)
+    res = [obj async for obj in it]
+    assert res == ['a', 'b']
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+from asyncio_iter_tools import ClosableQueue
+
+
+@pytest.mark.asyncio
+async def test_deadline_on_get():
+    dropped = []
+    q = ClosableQueue(shed=aiter.DeadlinePolicy(0.02), on_drop=dropped.append)
+    await q.put(1)
+    await q.put(2)
+    await asyncio.sleep(0.03)
+    await q.put(3)
+    assert q.qsize() == 3
+    assert await q.get() == 3
+    assert dropped == [1, 2]
+    assert q.dropped == 2
+
+    await q.put(4)
+    await asyncio.sleep(0.03)
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+    assert q.drain_nowait() == []
+    assert dropped == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_deadline_on_get__waits_for_fresh(event_loop):
+    q = ClosableQueue(shed=aiter.DeadlinePolicy(0.01))
+    await q.put(1)
+    await asyncio.sleep(0.02)
+    event_loop.call_later(0.01, lambda: asyncio.ensure_future(q.put(2)))
+    assert await asyncio.wait_for(q.get(), 1) == 2
+    q.close()
+    assert await q.get() is q.EndOfStream
+
+
+@pytest.mark.asyncio
+async def test_deadline_on_full_put():
+    q = ClosableQueue(1, shed=aiter.DeadlinePolicy(0.01))
+    await q.put(1)
+    put = asyncio.ensure_future(q.put(2))
+    await asyncio.sleep(0)
+    assert not put.done()
+    # blocked put drops head as soon as it expires
+    assert await asyncio.wait_for(put, 1)
+    assert q.dropped == 1
+    assert q.get_nowait() == 2
+    # fresh head is not dropped
+    await q.put(3)
+    assert q.get_nowait() == 3
+
+
+@pytest.mark.asyncio
+async def test_codel_on_full_put():
+    q = ClosableQueue(1, shed=aiter.CoDelPolicy(target=0.005, interval=0.01))
+    await q.put(1)
+    put = asyncio.ensure_future(q.put(2))
+    await asyncio.sleep(0.005)
+    assert not put.done()
+    assert await asyncio.wait_for(put, 1)
+    assert q.dropped == 1
+    assert q.get_nowait() == 2
+
+
+def test_codel_policy():
+    codel = aiter.CoDelPolicy(target=0.005, interval=0.1)
+    # short burst above target is tolerated
+    assert not codel.drop(0.01, 1.0)
+    assert not codel.drop(0.01, 1.05)
+    assert not codel.drop(0.001, 1.06)
+    # standing queue for longer than interval
+    assert not codel.drop(0.01, 2.0)
+    assert not codel.drop(0.01, 2.05)
+    assert codel.drop(0.01, 2.1)
+    assert codel.dropping
+    assert not codel.drop(0.01, 2.15)
+    assert codel.drop(0.01, 2.2)
+    # next drop comes sooner: interval / sqrt(2)
+    assert codel.drop(0.01, 2.2 + 0.1 / 2 ** 0.5)
+    assert not codel.drop(0.001, 2.3)
+    assert not codel.dropping
+    assert codel.expires_in(0.05) == pytest.approx(0.055)
+    assert codel.expires_in(0.2) < 0
+    assert aiter.DeadlinePolicy(1).expires_in(0.25) == 0.75
+    assert repr(codel) == '<CoDelPolicy target:0.005 interval:0.1 idle>'
+
+
+def test_bad_args():
+    with pytest.raises(ValueError):
+        aiter.DeadlinePolicy(0)
+    with pytest.raises(ValueError):
+        aiter.CoDelPolicy(target=0)
+
+
+@pytest.mark.asyncio
+async def test_mix_shed(simple_gen):
+    dropped = []
+    it = aiter.Iterator(simple_gen(range(20), 0.001)).mix(
+        simple_gen(range(100, 120), 0.001),
+        shed=aiter.DeadlinePolicy(0.005), on_drop=dropped.append)
+    res = []
+    async for obj in it:
+        res.append(obj)
+        # slow consumer
+        await asyncio.sleep(0.01)
+    assert dropped
+    assert it._stream.dropped == len(dropped)
+    assert sorted(res + dropped) == list(range(20)) + list(range(100, 120))
+
+
+@pytest.mark.asyncio
+async def test_mix_shed__consumer_stall():
+    produced = 0
+
+    async def source():
+        nonlocal produced
+        for _ in range(100):
+            produced += 1
+            yield produced
+            await asyncio.sleep(0.001)
+
+    it = aiter.mix(source(), source(), shed=aiter.DeadlinePolicy(0.005))
+    await it.__anext__()
+    before = produced
+    # consumer stalls, readers keep reading dropping stale items
+    await asyncio.sleep(0.1)
+    assert produced - before > 20
+    assert it.dropped > 10
+    rest = [x async for x in it]
+    assert 1 + len(rest) + it.dropped == 200
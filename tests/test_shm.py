@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import subprocess
+import sys
+import time
+import pytest
+
+from asyncio_iter_tools import SharedMemoryBroadcast
+from asyncio_iter_tools._compat import shared_memory
+
+
+pytestmark = pytest.mark.skipif(
+    shared_memory is None,
+    reason="multiprocessing.shared_memory requires Python 3.8+")
+
+
+@pytest.fixture
+def broadcast():
+    queue = SharedMemoryBroadcast(consumers=2, capacity=2, slot_size=16)
+    yield queue
+    queue.release()
+
+
+async def _read(queue, index):
+    return [bytes(obj) async for obj in queue.consumer(index)]
+
+
+def _worker(name, index, result):
+    queue = SharedMemoryBroadcast.attach(name)
+    try:
+        result.put((index, asyncio.run(_read(queue, index))))
+    finally:
+        queue.release()
+
+
+@pytest.mark.asyncio
+async def test_simple(broadcast):
+    assert broadcast.consumers == 2
+    assert broadcast.capacity == 2
+    assert broadcast.slot_size == 16
+    assert not broadcast.closed
+    assert not broadcast.full()
+    assert repr(broadcast) == (
+        f'<SharedMemoryBroadcast {broadcast.name} open size:0>')
+
+    assert await broadcast.put(b'abc') is True
+    assert await broadcast.put(bytearray(b'de')) is True
+    assert broadcast.full()
+    broadcast.close()
+    assert await broadcast.put(b'f') is False
+
+    c1 = broadcast.consumer(0)
+    view = await c1.__anext__()
+    assert isinstance(view, memoryview)
+    assert view == b'abc'
+    view.release()
+    assert broadcast.qsize() == 2
+    assert [bytes(obj) async for obj in c1] == [b'de']
+
+    c2 = broadcast.consumer(1, copy=True)
+    assert [obj async for obj in c2] == [b'abc', b'de']
+    assert broadcast.qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_backpressure(broadcast):
+    attached = SharedMemoryBroadcast.attach(broadcast.name)
+    try:
+        reader1 = asyncio.ensure_future(_read(attached, 0))
+        reader2 = asyncio.ensure_future(_read(attached, 1))
+        for i in range(10):
+            assert await broadcast.put(b'%d' % i)
+            assert broadcast.qsize() <= broadcast.capacity
+        broadcast.close()
+        expected = [b'%d' % i for i in range(10)]
+        assert await reader1 == expected
+        assert await reader2 == expected
+    finally:
+        attached.release()
+
+
+@pytest.mark.asyncio
+async def test_detach(broadcast):
+    consumer = broadcast.consumer(1)
+    await consumer.aclose()
+    reader = asyncio.ensure_future(_read(broadcast, 0))
+    for i in range(5):
+        await broadcast.put(b'x')
+    broadcast.close()
+    assert await reader == [b'x'] * 5
+    assert [obj async for obj in consumer] == []
+
+
+@pytest.mark.asyncio
+async def test_bad_args(broadcast):
+    with pytest.raises(ValueError):
+        await broadcast.put(b'x' * 17)
+    with pytest.raises(ValueError):
+        broadcast.consumer(2)
+    with pytest.raises(ValueError):
+        SharedMemoryBroadcast(consumers=0)
+
+
+@pytest.mark.asyncio
+async def test_processes(broadcast):
+    ctx = multiprocessing.get_context('spawn')
+    result = ctx.Queue()
+    workers = [
+        ctx.Process(target=_worker, args=(broadcast.name, idx, result))
+        for idx in range(broadcast.consumers)]
+    for proc in workers:
+        proc.start()
+    for i in range(20):
+        await broadcast.put(b'item-%d' % i)
+    broadcast.close()
+
+    loop = asyncio.get_event_loop()
+    res = dict([await loop.run_in_executor(None, result.get, True, 10)
+                for _ in workers])
+    for proc in workers:
+        proc.join()
+    expected = [b'item-%d' % i for i in range(20)]
+    assert res == {0: expected, 1: expected}
+
+
+def test_attach__other_process(broadcast):
+    # process exit must not unlink segment it has only attached to
+    code = ('from asyncio_iter_tools import SharedMemoryBroadcast;'
+            f'SharedMemoryBroadcast.attach({broadcast.name!r}).release()')
+    subprocess.run([sys.executable, '-c', code], check=True)
+    # resource tracker of that process cleans up after it exits
+    time.sleep(0.5)
+    attached = SharedMemoryBroadcast.attach(broadcast.name)
+    attached.release()
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import pytest
+
+from asyncio_iter_tools import ThreadBridgeQueue
+
+
+@pytest.mark.asyncio
+async def test_simple(event_loop):
+    q = ThreadBridgeQueue(loop=event_loop)
+    assert q.empty()
+    assert not q.full()
+    assert q.maxsize == 0
+    assert repr(q) == '<ThreadBridgeQueue open size:0>'
+
+    assert q.put(1) is True
+    assert q.put_many([2, 3]) is True
+    assert q.qsize() == 3
+    assert await q.get() == 1
+    assert q.get_nowait() == 2
+    assert q.drain_nowait() == [3]
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+
+    q.close()
+    assert q.closed
+    assert q.exhausted
+    assert q.put(4) is False
+    assert await q.get() is q.EndOfStream
+    assert q.get_nowait() is q.EndOfStream
+
+
+@pytest.mark.asyncio
+async def test_put_from_thread(event_loop):
+    q = ThreadBridgeQueue(maxsize=10, loop=event_loop)
+
+    def produce():
+        for i in range(0, 1000, 50):
+            assert q.put_many(range(i, i + 50))
+        q.close()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    res = []
+    obj = await q.get()
+    while obj is not q.EndOfStream:
+        res.append(obj)
+        obj = await q.get()
+    thread.join()
+    assert res == list(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_coalesced_wakeups(event_loop, monkeypatch):
+    q = ThreadBridgeQueue(loop=event_loop)
+    calls = []
+    call_soon_threadsafe = event_loop.call_soon_threadsafe
+
+    def count(callback, *args):
+        if callback == q._wakeup:
+            calls.append(callback)
+        return call_soon_threadsafe(callback, *args)
+
+    monkeypatch.setattr(event_loop, 'call_soon_threadsafe', count)
+    await event_loop.run_in_executor(None, q.put_many, range(100))
+    assert len(calls) == 1
+    assert q.drain_nowait() == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_close_unblocks_producer(event_loop):
+    q = ThreadBridgeQueue(maxsize=1, loop=event_loop)
+    assert q.put(1)
+    fut = event_loop.run_in_executor(None, q.put, 2)
+    await asyncio.sleep(0.01)
+    assert not fut.done()
+    q.close()
+    assert await fut is False
+
+
+def test_put_timeout(event_loop):
+    q = ThreadBridgeQueue(maxsize=1, loop=event_loop)
+    assert q.put(1)
+    with pytest.raises(TimeoutError):
+        q.put(2, timeout=0.01)
@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+def _objects(n):
+    # distinct objects (small ints are shared)
+    return [[i] for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_tracer(simple_gen):
+    async def slow(x):
+        await asyncio.sleep(0.01)
+        return x
+
+    tracer = aiter.Tracer(sample_rate=0.5)
+    it = aiter.Iterator(tracer.enter(simple_gen(_objects(10))))
+    it = it.map(tracer.map('inc', lambda x: [x[0] + 1]))
+    it = it.filter(tracer.filter('even', lambda x: x[0] % 2 == 0))
+    it = it.map(tracer.map('slow', slow))
+    res = [x async for x in tracer.exit(it)]
+    assert res == [[2], [4], [6], [8], [10]]
+
+    # every other item is sampled
+    assert len(tracer.histograms['inc']) == 5
+    assert len(tracer.histograms['inc.wait']) == 5
+    assert len(tracer.histograms['even']) == 5
+    assert len(tracer.histograms['slow']) == 5
+    assert len(tracer.histograms['total']) == 5
+    # sampled items left pipeline
+    assert len(tracer._stamps) < 10
+
+    summary = tracer.summary()
+    assert set(summary) == {
+        'inc', 'inc.wait', 'even', 'even.wait', 'slow', 'slow.wait', 'total'}
+    assert summary['slow']['p50'] >= 0.009
+    assert summary['total']['mean'] >= summary['slow']['mean']
+    assert set(summary['inc']) == {'mean', 'p50', 'p90', 'p99'}
+
+
+@pytest.mark.asyncio
+async def test_tracer__queue_wait(simple_gen):
+    tracer = aiter.Tracer(sample_rate=1)
+    # mix buffers the fast stream while slow consumer is busy
+    it = aiter.mix(tracer.enter(simple_gen(_objects(3))),
+                   tracer.enter(simple_gen(_objects(3))),
+                   on_wait=tracer.queue('mix.queue'))
+    res = []
+    async for x in tracer.exit(aiter.map(tracer.map('stage', str), it)):
+        res.append(x)
+        await asyncio.sleep(0.01)
+    assert sorted(res) == ['[0]', '[0]', '[1]', '[1]', '[2]', '[2]']
+    assert tracer.histograms['stage.wait'].quantile(1) >= 0.009
+    assert tracer.histograms['mix.queue'].quantile(1) >= 0.009
+    assert len(tracer.histograms['mix.queue']) == 6
+    assert len(tracer.histograms['total']) == 6
+
+
+@pytest.mark.asyncio
+async def test_tracer__split_queue_wait(simple_gen):
+    tracer = aiter.Tracer(sample_rate=0.5)
+    it = aiter.Iterator(simple_gen(range(10)))
+    copy = it.split(buffer_size=10, on_wait=tracer.queue('split.queue'))
+    res, res_copy = await asyncio.gather(
+        aiter.collect(it), aiter.collect(copy))
+    assert res == res_copy == list(range(10))
+    # every other get of both consumers
+    assert len(tracer.histograms['split.queue']) == 10
+
+
+def test_tracer__bad_args():
+    with pytest.raises(ValueError):
+        aiter.Tracer(sample_rate=0)
+    with pytest.raises(ValueError):
+        aiter.Tracer(sample_rate=1.5)
+    with pytest.raises(ValueError):
+        aiter.Tracer().map('x', None)
+    with pytest.raises(ValueError):
+        aiter.Tracer(max_tracked=0)
+    assert repr(aiter.Tracer(0.1)) == '<Tracer every:10 stages:0>'
+
+
+@pytest.mark.asyncio
+async def test_tracer__split(simple_gen):
+    tracer = aiter.Tracer(sample_rate=1)
+    it = aiter.Iterator(tracer.enter(simple_gen(_objects(3))))
+    copy = it.split()
+    it = it.map(tracer.map('str', str))
+    copy = copy.filter(tracer.filter('all', bool))
+    copy = copy.map(tracer.map('neg', lambda x: -x[0]))
+    res, res_copy = await asyncio.gather(
+        aiter.collect(tracer.exit(it)), aiter.collect(tracer.exit(copy)))
+    assert res == ['[0]', '[1]', '[2]']
+    assert res_copy == [0, -1, -2]
+    assert len(tracer.histograms['str.wait']) == 3
+    assert len(tracer.histograms['neg.wait']) == 3
+
+
+@pytest.mark.parametrize('stage,expected', [
+    pytest.param(lambda it: it.filter(None), [1, 2], id='filter'),
+    pytest.param(lambda it: it.distinct(), [0, 1, 2], id='distinct'),
+    pytest.param(lambda it: it.map(str), ['0', '0', '0', '0', '1', '2'],
+                 id='map'),
+])
+@pytest.mark.asyncio
+async def test_tracer__unwrapped_stages(simple_gen, stage, expected):
+    # tracing never changes results of stages it does not wrap
+    tracer = aiter.Tracer(sample_rate=0.5)
+    it = stage(aiter.Iterator(tracer.enter(simple_gen([0, 0, 0, 0, 1, 2]))))
+    assert await aiter.collect(tracer.exit(it)) == expected
+
+
+@pytest.mark.asyncio
+async def test_tracer__max_tracked(simple_gen):
+    tracer = aiter.Tracer(sample_rate=1, max_tracked=5)
+    # filtered out items are never seen by exit()
+    it = aiter.filter(lambda x: False, tracer.enter(simple_gen(_objects(20))))
+    assert await aiter.collect(tracer.exit(it)) == []
+    assert len(tracer._stamps) == 5
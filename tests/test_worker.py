@@ -0,0 +1,262 @@
+import asyncio
+import os
+import threading
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.fixture
+def worker():
+    with aiter.WorkerLoop('test-worker') as worker:
+        yield worker
+    assert not worker.running
+
+
+@pytest.mark.asyncio
+async def test_offload(simple_gen, worker):
+    threads = set()
+
+    def parse(x):
+        threads.add(threading.current_thread().name)
+        return int(x)
+
+    def stage(items):
+        return aiter.Iterator(items).map(parse).filter(lambda x: x % 2)
+
+    it = aiter.Iterator(simple_gen(map(str, range(1000)))).offload(
+        stage, worker=worker, batch=16)
+    res = [x async for x in it]
+    assert res == list(range(1, 1000, 2))
+    assert threads == {'test-worker'}
+
+
+@pytest.mark.asyncio
+async def test_offload__split_mix(simple_gen, worker):
+    # two branches on separate loops merged back on the main loop
+    with aiter.WorkerLoop() as worker2:
+        it = aiter.Iterator(simple_gen(range(100)))
+        copy = it.split()
+        it = it.offload(lambda s: aiter.map(str, s), worker=worker)
+        copy = copy.offload(lambda s: aiter.map(lambda x: -x, s),
+                            worker=worker2)
+        res = [x async for x in it.mix(copy)]
+    assert sorted(x for x in res if isinstance(x, str)) == sorted(
+        map(str, range(100)))
+    assert sorted(x for x in res if isinstance(x, int)) == list(
+        range(-99, 1))
+
+
+@pytest.mark.asyncio
+async def test_offload__errors(simple_gen, worker):
+    def stage(items):
+        return aiter.map(lambda x: 1 / x, items)
+
+    res = []
+    with pytest.raises(ZeroDivisionError):
+        async for x in aiter.offload(simple_gen([1, 2, 0, 4]), stage,
+                                     worker=worker):
+            res.append(x)
+    assert res == [1, 0.5]
+
+    async def bad_source():
+        yield 1
+        raise KeyError()
+
+    with pytest.raises(KeyError):
+        async for x in aiter.offload(bad_source(), lambda s: s,
+                                     worker=worker):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_offload__cancel(worker):
+    produced = 0
+    cancelled = threading.Event()
+
+    async def source():
+        nonlocal produced
+        while True:
+            produced += 1
+            yield produced
+            await asyncio.sleep(0)
+
+    async def slow(x):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    it = aiter.offload(source(), lambda s: aiter.map(slow, s),
+                       worker=worker, batch=4, buffer=1)
+    task = asyncio.ensure_future(it.__anext__())
+    await asyncio.sleep(0.05)
+    # bounded channel stops reading source
+    assert produced <= 4 * 3 + 2
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await it.aclose()
+    loop = asyncio.get_event_loop()
+    assert await loop.run_in_executor(None, cancelled.wait, 1)
+
+
+@pytest.mark.asyncio
+async def test_offload__bad_args(worker):
+    with pytest.raises(RuntimeError):
+        await aiter.offload([], lambda s: s,
+                            worker=aiter.WorkerLoop()).__anext__()
+    with pytest.raises(ValueError):
+        await aiter.offload([], lambda s: s, worker=worker,
+                            batch=0).__anext__()
+
+
+@pytest.mark.asyncio
+async def test_offload__stage_stops_early(simple_gen, worker):
+    async def first3(items):
+        async for x in items:
+            yield x
+            if x == 2:
+                break
+
+    it = aiter.offload(simple_gen(range(10000)), first3,
+                       worker=worker, batch=4, buffer=1)
+    res = await asyncio.wait_for(aiter.collect(it), 1)
+    assert res == [0, 1, 2]
+
+
+def _parse_stage(items):
+    return aiter.Iterator(items).map(int).filter(lambda x: x % 2)
+
+
+def _pid_stage(items):
+    return aiter.map(lambda x: (x, os.getpid()), items)
+
+
+def _inverse_stage(items):
+    return aiter.map(lambda x: 1 / x, items)
+
+
+def _first3(items):
+    return aiter.Iterator(items).filter(lambda x: x < 3)
+
+
+async def _first3_stop(items):
+    async for x in items:
+        yield x
+        if x == 2:
+            break
+
+
+def _str_stage(items):
+    return aiter.map(str, items)
+
+
+def _len_stage(items):
+    return aiter.map(len, items)
+
+
+@pytest.fixture
+def process():
+    with aiter.WorkerProcess('test-process') as worker:
+        yield worker
+    assert not worker.running
+
+
+@pytest.mark.asyncio
+async def test_offload__process(simple_gen, process):
+    it = aiter.Iterator(simple_gen(map(str, range(1000)))).offload(
+        _parse_stage, worker=process, batch=16)
+    res = [x async for x in it]
+    assert res == list(range(1, 1000, 2))
+
+    it = aiter.offload(simple_gen(range(10)), _pid_stage, worker=process)
+    res = [x async for x in it]
+    assert [x for x, _ in res] == list(range(10))
+    assert {pid for _, pid in res} == {process._process.pid}
+    assert os.getpid() != process._process.pid
+
+
+@pytest.mark.asyncio
+async def test_offload__process_errors(simple_gen, process):
+    res = []
+    with pytest.raises(ZeroDivisionError):
+        async for x in aiter.offload(simple_gen([1, 2, 0, 4]),
+                                     _inverse_stage, worker=process):
+            res.append(x)
+    assert res == [1, 0.5]
+
+    async def bad_source():
+        yield 1
+        raise KeyError()
+
+    with pytest.raises(KeyError):
+        async for x in aiter.offload(bad_source(), _str_stage,
+                                     worker=process):
+            pass
+
+    # stage is built in worker process, so it must be picklable
+    with pytest.raises(Exception):
+        await aiter.offload(simple_gen([1]), lambda s: s,
+                            worker=process).__anext__()
+
+    with pytest.raises(RuntimeError):
+        await aiter.offload([], _str_stage,
+                            worker=aiter.WorkerProcess()).__anext__()
+
+    # worker is still usable
+    res = await aiter.collect(aiter.offload(simple_gen([1, 2]), _str_stage,
+                                            worker=process))
+    assert res == ['1', '2']
+
+
+@pytest.mark.asyncio
+async def test_offload__process_stops_early(simple_gen, process):
+    it = aiter.offload(simple_gen(range(10000)), _first3_stop,
+                       worker=process, batch=4, buffer=1)
+    res = await asyncio.wait_for(aiter.collect(it), 5)
+    assert res == [0, 1, 2]
+
+    # closing iterator stops reading source
+    produced = 0
+
+    async def source():
+        nonlocal produced
+        while True:
+            produced += 1
+            yield produced
+            await asyncio.sleep(0)
+
+    it = aiter.offload(source(), _str_stage, worker=process,
+                       batch=4, buffer=1)
+    assert await it.__anext__() == '1'
+    await it.aclose()
+    before = produced
+    await asyncio.sleep(0.05)
+    assert produced == before
+
+
+@pytest.mark.asyncio
+async def test_pipeline(simple_gen, worker, process, monkeypatch):
+    offloaded = []
+
+    def spy(stream, stage, **kwargs):
+        offloaded.append(kwargs['worker'])
+        return offload(stream, stage, **kwargs)
+
+    offload = aiter.worker.offload
+    monkeypatch.setattr(aiter.worker, 'offload', spy)
+    it = aiter.Iterator(simple_gen(range(10))).pipeline(
+        (_first3, process), (_str_stage, process),
+        (lambda s: aiter.map(lambda x: x + '!', s), worker),
+        _len_stage)
+    assert [x async for x in it] == [2, 2, 2]
+    # consecutive stages on a worker run there together
+    assert offloaded == [process, worker]
+
+    it = aiter.pipeline(simple_gen(range(3)), _str_stage)
+    assert [x async for x in it] == ['0', '1', '2']
+
+    with pytest.raises(ValueError):
+        aiter.pipeline(simple_gen(range(3)), (None, worker))
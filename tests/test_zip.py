@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+
+import asyncio_iter_tools as aiter
+
+
+@pytest.mark.asyncio
+async def test_zip(simple_gen):
+    it = aiter.zip(simple_gen('abc'), simple_gen(range(5)))
+    res = [obj async for obj in it]
+    assert res == [('a', 0), ('b', 1), ('c', 2)]
+
+
+@pytest.mark.asyncio
+async def test_zip__concurrent(simple_gen, event_loop):
+    it = aiter.zip(simple_gen('abc', 0.05),
+                   simple_gen('def', 0.05),
+                   simple_gen('ghi', 0.05))
+    start = event_loop.time()
+    res = [obj async for obj in it]
+    elapsed = event_loop.time() - start
+    assert res == [('a', 'd', 'g'), ('b', 'e', 'h'), ('c', 'f', 'i')]
+    # sequential advance would take 0.45s
+    assert elapsed < 0.3
+
+
+@pytest.mark.asyncio
+async def test_zip__error(simple_gen):
+
+    async def error_gen():
+        yield 0
+        raise RuntimeError("err")
+
+    res = []
+    with pytest.raises(RuntimeError):
+        async for obj in aiter.zip(simple_gen('abc'), error_gen()):
+            res.append(obj)
+    assert res == [('a', 0)]
+
+
+@pytest.mark.asyncio
+async def test_zip_longest(simple_gen):
+    it = aiter.zip_longest(simple_gen('ab'), simple_gen(range(4)),
+                           simple_gen('x'), fillvalue='-')
+    res = [obj async for obj in it]
+    assert res == [('a', 0, 'x'), ('b', 1, '-'), ('-', 2, '-'), ('-', 3, '-')]
+
+
+@pytest.mark.asyncio
+async def test_combine_latest(simple_gen):
+    it = aiter.combine_latest(simple_gen('abc', 0.05),
+                              simple_gen([1, 2], 0.07))
+    res = [obj async for obj in it]
+    assert res == [('a', 1), ('b', 1), ('b', 2), ('c', 2)]
+
+
+@pytest.mark.asyncio
+async def test_combine_latest__error(simple_gen):
+
+    async def error_gen():
+        yield 0
+        await asyncio.sleep(0.05)
+        raise RuntimeError("err")
+
+    res = []
+    with pytest.raises(RuntimeError):
+        async for obj in aiter.combine_latest(simple_gen('abc', 0.01),
+                                              error_gen()):
+            res.append(obj)
+    assert res == [('a', 0), ('b', 0), ('c', 0)]
+
+
+@pytest.mark.asyncio
+async def test_combine_latest__empty_stream_stops(simple_gen):
+
+    async def empty_gen():
+        await asyncio.sleep(0)
+        return
+        yield
+
+    it = aiter.combine_latest(simple_gen('abc'), empty_gen())
+    assert [obj async for obj in it] == []
+
+    # does not wait for other streams to end
+    it = aiter.combine_latest(simple_gen('abc', 1), empty_gen())
+    res = await asyncio.wait_for(aiter.collect(it), 0.5)
+    assert res == []